@@ -7,9 +7,11 @@ This demonstrates how mental models can be transformed into runnable code
 that produces structured outputs for engineering decision-making.
 """
 
+import functools
 import json
 import re
-from typing import Dict, List, Any, Optional
+import time
+from typing import Callable, Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
@@ -28,6 +30,17 @@ class HUMMBLOutput:
     timestamp: str
 
 
+def timed(operator: Callable[..., HUMMBLOutput]) -> Callable[..., HUMMBLOutput]:
+    """Record the operator's measured wall-clock time in its output"""
+    @functools.wraps(operator)
+    def wrapper(*args, **kwargs) -> HUMMBLOutput:
+        start = time.perf_counter()
+        result = operator(*args, **kwargs)
+        result.execution_time = time.perf_counter() - start
+        return result
+    return wrapper
+
+
 class HUMMBLWorkflow:
     """Orchestrates sequences of HUMMBL operators"""
 
@@ -55,6 +68,7 @@ class HUMMBLWorkflow:
 
         return results
 
+    @timed
     def decompose_root_cause(self, context: Dict) -> HUMMBLOutput:
         """DE01: Break down problem into root causes and components"""
         problem = context.get('problem', '')
@@ -85,10 +99,11 @@ class HUMMBLWorkflow:
                 "Dependencies suggest " + self._analyze_complexity(dependencies)
             ],
             confidence=0.85,
-            execution_time=0.15,
+            execution_time=0.0,
             timestamp=datetime.now().isoformat()
         )
 
+    @timed
     def perspective_first_principles(self, context: Dict) -> HUMMBLOutput:
         """P01: Strip away assumptions to fundamental truths"""
         problem = context.get('problem', '')
@@ -118,10 +133,11 @@ class HUMMBLWorkflow:
                 "Key insight: " + first_principles[0] if first_principles else "No clear first principles identified"
             ],
             confidence=0.78,
-            execution_time=0.12,
+            execution_time=0.0,
             timestamp=datetime.now().isoformat()
         )
 
+    @timed
     def compose_modular_design(self, context: Dict) -> HUMMBLOutput:
         """CO01: Design modular system architecture"""
         components = context.get('components', [])
@@ -153,10 +169,11 @@ class HUMMBLWorkflow:
                 f"Coupling score: {coupling_analysis['score']:.2f}"
             ],
             confidence=0.82,
-            execution_time=0.18,
+            execution_time=0.0,
             timestamp=datetime.now().isoformat()
         )
 
+    @timed
     def invert_premortem(self, context: Dict) -> HUMMBLOutput:
         """IN01: Analyze what could cause this to fail"""
         components = context.get('components', [])
@@ -188,10 +205,11 @@ class HUMMBLWorkflow:
                 "Top prevention priority: " + prevention_strategies[0]['strategy'] if prevention_strategies else "None identified"
             ],
             confidence=0.88,
-            execution_time=0.14,
+            execution_time=0.0,
             timestamp=datetime.now().isoformat()
         )
 
+    @timed
     def synthesize_systems_view(self, context: Dict) -> HUMMBLOutput:
         """SY01: Understand system in broader context"""
         modules = context.get('modules', [])
@@ -223,10 +241,11 @@ class HUMMBLWorkflow:
                 f"System complexity score: {self._assess_system_complexity(ecosystem_map):.2f}"
             ],
             confidence=0.76,
-            execution_time=0.20,
+            execution_time=0.0,
             timestamp=datetime.now().isoformat()
         )
 
+    @timed
     def recurs_feedback_loops(self, context: Dict) -> HUMMBLOutput:
         """RE01: Identify feedback loops in the system"""
         dependencies = context.get('dependencies', {})
@@ -258,7 +277,7 @@ class HUMMBLWorkflow:
                 "Stability assessment: " + stability_analysis['overall']
             ],
             confidence=0.81,
-            execution_time=0.16,
+            execution_time=0.0,
             timestamp=datetime.now().isoformat()
         )
 
@@ -679,7 +698,7 @@ def main():
     # Display results
     for result in results:
         print(f"\n🧠 {result.operator}{result.model}: {result.question}")
-        print(f"⏱️  Execution time: {result.execution_time:.3f}s")
+        print(f"⏱️  Execution time: {result.execution_time * 1000:.3f} ms")
         print(f"🎯 Confidence: {result.confidence:.2f}")
 
         if result.outputs:
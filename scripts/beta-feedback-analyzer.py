@@ -23,6 +23,11 @@ import re
 from collections import defaultdict, Counter
 import sqlite3
 import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'tools'))
+from keyword_matcher import KeywordMatcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -269,12 +274,17 @@ class SentimentAnalyzer:
             'frustrating', 'disappointed', 'annoying', 'difficult', 'buggy',
             'unreliable', 'crashes', 'errors', 'fails'
         }
+        # One automaton for both lists; ids below len(positive_words) are positive
+        self._num_positive = len(self.positive_words)
+        self._matcher = KeywordMatcher.build(
+            sorted(self.positive_words) + sorted(self.negative_words), boundary='prefix'
+        )
 
     def analyze_sentiment(self, text: str) -> str:
         """Analyze sentiment of text"""
-        text_lower = text.lower()
-        positive_count = sum(1 for word in self.positive_words if word in text_lower)
-        negative_count = sum(1 for word in self.negative_words if word in text_lower)
+        matched = self._matcher.matched_ids(text)
+        positive_count = sum(1 for keyword_id in matched if keyword_id < self._num_positive)
+        negative_count = len(matched) - positive_count
 
         if positive_count > negative_count:
             return 'positive'
@@ -296,6 +306,10 @@ class ThemeExtractor:
             'ui': ['interface', 'design', 'layout', 'visual', 'appearance', 'navigation'],
             'bugs': ['bug', 'error', 'crash', 'broken', 'fix', 'issue', 'problem']
         }
+        # Flattened keyword list for a single scan per item; keyword id -> theme
+        keywords = [keyword for keywords in self.theme_keywords.values() for keyword in keywords]
+        self._keyword_themes = [theme for theme, keywords in self.theme_keywords.items() for _ in keywords]
+        self._matcher = KeywordMatcher.build(keywords, boundary='prefix')
 
     def extract_themes(self, feedback_items: List[FeedbackItem]) -> List[FeedbackTheme]:
         """Extract themes from feedback items"""
@@ -305,10 +319,11 @@ class ThemeExtractor:
         theme_items = defaultdict(list)
 
         for item in feedback_items:
-            text = f"{item.title} {item.description}".lower()
+            text = f"{item.title} {item.description}"
+            matched_themes = {self._keyword_themes[keyword_id] for keyword_id in self._matcher.matched_ids(text)}
 
-            for theme, keywords in self.theme_keywords.items():
-                if any(keyword in text for keyword in keywords):
+            for theme in self.theme_keywords:
+                if theme in matched_themes:
                     theme_counter[theme] += 1
                     theme_sentiment[theme].append(1 if item.sentiment == 'positive' else -1 if item.sentiment == 'negative' else 0)
                     if item.user_id:
@@ -2,29 +2,28 @@
 """
 Apply approved relationship fixes from validation results.
 
+Applied fixes are appended to the edit log (data/relationships.editlog.jsonl)
+instead of rewriting data/relationships.json; see relationships_editlog.py.
+
 Usage:
     python tools/apply_relationship_fixes.py --batches 1,2,3 --apply
+    python tools/apply_relationship_fixes.py --batches 1,2,3 --apply --compact
     python tools/apply_relationship_fixes.py --batches 1,2,3 --dry-run
 """
 
 import json
 import argparse
 import re
+import sys
 from pathlib import Path
 from typing import List, Dict
 
-def normalize_code(code: str) -> str:
-    """Normalize model code (IN8 -> IN08)"""
-    match = re.match(r'([A-Z]{1,2})(\d{1,2})', code)
-    if match:
-        transform, number = match.groups()
-        return f"{transform}{number.zfill(2)}"
-    return code
+sys.path.insert(0, str(Path(__file__).parent))
+from relationships_editlog import EditLog, iter_current_relationships
 
 def load_relationships(json_path: str = 'data/relationships.json') -> List[Dict]:
-    """Load relationships from JSON"""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """Load relationships from JSON (with pending edit-log changes applied)"""
+    return list(iter_current_relationships(json_path))
 
 def save_relationships(relationships: List[Dict], json_path: str = 'data/relationships.json'):
     """Save relationships to JSON"""
@@ -150,6 +149,8 @@ def main():
     parser.add_argument('--batches', required=True, help='Comma-separated batch numbers (e.g., 1,2,3)')
     parser.add_argument('--apply', action='store_true', help='Apply fixes (default is dry-run)')
     parser.add_argument('--output', help='Output file (default: data/relationships.json)')
+    parser.add_argument('--compact', action='store_true',
+                        help='Fold the edit log into data/relationships.json after applying')
     
     args = parser.parse_args()
     
@@ -207,15 +208,19 @@ def main():
     
     # Save if not dry run
     if not dry_run and result['applied']:
-        # Create backup
-        backup_file = output_file.replace('.json', '.json.backup')
-        import shutil
-        shutil.copy(output_file, backup_file)
-        print(f"\n💾 Backup created: {backup_file}")
-        
-        # Save updated relationships
-        save_relationships(relationships, output_file)
-        print(f"✅ Updated relationships saved to {output_file}")
+        if Path(output_file).resolve() == Path('data/relationships.json').resolve():
+            # Append field-level changes (with old values) instead of rewriting the file
+            edit_log = EditLog(output_file)
+            entries = edit_log.append(result['applied'], source=f"batches {args.batches}")
+            print(f"\n📝 {len(entries)} change(s) appended to {edit_log.path} "
+                  f"(#{entries[0]['seq']}–#{entries[-1]['seq']})")
+            if args.compact or edit_log.should_compact():
+                folded = edit_log.compact()
+                print(f"✅ Compacted {folded} change(s) into {output_file}")
+        else:
+            # Save updated relationships
+            save_relationships(relationships, output_file)
+            print(f"✅ Updated relationships saved to {output_file}")
         
         # Save fix log
         fix_log = {
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark suite for the HUMMBL tooling.
+
+Times the loader, recommender, validator phases, relationship extraction and
+centrality on the real corpus and on synthetic corpora of increasing size
+(generated once into .cache/bench/ by generate_synthetic_corpus.py). Everything
+runs locally; results are written as JSON so runs from different commits can
+be compared.
+
+Datasets:
+    real      models/ + data/relationships.json (copied to .cache/bench/real)
+    small     600 models, 5k relationships
+    medium    2,000 models, 50k relationships
+    large     10,000 models, 1M relationships (opt-in: slow to generate and run)
+
+Usage:
+    python tools/benchmark.py                                   # real, small, medium
+    python tools/benchmark.py --datasets real,large --repeat 3 -o before.json
+    python tools/benchmark.py --benchmarks loader,recommender   # name prefixes
+    python tools/benchmark.py --compare before.json after.json  # exit 1 on regressions
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+import validate_relationships
+from extract_relationship_data import extract_relationship_data
+from generate_synthetic_corpus import generate
+from relationship_graph import RelationshipGraph
+from relationships_centrality import print_measures as centrality_measures
+from relationships_columnar import binary_path_for, load_relationship_table
+from sy19_recommend import SY19Recommender
+from validate_relationships import ModelLoader
+
+REPO_ROOT = Path(__file__).parent.parent
+BENCH_DIR = REPO_ROOT / '.cache' / 'bench'
+
+# name -> (models, relationships); 'real' is the repository corpus
+DATASETS = {
+    'real': None,
+    'small': (600, 5_000),
+    'medium': (2_000, 50_000),
+    'large': (10_000, 1_000_000),
+}
+DEFAULT_DATASETS = ('real', 'small', 'medium')
+
+MAX_HOPS = (1, 2, 3)
+
+# Benchmarks whose cost grows too fast are skipped above these edge counts
+EDGE_LIMITS = {
+    'validate.batch': None,
+    'validate.consistency': 100_000,
+    'validate.missing': 100_000,
+    'centrality': 20_000,
+}
+
+# Median slowdown (fraction) reported as a regression by --compare
+REGRESSION_THRESHOLD = 0.10
+# Ignore differences below this many seconds (timer noise on tiny benchmarks)
+MIN_DELTA = 0.002
+
+
+class Dataset:
+    """A benchmark corpus: a root directory with models/, data/ and validation/"""
+
+    def __init__(self, name: str, root: Path):
+        self.name = name
+        self.root = root
+        self.models_dir = root / 'models'
+        self.relationships_json = root / 'data' / 'relationships.json'
+        graph = RelationshipGraph.from_relationships(load_relationship_table(self.relationships_json))
+        self.num_models = sum(1 for _ in self.models_dir.glob('*/*.md'))
+        self.num_relationships = graph.num_relationships
+        # Fixed, data-derived primaries: the busiest model and a median-degree one
+        degrees = graph.degree()
+        order = sorted(range(graph.num_nodes), key=lambda node: (-degrees[node], graph.nodes[node]))
+        self.primaries = [graph.nodes[order[0]], graph.nodes[order[len(order) // 2]]]
+
+
+def prepare_dataset(name: str, seed: int = 0) -> Dataset:
+    """Create (or reuse) the corpus for a dataset under .cache/bench/<name>"""
+    root = BENCH_DIR / name
+    if name == 'real':
+        # Fresh copy each run so the validation phases never write into the repository
+        if root.exists():
+            shutil.rmtree(root)
+        shutil.copytree(REPO_ROOT / 'models', root / 'models',
+                        ignore=shutil.ignore_patterns('README.md', '__pycache__'))
+        (root / 'data').mkdir(parents=True)
+        shutil.copy2(REPO_ROOT / 'data' / 'relationships.json', root / 'data' / 'relationships.json')
+        (root / 'validation').mkdir()
+    else:
+        num_models, num_edges = DATASETS[name]
+        marker = root / 'corpus.json'
+        spec = {'models': num_models, 'relationships': num_edges, 'seed': seed}
+        if not marker.exists() or json.loads(marker.read_text()) != spec:
+            if root.exists():
+                shutil.rmtree(root)
+            print(f"   generating {name} corpus ({num_models} models, {num_edges} relationships)...",
+                  file=sys.stderr)
+            generate(root, num_models=num_models, num_edges=num_edges, seed=seed, write_csv=False)
+            marker.write_text(json.dumps(spec))
+    return Dataset(name, root)
+
+
+def measure(func: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None) -> Dict:
+    """Run func `repeat` times (setup before each run is not timed); returns timing stats"""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {
+        'repeat': repeat,
+        'times': times,
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.fmean(times),
+    }
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the tools' progress output while timing"""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def _remove(path: Path):
+    with contextlib.suppress(FileNotFoundError):
+        path.unlink()
+
+
+# Benchmarks: each yields (name, params, func, setup) for a dataset
+
+def bench_loader(ds: Dataset, repeat: int):
+    snapshot = ds.root / '.cache' / 'models-snapshot.pickle'
+    yield 'loader.cold', {}, lambda: ModelLoader(ds.models_dir).load_all(), None
+    warm = ModelLoader(ds.models_dir)
+    warm.load_all()
+    yield 'loader.warm', {}, warm.load_all, None
+    yield ('loader.snapshot_build', {}, lambda: ModelLoader(ds.models_dir, snapshot=snapshot).load_all(),
+           lambda: _remove(snapshot))
+    ModelLoader(ds.models_dir, snapshot=snapshot).load_all()
+    yield 'loader.snapshot_warm', {}, lambda: ModelLoader(ds.models_dir, snapshot=snapshot).load_all(), None
+
+
+def bench_recommender(ds: Dataset, repeat: int):
+    binary = binary_path_for(ds.relationships_json)
+    yield ('recommender.init_cold', {}, lambda: SY19Recommender(str(ds.relationships_json)),
+           lambda: _remove(binary))
+    yield 'recommender.init', {}, lambda: SY19Recommender(str(ds.relationships_json)), None
+    for engine in SY19Recommender.ENGINES:
+        # Result cache off: every timed call must score
+        recommender = SY19Recommender(str(ds.relationships_json), engine=engine, cache_size=0)
+        for max_hops in MAX_HOPS:
+            # First call builds lazy traversal state; time steady-state calls
+            recommender.recommend_models('', primaries=ds.primaries, max_hops=max_hops)
+            yield ('recommender.recommend', {'engine': engine, 'max_hops': max_hops},
+                   lambda recommender=recommender, max_hops=max_hops: recommender.recommend_models(
+                       '', primaries=ds.primaries, max_hops=max_hops), None)
+
+
+def bench_validate(ds: Dataset, repeat: int):
+    phases = [
+        ('validate.prepare', validate_relationships.phase_prepare),
+        ('validate.batch', lambda: validate_relationships.phase_batch(1)),
+        ('validate.consistency', validate_relationships.phase_consistency),
+        ('validate.missing', validate_relationships.phase_missing),
+        ('validate.final', validate_relationships.phase_final),
+    ]
+    for name, phase in phases:
+        yield name, {}, phase, None
+
+
+def bench_extract(ds: Dataset, repeat: int):
+    yield ('extract_relationship_data', {},
+           lambda: extract_relationship_data(str(ds.relationships_json), models_dir=ds.models_dir), None)
+
+
+def bench_centrality(ds: Dataset, repeat: int):
+    yield 'centrality', {}, lambda: centrality_measures(str(ds.relationships_json)), None
+
+
+BENCHMARKS = (bench_loader, bench_recommender, bench_validate, bench_extract, bench_centrality)
+
+
+def run(datasets: List[str], selected: List[str], repeat: int, no_limits: bool = False) -> Dict:
+    results = []
+    for name in datasets:
+        print(f"📦 Dataset {name}", file=sys.stderr)
+        ds = prepare_dataset(name)
+        validate_relationships.REPO_ROOT = ds.root
+        try:
+            for bench in BENCHMARKS:
+                for bench_name, params, func, setup in bench(ds, repeat):
+                    if selected and not any(bench_name.startswith(prefix) for prefix in selected):
+                        continue
+                    record = {'dataset': name, 'benchmark': bench_name, 'params': params,
+                              'models': ds.num_models, 'relationships': ds.num_relationships}
+                    limit = EDGE_LIMITS.get(bench_name)
+                    if limit is not None and ds.num_relationships > limit and not no_limits:
+                        record['skipped'] = f"more than {limit} relationships"
+                    else:
+                        with quiet():
+                            record.update(measure(func, repeat, setup))
+                    results.append(record)
+                    print(f"   {format_record(record)}", file=sys.stderr)
+        finally:
+            validate_relationships.REPO_ROOT = None
+    return {'meta': run_metadata(repeat), 'results': results}
+
+
+def run_metadata(repeat: int) -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'repeat': repeat,
+    }
+
+
+def result_key(record: Dict) -> str:
+    params = ','.join(f"{key}={value}" for key, value in sorted(record['params'].items()))
+    return f"{record['dataset']}/{record['benchmark']}" + (f"[{params}]" if params else '')
+
+
+def format_record(record: Dict) -> str:
+    if 'skipped' in record:
+        return f"{result_key(record):50s} skipped ({record['skipped']})"
+    return f"{result_key(record):50s} median {record['median'] * 1000:10.2f} ms   min {record['min'] * 1000:10.2f} ms"
+
+
+def compare(base: Dict, new: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[Dict]:
+    """Per-benchmark median ratios between two result files; returns the regressions"""
+    base_results = {result_key(r): r for r in base['results'] if 'median' in r}
+    regressions = []
+    print(f"{'benchmark':50s} {'base ms':>10s} {'new ms':>10s} {'ratio':>7s}")
+    for record in new['results']:
+        key = result_key(record)
+        old = base_results.get(key)
+        if old is None or 'median' not in record:
+            continue
+        ratio = record['median'] / old['median'] if old['median'] else float('inf')
+        regressed = ratio > 1 + threshold and record['median'] - old['median'] > MIN_DELTA
+        flag = ' ⚠️  regression' if regressed else (' ✅' if ratio < 1 - threshold else '')
+        print(f"{key:50s} {old['median'] * 1000:10.2f} {record['median'] * 1000:10.2f} {ratio:7.2f}{flag}")
+        if regressed:
+            regressions.append({'benchmark': key, 'base': old['median'], 'new': record['median'], 'ratio': ratio})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark loader, recommender, validator and centrality')
+    parser.add_argument('--datasets', default=','.join(DEFAULT_DATASETS),
+                        help=f"Comma-separated datasets: {', '.join(DATASETS)} (default: {','.join(DEFAULT_DATASETS)})")
+    parser.add_argument('--benchmarks', default='',
+                        help='Comma-separated benchmark name prefixes (e.g. loader,recommender.recommend)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (default: 3)')
+    parser.add_argument('--no-limits', action='store_true', help='Run slow benchmarks on large graphs too')
+    parser.add_argument('--output', '-o', help='Results JSON (default: .cache/bench/results-<timestamp>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help='Compare two result files')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help=f'Regression threshold for --compare (default: {REGRESSION_THRESHOLD})')
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        with open(args.compare[1], 'r', encoding='utf-8') as f:
+            new = json.load(f)
+        regressions = compare(base, new, args.threshold)
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1 if regressions else 0)
+
+    datasets = [name.strip() for name in args.datasets.split(',') if name.strip()]
+    unknown = [name for name in datasets if name not in DATASETS]
+    if unknown:
+        parser.error(f"unknown dataset(s): {', '.join(unknown)}")
+    selected = [prefix.strip() for prefix in args.benchmarks.split(',') if prefix.strip()]
+
+    report = run(datasets, selected, args.repeat, no_limits=args.no_limits)
+    output = Path(args.output) if args.output else BENCH_DIR / f"results-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -11,33 +11,34 @@ This script:
 
 import sys
 import json
+import re
 import requests
 from pathlib import Path
 from typing import Dict, List, Optional
 from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent))
-from validate_relationships import ModelLoader
+from validate_relationships import ModelLoader, TRANSFORMATIONS
 
 
 def load_repository_models() -> Dict[str, Dict]:
     """Load all models from repository."""
-    loader = ModelLoader()
+    loader = ModelLoader(snapshot=True)
     models = {}
     
-    transformations = ['P', 'IN', 'CO', 'DE', 'RE', 'SY']
-    for transform in transformations:
+    for code, info in loader.load_all().items():
+        models[code] = {
+            'code': code,
+            'name': info.get('name', 'Unknown').strip(),
+            'description': info.get('description', ''),
+            'transform': re.match(r'[A-Z]{1,2}', code).group()
+        }
+    
+    # Flag gaps in the Base120 numbering
+    for transform in TRANSFORMATIONS:
         for i in range(1, 21):
             code = f"{transform}{i:02d}"
-            info = loader.load_model(code)
-            if info:
-                models[code] = {
-                    'code': code,
-                    'name': info.get('name', 'Unknown').strip(),
-                    'description': info.get('description', ''),
-                    'transform': transform
-                }
-            else:
+            if code not in models:
                 models[code] = {
                     'code': code,
                     'name': 'NOT FOUND',
@@ -12,6 +12,7 @@ added to the API response, including:
 
 Usage:
     python tools/extract_model_context.py [--output enhanced-models.json]
+    python tools/extract_model_context.py --watch   # Regenerate as model files change
 """
 
 import sys
@@ -22,7 +23,10 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 sys.path.insert(0, str(Path(__file__).parent))
+from model_codes import canonical_code, transformation_of
 from validate_relationships import ModelLoader
+from model_watch import WatchingModelLoader
+from model_sections import first_section, split_sections
 
 # Import relationship data extractor
 try:
@@ -33,21 +37,25 @@ except ImportError:
     extract_relationship_data = None  # type: ignore
 
 
+def clean_example(example_text: str) -> str:
+    """Flatten an Example section for API output."""
+    # Clean up markdown formatting
+    example_text = re.sub(r'\*\*(.*?)\*\*', r'\1', example_text)  # Remove bold
+    example_text = re.sub(r'`(.*?)`', r'\1', example_text)  # Remove code ticks
+    example_text = re.sub(r'\n+', ' ', example_text)  # Collapse newlines
+    example_text = re.sub(r'\s+', ' ', example_text)  # Collapse spaces
+    # Limit to reasonable length for API
+    if len(example_text) > 500:
+        example_text = example_text[:497] + "..."
+    return example_text
+
+
 def extract_example(content: str) -> Optional[str]:
     """Extract example section from markdown content."""
-    # Look for ## Example section
-    example_match = re.search(r'##\s+Example\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL | re.IGNORECASE)
-    if example_match:
-        example_text = example_match.group(1).strip()
-        # Clean up markdown formatting
-        example_text = re.sub(r'\*\*(.*?)\*\*', r'\1', example_text)  # Remove bold
-        example_text = re.sub(r'`(.*?)`', r'\1', example_text)  # Remove code ticks
-        example_text = re.sub(r'\n+', ' ', example_text)  # Collapse newlines
-        example_text = re.sub(r'\s+', ' ', example_text)  # Collapse spaces
-        # Limit to reasonable length for API
-        if len(example_text) > 500:
-            example_text = example_text[:497] + "..."
-        return example_text
+    _, sections = split_sections(content)
+    example_text = first_section(sections, 'Example')
+    if example_text:
+        return clean_example(example_text)
     return None
 
 
@@ -57,19 +65,10 @@ def extract_enhanced_context(model_code: str, loader: ModelLoader, relationship_
     if not info:
         return None
     
-    # Load raw content for example extraction
-    match = re.match(r'([A-Z]{1,2})(\d{1,2})', model_code)
-    if not match:
+    normalized_code = canonical_code(model_code)
+    if normalized_code is None:
         return None
-    
-    transform, number = match.groups()
-    normalized_code = f"{transform}{number.zfill(2)}"
-    model_file = Path(loader.models_dir) / transform / f"{normalized_code}.md"
-    
-    raw_content = ""
-    if model_file.exists():
-        with open(model_file, 'r', encoding='utf-8') as f:
-            raw_content = f.read()
+    transform = transformation_of(normalized_code)
     
     enhanced = {
         'code': normalized_code,
@@ -82,9 +81,8 @@ def extract_enhanced_context(model_code: str, loader: ModelLoader, relationship_
     }
     
     # Add example if available
-    example = extract_example(raw_content)
-    if example:
-        enhanced['example'] = example
+    if info.get('example'):
+        enhanced['example'] = clean_example(info['example'])
     
     # Add related models
     related = info.get('related_models', [])
@@ -118,6 +116,40 @@ def extract_enhanced_context(model_code: str, loader: ModelLoader, relationship_
     return enhanced
 
 
+def write_context_file(output_path: Path, contexts: List[Dict]):
+    """Write the enhanced-context JSON file"""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'total': len(contexts),
+            'models': contexts
+        }, f, indent=2, ensure_ascii=False)
+
+
+def watch_contexts(loader: WatchingModelLoader, contexts: Dict[str, Dict], output_path: Path,
+                   relationship_data: Optional[Dict] = None):
+    """Re-extract only changed models and rewrite the output on every loader generation"""
+    print(f"\n👀 Watching {loader.models_dir} ({loader.backend}); Ctrl+C to stop", file=sys.stderr)
+    try:
+        while True:
+            changed = loader.refresh(timeout=None)
+            if not changed:
+                continue
+            for code in changed:
+                enhanced = extract_enhanced_context(code, loader, relationship_data)
+                if enhanced:
+                    contexts[code] = enhanced
+                else:
+                    contexts.pop(code, None)
+            ordered = [contexts[code] for code in loader.load_all() if code in contexts]
+            write_context_file(output_path, ordered)
+            print(f"generation {loader.generation}: updated {', '.join(sorted(changed))}", file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loader.close()
+
+
 def main():
     parser = argparse.ArgumentParser(description='Extract enhanced context from HUMMBL models for API')
     parser.add_argument('--output', '-o', type=str, default='validation/enhanced-models-context.json',
@@ -125,9 +157,14 @@ def main():
     parser.add_argument('--model', '-m', type=str, help='Extract context for a single model code')
     parser.add_argument('--format', choices=['api', 'full'], default='api',
                        help='Output format: api (for API response) or full (all fields)')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and regenerate the output when model files change')
     args = parser.parse_args()
     
-    loader = ModelLoader()
+    if args.watch:
+        loader = WatchingModelLoader(snapshot=True)
+    else:
+        loader = ModelLoader(snapshot=True)
     
     # Load relationship data if available
     relationship_data = None
@@ -149,25 +186,17 @@ def main():
             sys.exit(1)
     else:
         # All models
-        all_enhanced = []
-        transformations = ['P', 'IN', 'CO', 'DE', 'RE', 'SY']
+        contexts = {}
         
-        for transform in transformations:
-            for i in range(1, 21):
-                code = f"{transform}{i:02d}"
-                enhanced = extract_enhanced_context(code, loader, relationship_data)
-                if enhanced:
-                    all_enhanced.append(enhanced)
+        for code in loader.load_all():
+            enhanced = extract_enhanced_context(code, loader, relationship_data)
+            if enhanced:
+                contexts[code] = enhanced
+        all_enhanced = list(contexts.values())
         
         # Save to file
         output_path = Path(args.output)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump({
-                'total': len(all_enhanced),
-                'models': all_enhanced
-            }, f, indent=2, ensure_ascii=False)
+        write_context_file(output_path, all_enhanced)
         
         print(f"✅ Extracted enhanced context for {len(all_enhanced)} models")
         print(f"   Saved to: {output_path}")
@@ -207,6 +236,9 @@ def main():
         print("  - Response size: Up to 100MB (plenty of room)")
         print("  - Individual field: No hard limit, but keep reasonable")
         print("  - Recommended: description < 1000 chars, example < 500 chars")
+        
+        if args.watch:
+            watch_contexts(loader, contexts, output_path, relationship_data)
 
 
 if __name__ == '__main__':
@@ -23,15 +23,16 @@ from collections import defaultdict
 
 sys.path.insert(0, str(Path(__file__).parent))
 from validate_relationships import ModelLoader
+from relationships_columnar import load_relationships
 
 
-def extract_relationship_data(relationships_file: str = 'data/relationships.json') -> Dict:
+def extract_relationship_data(relationships_file: str = 'data/relationships.json',
+                              models_dir: Optional[str] = None) -> Dict:
     """Extract relationship data organized by model."""
     
-    with open(relationships_file, 'r', encoding='utf-8') as f:
-        relationships = json.load(f)
+    relationships = load_relationships(relationships_file)
     
-    loader = ModelLoader()
+    loader = ModelLoader(models_dir, snapshot=True)
     
     # Organize relationships by model
     model_data: Dict[str, Dict] = defaultdict(lambda: {
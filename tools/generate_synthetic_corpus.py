@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic HUMMBL corpus (model files + relationships) for scaling benchmarks.
+
+The real corpus has 120 models and a few hundred relationships, which hides
+quadratic behavior. This writes a self-contained tree that the regular tools
+accept unchanged:
+
+    <output>/models/<T>/<code>.md         frontmatter, summary, Description, Example, Related Models
+    <output>/data/relationships.json      indent=2 JSON array (same layout as the real file)
+    <output>/data/relationships.csv       CSV export (relation_id, from_model, ...)
+    <output>/validation/                  empty, for validate_relationships --root
+
+Models are spread evenly over the six transformations (P01.., IN01.., codes
+widen past 99 as needed). Relationship endpoints follow a Zipf-like hub
+distribution (--hub-skew, 0 = uniform); type mix, direction ratio and
+strengths default to the distributions of the real data. Output is
+deterministic for a given --seed.
+
+Usage:
+    python tools/generate_synthetic_corpus.py --output /tmp/hummbl-10k --models 10000 --edges 1000000
+    python tools/generate_synthetic_corpus.py -o /tmp/hummbl-small --models 600 --edges 5000 --hub-skew 1.2
+    python tools/generate_synthetic_corpus.py -o /tmp/g --models 10000 --edges 1000000 --no-models
+
+    ModelLoader(models_dir='/tmp/hummbl-10k/models')
+    SY19Recommender('/tmp/hummbl-10k/data/relationships.json')
+    python tools/validate_relationships.py --phase consistency --root /tmp/hummbl-10k
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from model_codes import TRANSFORMATIONS, transformation_of
+from relationship_graph import DIRECTION_NAMES, RELATIONSHIP_TYPE_NAMES
+from relationships_stream import write_json_array
+
+# Defaults measured on data/relationships.json
+DEFAULT_TYPE_MIX = {
+    'COMPOSES_WITH': 0.37,
+    'SCAFFOLDS': 0.30,
+    'REFINES': 0.14,
+    'PARALLELS': 0.14,
+    'CONFLICTS': 0.03,
+    'CONTRASTS_WITH': 0.02,
+}
+DEFAULT_BIDIRECTIONAL_RATIO = 0.31
+STRENGTH_LEVELS = (0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+STRENGTH_WEIGHTS = (0.005, 0.08, 0.39, 0.29, 0.22, 0.015)
+
+TRANSFORMATION_NAMES = {
+    'P': 'Perspective',
+    'IN': 'Inversion',
+    'CO': 'Composition',
+    'DE': 'Decomposition',
+    'RE': 'Recursion',
+    'SY': 'Meta-Systems',
+}
+
+# Domain vocabulary, so text search and keyword detection have something to match
+VOCABULARY = (
+    'analysis', 'assumption', 'balance', 'boundary', 'bottleneck', 'cause', 'change', 'constraint',
+    'context', 'contrast', 'cost', 'customer', 'cycle', 'data', 'decision', 'delay', 'dependency',
+    'design', 'effect', 'emergence', 'evidence', 'experiment', 'failure', 'feedback', 'first',
+    'flow', 'forecast', 'frame', 'goal', 'growth', 'habit', 'hypothesis', 'incentive', 'inversion',
+    'iteration', 'layer', 'leverage', 'loop', 'map', 'margin', 'market', 'measure', 'mental',
+    'model', 'module', 'network', 'option', 'order', 'outcome', 'pattern', 'perspective', 'pivot',
+    'plan', 'principle', 'priority', 'problem', 'process', 'prototype', 'question', 'reason',
+    'recursion', 'reframe', 'resource', 'review', 'risk', 'root', 'scale', 'scenario', 'sequence',
+    'signal', 'simulation', 'stakeholder', 'strategy', 'structure', 'system', 'team', 'tension',
+    'test', 'threshold', 'time', 'tradeoff', 'trend', 'uncertainty', 'value', 'variable', 'vision',
+)
+VERBS = (
+    'enables', 'strengthens', 'grounds', 'extends', 'informs', 'sharpens', 'complements',
+    'challenges', 'structures', 'prepares', 'balances', 'reveals',
+)
+
+
+def parse_type_mix(spec: str) -> Dict[str, float]:
+    """'SCAFFOLDS=0.5,REFINES=0.5' -> normalized weights over known relationship types"""
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip().upper()
+        if name not in RELATIONSHIP_TYPE_NAMES:
+            raise ValueError(f"Unknown relationship type '{name}' (expected one of {RELATIONSHIP_TYPE_NAMES})")
+        mix[name] = float(weight)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError('Type mix weights must sum to a positive number')
+    return {name: weight / total for name, weight in mix.items()}
+
+
+def model_codes(count: int) -> List[str]:
+    """Codes spread evenly over the transformations, in canonical (P01, P02, ..., SY20) order"""
+    per_transformation, extra = divmod(count, len(TRANSFORMATIONS))
+    width = max(2, len(str(per_transformation + 1)))
+    codes = []
+    for index, transform in enumerate(TRANSFORMATIONS):
+        for number in range(1, per_transformation + (index < extra) + 1):
+            codes.append(f"{transform}{number:0{width}d}")
+    return codes
+
+
+def hub_weights(count: int, skew: float, rng: np.random.Generator) -> np.ndarray:
+    """Endpoint probabilities: Zipf-like over a random model ranking (skew 0 = uniform)"""
+    ranks = rng.permutation(count) + 1
+    weights = ranks.astype(np.float64) ** -skew
+    return weights / weights.sum()
+
+
+def generate_edges(num_models: int, num_edges: int, type_mix: Dict[str, float], bidirectional_ratio: float,
+                   hub_skew: float, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """Edge columns (src, dst, type, direction, strength) with no self-loops"""
+    if num_models < 2 and num_edges:
+        raise ValueError('At least two models are needed to generate relationships')
+    weights = hub_weights(num_models, hub_skew, rng)
+    src = rng.choice(num_models, size=num_edges, p=weights)
+    dst = rng.choice(num_models, size=num_edges, p=weights)
+    loops = np.flatnonzero(src == dst)
+    while loops.size:
+        dst[loops] = rng.choice(num_models, size=loops.size, p=weights)
+        loops = loops[src[loops] == dst[loops]]
+    type_names = list(type_mix)
+    types = rng.choice(len(type_names), size=num_edges, p=[type_mix[name] for name in type_names])
+    strength_weights = np.array(STRENGTH_WEIGHTS) / sum(STRENGTH_WEIGHTS)
+    return {
+        'src': src,
+        'dst': dst,
+        'type': np.array([RELATIONSHIP_TYPE_NAMES.index(name) for name in type_names])[types],
+        'direction': (rng.random(num_edges) < bidirectional_ratio).astype(np.uint8),
+        'strength': rng.choice(len(STRENGTH_LEVELS), size=num_edges, p=strength_weights),
+    }
+
+
+class TextGenerator:
+    """Deterministic pseudo-prose from the domain vocabulary"""
+
+    def __init__(self, rng: np.random.Generator, words: int):
+        self.rng = rng
+        self.words = max(3, words)
+
+    def phrase(self, count: int) -> str:
+        picks = self.rng.integers(0, len(VOCABULARY), size=count)
+        return ' '.join(VOCABULARY[i] for i in picks)
+
+    def sentence(self, words: int = 0) -> str:
+        count = words or max(3, int(self.rng.normal(self.words, self.words / 4)))
+        text = self.phrase(count)
+        return text[0].upper() + text[1:] + '.'
+
+    def name(self) -> str:
+        return ' '.join(word.capitalize() for word in self.phrase(int(self.rng.integers(2, 4))).split())
+
+    def edge_descriptions(self, src_names: Sequence[str], dst_names: Sequence[str]) -> List[str]:
+        """Relationship descriptions (~words long) mentioning both model names"""
+        count = len(src_names)
+        lengths = np.maximum(2, self.rng.normal(self.words - 3, self.words / 4, size=count).astype(int))
+        verbs = self.rng.integers(0, len(VERBS), size=count)
+        picks = self.rng.integers(0, len(VOCABULARY), size=int(lengths.sum()))
+        descriptions = []
+        offset = 0
+        for i in range(count):
+            tail = ' '.join(VOCABULARY[j] for j in picks[offset:offset + lengths[i]])
+            offset += lengths[i]
+            descriptions.append(f"{src_names[i]} {VERBS[verbs[i]]} {dst_names[i]} through {tail}")
+        return descriptions
+
+
+def write_model_file(path: Path, code: str, name: str, transform: str, text: TextGenerator,
+                     related: Sequence[Tuple[str, str]]):
+    related_lines = [f"- {other} – {other_name} ({text.phrase(2)})" for other, other_name in related] or ['- TBD']
+    content = '\n'.join([
+        '---',
+        f'code: {code}',
+        f'name: {name}',
+        f'transformation: {transform}',
+        'status: draft',
+        'version: 0.1.0',
+        '---',
+        '',
+        f'# {code} - {name}',
+        '',
+        f'> {text.sentence(10)}',
+        '',
+        '## Description',
+        '',
+        f'{name} is a {TRANSFORMATION_NAMES[transform].lower()} model. ' + ' '.join(text.sentence() for _ in range(3)),
+        '',
+        '## Example',
+        '',
+        ' '.join(text.sentence() for _ in range(2)),
+        '',
+        '## Related Models',
+        '',
+        *related_lines,
+        '',
+    ])
+    path.write_text(content, encoding='utf-8')
+
+
+def related_models(src: np.ndarray, dst: np.ndarray, num_models: int, limit: int = 3) -> List[List[int]]:
+    """First few outgoing targets of each model (in edge order)"""
+    order = np.argsort(src, kind='stable')
+    starts = np.searchsorted(src[order], np.arange(num_models + 1))
+    return [dst[order[starts[i]:min(starts[i + 1], starts[i] + limit)]].tolist() for i in range(num_models)]
+
+
+def generate(output: Path, num_models: int = 120, num_edges: int = 333, type_mix: Dict[str, float] = None,
+             bidirectional_ratio: float = DEFAULT_BIDIRECTIONAL_RATIO, hub_skew: float = 1.0,
+             description_words: int = 9, seed: int = 0, write_models: bool = True,
+             write_csv: bool = True) -> Dict:
+    """Write a synthetic corpus under output/; returns a summary dict"""
+    rng = np.random.default_rng(seed)
+    text = TextGenerator(rng, description_words)
+    codes = model_codes(num_models)
+    names = [text.name() for _ in codes]
+    edges = generate_edges(num_models, num_edges, type_mix or DEFAULT_TYPE_MIX, bidirectional_ratio, hub_skew, rng)
+
+    (output / 'data').mkdir(parents=True, exist_ok=True)
+    (output / 'validation').mkdir(exist_ok=True)
+
+    if write_models:
+        related = related_models(edges['src'], edges['dst'], num_models)
+        for transform in TRANSFORMATIONS:
+            (output / 'models' / transform).mkdir(parents=True, exist_ok=True)
+        for index, code in enumerate(codes):
+            transform = transformation_of(code)
+            write_model_file(output / 'models' / transform / f'{code}.md', code, names[index], transform,
+                             text, [(codes[other], names[other]) for other in related[index]])
+
+    id_width = max(3, len(str(num_edges)))
+    src_codes = [codes[i] for i in edges['src'].tolist()]
+    dst_codes = [codes[i] for i in edges['dst'].tolist()]
+    descriptions = text.edge_descriptions([names[i] for i in edges['src'].tolist()],
+                                          [names[i] for i in edges['dst'].tolist()])
+    types = edges['type'].tolist()
+    directions = edges['direction'].tolist()
+    strengths = edges['strength'].tolist()
+
+    def records():
+        for i in range(num_edges):
+            yield {
+                'id': f"REL-{i + 1:0{id_width}d}",
+                'from': src_codes[i],
+                'to': dst_codes[i],
+                'type': RELATIONSHIP_TYPE_NAMES[types[i]],
+                'strength': STRENGTH_LEVELS[strengths[i]],
+                'direction': DIRECTION_NAMES[directions[i]],
+                'description': descriptions[i],
+            }
+
+    write_json_array(records(), output / 'data' / 'relationships.json')
+    if write_csv:
+        with open(output / 'data' / 'relationships.csv', 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['relation_id', 'from_model', 'to_model', 'relation_type', 'strength',
+                             'direction', 'description'])
+            for rel in records():
+                writer.writerow([rel['id'], rel['from'], rel['to'], rel['type'], f"{rel['strength']:g}",
+                                 rel['direction'], rel['description']])
+
+    return {
+        'output': str(output),
+        'models': num_models,
+        'model_files': num_models if write_models else 0,
+        'relationships': num_edges,
+        'seed': seed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic HUMMBL corpus for scaling benchmarks')
+    parser.add_argument('--output', '-o', required=True, help='Output directory (models/, data/, validation/)')
+    parser.add_argument('--models', type=int, default=120, help='Number of models (default: 120)')
+    parser.add_argument('--edges', type=int, default=333, help='Number of relationships (default: 333)')
+    parser.add_argument('--type-mix', help='Relationship type weights, e.g. SCAFFOLDS=0.5,REFINES=0.5 '
+                                           '(default: distribution of the real data)')
+    parser.add_argument('--bidirectional', type=float, default=DEFAULT_BIDIRECTIONAL_RATIO,
+                        help=f'Fraction of bidirectional relationships (default: {DEFAULT_BIDIRECTIONAL_RATIO})')
+    parser.add_argument('--hub-skew', type=float, default=1.0,
+                        help='Zipf exponent for endpoint popularity; 0 = uniform (default: 1.0)')
+    parser.add_argument('--description-words', type=int, default=9,
+                        help='Mean words per description sentence (default: 9)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--no-models', action='store_true', help='Only write relationships (no model files)')
+    parser.add_argument('--no-csv', action='store_true', help='Skip the CSV export')
+    args = parser.parse_args()
+
+    try:
+        type_mix = parse_type_mix(args.type_mix) if args.type_mix else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    summary = generate(
+        Path(args.output), num_models=args.models, num_edges=args.edges, type_mix=type_mix,
+        bidirectional_ratio=args.bidirectional, hub_skew=args.hub_skew,
+        description_words=args.description_words, seed=args.seed,
+        write_models=not args.no_models, write_csv=not args.no_csv,
+    )
+    print(f"✅ Generated {summary['models']} models ({summary['model_files']} files) and "
+          f"{summary['relationships']} relationships in {summary['output']} "
+          f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
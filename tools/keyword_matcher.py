@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Multi-pattern keyword matching with an Aho-Corasick automaton.
+
+Checking `keyword in text` for every keyword costs O(keywords x text). A
+KeywordMatcher compiles the keyword list once into a trie with failure links,
+then finds every occurrence of every keyword in a single left-to-right scan of
+the text, so matching cost no longer grows with the size of the keyword map.
+
+Matches can be restricted to word boundaries:
+    None      - plain substring matches (same as `keyword in text`)
+    'prefix'  - match must start at a word boundary ('error' matches "errors"
+                but 'system' does not match "ecosystem")
+    'word'    - match must start and end at a word boundary
+
+Compiled automata are persisted as JSON under .cache/keyword-matchers/,
+keyed by a hash of the keywords and options, so large mined keyword maps are
+compiled only once.
+
+Usage:
+    python tools/keyword_matcher.py "text to scan" --keywords failure cascade loop
+    python tools/keyword_matcher.py --benchmark
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Matcher file format version (bump when the automaton layout changes)
+MATCHER_VERSION = 1
+
+BOUNDARIES = (None, 'prefix', 'word')
+
+DEFAULT_MATCHER_DIR = Path(__file__).parent.parent / '.cache' / 'keyword-matchers'
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def matcher_key(keywords: Sequence[str], boundary: Optional[str] = None,
+                case_sensitive: bool = False) -> str:
+    """Hash of everything a compiled automaton depends on"""
+    digest = hashlib.sha256(json.dumps({
+        'version': MATCHER_VERSION,
+        'keywords': list(keywords),
+        'boundary': boundary,
+        'case_sensitive': case_sensitive,
+    }).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed keyword list; keyword ids are list positions"""
+
+    def __init__(self, keywords: List[str], goto: List[Dict[str, int]], fail: List[int],
+                 outputs: List[List[int]], boundary: Optional[str] = None,
+                 case_sensitive: bool = False, key: str = ''):
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"Unknown boundary {boundary!r} (expected one of {BOUNDARIES})")
+        self.keywords = keywords
+        self.goto = goto
+        self.fail = fail
+        self.outputs = outputs
+        self.boundary = boundary
+        self.case_sensitive = case_sensitive
+        self.key = key
+        self._lengths = [len(keyword) for keyword in keywords]
+
+    @classmethod
+    def build(cls, keywords: Sequence[str], boundary: Optional[str] = None,
+              case_sensitive: bool = False) -> 'KeywordMatcher':
+        """Compile keywords into a trie with failure links and merged outputs"""
+        keywords = list(keywords)
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for keyword_id, keyword in enumerate(keywords):
+            if not keyword:
+                raise ValueError('Empty keyword')
+            state = 0
+            for char in (keyword if case_sensitive else keyword.lower()):
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(keyword_id)
+
+        # Breadth-first failure links; each state also reports its failure chain's keywords
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                outputs[next_state].extend(outputs[fail[next_state]])
+
+        return cls(keywords, goto, fail, outputs, boundary, case_sensitive,
+                   matcher_key(keywords, boundary, case_sensitive))
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start, keyword_id) for every match, in order of match end"""
+        if not self.case_sensitive:
+            text = text.lower()
+        goto, fail, outputs, lengths = self.goto, self.fail, self.outputs, self._lengths
+        boundary = self.boundary
+        text_length = len(text)
+        state = 0
+        for end, char in enumerate(text, 1):
+            next_state = goto[state].get(char)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(char)
+            state = next_state or 0
+            if not outputs[state]:
+                continue
+            for keyword_id in outputs[state]:
+                start = end - lengths[keyword_id]
+                if boundary is not None:
+                    if start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if boundary == 'word' and end < text_length and _is_word_char(text[end]):
+                        continue
+                yield start, keyword_id
+
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """All matches as (start, keyword), in order of match end"""
+        return [(start, self.keywords[keyword_id]) for start, keyword_id in self.iter_matches(text)]
+
+    def matched_ids(self, text: str) -> Set[int]:
+        """Ids of the keywords that occur in text"""
+        return {keyword_id for _, keyword_id in self.iter_matches(text)}
+
+    def matched(self, text: str) -> List[str]:
+        """Distinct keywords that occur in text, in keyword-list order"""
+        return [self.keywords[keyword_id] for keyword_id in sorted(self.matched_ids(text))]
+
+    @property
+    def num_states(self) -> int:
+        return len(self.goto)
+
+    def save(self, path: Path):
+        """Persist the compiled automaton as JSON (atomic replace)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': MATCHER_VERSION,
+                'key': self.key,
+                'keywords': self.keywords,
+                'boundary': self.boundary,
+                'case_sensitive': self.case_sensitive,
+                'goto': self.goto,
+                'fail': self.fail,
+                'outputs': self.outputs,
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['KeywordMatcher']:
+        """Load a persisted automaton; None if missing or from another format version"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != MATCHER_VERSION:
+            return None
+        return cls(data['keywords'], data['goto'], data['fail'], data['outputs'],
+                   data['boundary'], data['case_sensitive'], data.get('key', ''))
+
+
+def matcher_path(key: str, directory: Optional[Path] = None) -> Path:
+    return Path(directory or DEFAULT_MATCHER_DIR) / f"{key[:20]}.json"
+
+
+def load_or_build_matcher(keywords: Sequence[str], boundary: Optional[str] = None,
+                          case_sensitive: bool = False,
+                          directory: Optional[Path] = None) -> KeywordMatcher:
+    """Persisted automaton for these keywords and options, compiled and saved if missing"""
+    key = matcher_key(keywords, boundary, case_sensitive)
+    path = matcher_path(key, directory)
+    matcher = KeywordMatcher.load(path)
+    if matcher is None or matcher.key != key:
+        matcher = KeywordMatcher.build(keywords, boundary, case_sensitive)
+        try:
+            matcher.save(path)
+        except OSError as e:
+            print(f"⚠️  Could not write keyword matcher {path}: {e}", file=sys.stderr)
+    return matcher
+
+
+def mine_keywords(texts: Sequence[str], min_length: int = 4) -> List[str]:
+    """Distinct words and adjacent word pairs from texts (stopwords dropped), first-seen order"""
+    from model_search import STOPWORDS, TOKEN_RE
+    keywords = {}
+    for text in texts:
+        words = [word for word in TOKEN_RE.findall(text.lower())
+                 if len(word) >= min_length and word not in STOPWORDS]
+        for word in words:
+            keywords.setdefault(word, None)
+        for first, second in zip(words, words[1:]):
+            keywords.setdefault(f"{first} {second}", None)
+    return list(keywords)
+
+
+def _naive_matched(keywords: Sequence[str], texts: Sequence[str]) -> int:
+    total = 0
+    for text in texts:
+        text_lower = text.lower()
+        total += sum(1 for keyword in keywords if keyword in text_lower)
+    return total
+
+
+def _automaton_matched(matcher: KeywordMatcher, texts: Sequence[str]) -> int:
+    return sum(len(matcher.matched_ids(text)) for text in texts)
+
+
+def run_benchmark(repeat: int = 3):
+    """Compare the automaton with per-keyword `in` checks on model texts"""
+    from sy19_recommend import SY19Recommender
+    from validate_relationships import ModelLoader
+
+    models = ModelLoader().load_all()
+    texts = [f"{model.get('description', '')} {model.get('example') or ''}" for model in models.values()]
+    keyword_sets = [
+        ('SY19 keyword map', list(SY19Recommender.KEYWORD_MAP)),
+        ('mined from model texts', mine_keywords(texts)),
+    ]
+    text_chars = sum(len(text) for text in texts)
+    print(f"📊 {len(texts)} texts, {text_chars / 1000:.0f}k characters")
+    for label, keywords in keyword_sets:
+        start = time.perf_counter()
+        matcher = KeywordMatcher.build(keywords)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        timings = {}
+        for name, scan in (('naive', lambda: _naive_matched(keywords, texts)),
+                           ('automaton', lambda: _automaton_matched(matcher, texts))):
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                found = scan()
+                best = min(best, time.perf_counter() - start)
+            timings[name] = (best, found)
+
+        print(f"\n   {label}: {len(keywords)} keywords, {matcher.num_states} states "
+              f"(compiled in {build_ms:.1f} ms)")
+        for name, (seconds, found) in timings.items():
+            throughput = text_chars / seconds / 1e6
+            print(f"   {name:10s} {seconds * 1000:9.2f} ms  {throughput:7.2f} M chars/s  {found} matches")
+        print(f"   speedup    {timings['naive'][0] / timings['automaton'][0]:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find keywords in text with an Aho-Corasick automaton')
+    parser.add_argument('text', nargs='?', help='Text to scan')
+    parser.add_argument('--keywords', '-k', nargs='+', help='Keywords to find')
+    parser.add_argument('--boundary', choices=['none', 'prefix', 'word'], default='prefix',
+                        help='Word-boundary mode (default: prefix)')
+    parser.add_argument('--case-sensitive', action='store_true', help='Match case exactly')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Compare throughput with per-keyword substring checks')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark()
+        return
+    if not args.text or not args.keywords:
+        parser.error('text and --keywords are required unless --benchmark is given')
+
+    boundary = None if args.boundary == 'none' else args.boundary
+    matcher = load_or_build_matcher(args.keywords, boundary, args.case_sensitive)
+    for start, keyword in matcher.find_all(args.text):
+        print(f"{start:6d}  {keyword}")
+
+
+if __name__ == '__main__':
+    main()
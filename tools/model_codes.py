@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Canonical HUMMBL model codes and a dense integer-ID registry.
+
+Model codes appear in several spellings across the data (`IN8`, `IN08`,
+`P1`, `P01`). normalize_code() maps any spelling to the canonical
+zero-padded form through a precomputed alias table, so per-edge
+normalization in hot loops is a single dict lookup instead of a regex.
+
+ModelRegistry assigns every canonical code a dense integer ID (in stable
+model order) once. Graph, validator and recommender code can then key lists
+and arrays by ID instead of hashing strings.
+
+Usage:
+    from model_codes import normalize_code, ModelRegistry
+
+    normalize_code('IN8')                     # 'IN08'
+    registry = ModelRegistry.from_relationships(relationships)
+    registry.id('IN8') == registry.id('IN08') # True
+    registry.code(0)                          # 'P01'
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Canonical transformation order (used for stable model ordering)
+TRANSFORMATIONS = ['P', 'IN', 'CO', 'DE', 'RE', 'SY']
+
+# Models per transformation in the Base120 set
+BASE_MODELS_PER_TRANSFORMATION = 20
+
+# Leading transformation letters + model number (e.g. IN8, DE07, SY19x -> SY19;
+# synthetic corpora use wider numbers such as DE1234)
+CODE_RE = re.compile(r'([A-Z]{1,2})(\d+)')
+
+# Bound on memoized non-table spellings (keeps junk input from growing the table forever)
+MAX_MEMOIZED_ALIASES = 65536
+
+
+def _build_alias_table() -> Dict[str, str]:
+    """Every spelling of every transformation code with a 1-2 digit number"""
+    aliases = {}
+    for transform in TRANSFORMATIONS:
+        for number in range(100):
+            canonical = f"{transform}{number:02d}"
+            aliases[canonical] = canonical
+            aliases[f"{transform}{number}"] = canonical
+    return aliases
+
+
+# spelling -> canonical code (None when the spelling is not a model code)
+_ALIASES: Dict[str, Optional[str]] = _build_alias_table()
+
+
+def canonical_code(code: str) -> Optional[str]:
+    """Canonical form of a model code (IN8 -> IN08), or None if it is not a model code"""
+    try:
+        return _ALIASES[code]
+    except KeyError:
+        pass
+    match = CODE_RE.match(code)
+    canonical = f"{match.group(1)}{match.group(2).zfill(2)}" if match else None
+    if len(_ALIASES) < MAX_MEMOIZED_ALIASES:
+        _ALIASES[code] = canonical
+    return canonical
+
+
+def normalize_code(code: str) -> str:
+    """Normalize model code (IN8 -> IN08); strings that are not model codes pass through"""
+    canonical = canonical_code(code)
+    return code if canonical is None else canonical
+
+
+def transformation_of(code: str) -> str:
+    """Transformation prefix of a model code (DE07 -> DE, P1 -> P); '' if not a model code"""
+    match = CODE_RE.match(code)
+    return match.group(1) if match else ''
+
+
+def model_sort_key(code: str) -> Tuple:
+    """Stable ordering key: transformation order, then numeric model number"""
+    match = re.match(r'([A-Z]{1,2})(\d+)', code)
+    if not match:
+        return (len(TRANSFORMATIONS) + 1, code, 0)
+    transform, number = match.groups()
+    if transform in TRANSFORMATIONS:
+        return (TRANSFORMATIONS.index(transform), '', int(number))
+    return (len(TRANSFORMATIONS), transform, int(number))
+
+
+class ModelRegistry:
+    """Dense integer IDs for canonical model codes, with O(1) alias lookup"""
+
+    def __init__(self, codes: Iterable[str] = ()):
+        self.codes: List[str] = []
+        self._ids: Dict[str, int] = {}
+        for code in sorted({normalize_code(code) for code in codes}, key=model_sort_key):
+            self.intern(code)
+
+    @classmethod
+    def base120(cls) -> 'ModelRegistry':
+        """Registry of the 120 Base120 models (P01..SY20)"""
+        return cls(
+            f"{transform}{number:02d}"
+            for transform in TRANSFORMATIONS
+            for number in range(1, BASE_MODELS_PER_TRANSFORMATION + 1)
+        )
+
+    @classmethod
+    def from_relationships(cls, relationships: Iterable[Dict]) -> 'ModelRegistry':
+        """Registry of every model referenced by a relationships list"""
+        codes = set()
+        for rel in relationships:
+            codes.add(rel['from'])
+            codes.add(rel['to'])
+        return cls(codes)
+
+    def intern(self, code: str) -> int:
+        """ID for a code, registering it (and its spelling) if new"""
+        model_id = self._ids.get(code)
+        if model_id is not None:
+            return model_id
+        canonical = normalize_code(code)
+        model_id = self._ids.get(canonical)
+        if model_id is None:
+            model_id = len(self.codes)
+            self.codes.append(canonical)
+            self._ids[canonical] = model_id
+        self._ids[code] = model_id
+        return model_id
+
+    def id(self, code: str) -> int:
+        """ID for any spelling of a registered code (KeyError if unknown)"""
+        model_id = self.get(code)
+        if model_id is None:
+            raise KeyError(code)
+        return model_id
+
+    def get(self, code: str, default: Optional[int] = None) -> Optional[int]:
+        model_id = self._ids.get(code)
+        if model_id is None:
+            model_id = self._ids.get(normalize_code(code))
+            if model_id is None:
+                return default
+            # Remember the alias so the next lookup is a single dict hit
+            self._ids[code] = model_id
+        return model_id
+
+    def code(self, model_id: int) -> str:
+        """Canonical code for an ID"""
+        return self.codes[model_id]
+
+    def ids(self, codes: Iterable[str]) -> List[int]:
+        """IDs for a sequence of codes (KeyError on unknown codes)"""
+        return [self.id(code) for code in codes]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return self.get(code) is not None
+
+    def __repr__(self) -> str:
+        return f"ModelRegistry({len(self.codes)} models)"
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Offline BM25 full-text index over the HUMMBL model corpus.
+
+Indexes each model's name, description, example and the names of its related
+models (all loaded through ModelLoader), and ranks models for a free-text
+problem statement with Okapi BM25. No network or LLM is involved.
+
+Per-posting BM25 weights are precomputed at build time, so a query is just a
+few dictionary lookups and additions. The index is persisted as JSON (default
+`.cache/model-search-index.json`) together with a fingerprint of the model
+files, and is rebuilt automatically when any model file changes.
+
+Usage:
+    python tools/model_search.py "cascading failures between services"
+    python tools/model_search.py "stakeholder alignment" --top 5
+    python tools/model_search.py --rebuild
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from validate_relationships import ModelLoader
+
+# Index file format version (bump when tokenization or weighting changes)
+INDEX_VERSION = 1
+
+# Okapi BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Term-frequency multiplier per indexed field
+FIELD_WEIGHTS = {
+    'name': 3,
+    'description': 1,
+    'example': 1,
+    'related': 1,
+}
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few for from
+further had has have having he her here hers him his how i if in into is it its itself just
+me more most my no nor not now of off on once only or other our out over own same she should
+so some such than that the their them then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would you your
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:-[a-z0-9]+)*")
+
+
+def stem(token: str) -> str:
+    """Light suffix stripping so plurals and verb forms share a term"""
+    for suffix, replacement in (('ies', 'y'), ('ing', ''), ('ed', ''), ('es', ''), ('s', '')):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == 's' and token.endswith('ss'):
+                return token
+            return token[:-len(suffix)] + replacement
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case, split on non-alphanumerics, drop stopwords, stem"""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(stem(token))
+        if '-' in token:
+            # Index hyphenated terms ("second-order") as whole and parts
+            tokens.extend(stem(part) for part in token.split('-') if part not in STOPWORDS)
+    return tokens
+
+
+def corpus_fingerprint(loader: ModelLoader) -> str:
+    """Hash of model file paths, sizes and mtimes (stat only, no reads)"""
+    digest = hashlib.sha256()
+    for rel_path, stat in sorted(loader._scan_model_files().items()):
+        digest.update(f"{rel_path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """BM25 inverted index mapping terms to precomputed (model, weight) postings"""
+
+    def __init__(self, doc_codes: List[str], postings: Dict[str, Tuple[List[int], List[float]]],
+                 fingerprint: str = ''):
+        self.doc_codes = doc_codes
+        self.postings = postings
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, loader: ModelLoader) -> 'BM25Index':
+        """Build the index from every model in the loader's corpus"""
+        models = loader.load_all()
+        doc_codes = list(models)
+        doc_terms = []
+        for code, model in models.items():
+            related_names = ' '.join(
+                models[related].get('name', '') for related in model.get('related_models', [])
+                if related in models
+            )
+            fields = {
+                'name': f"{code} {model.get('name', '')}",
+                'description': model.get('description', ''),
+                'example': model.get('example') or '',
+                'related': related_names,
+            }
+            terms = Counter()
+            for field, text in fields.items():
+                for token in tokenize(text):
+                    terms[token] += FIELD_WEIGHTS[field]
+            doc_terms.append(terms)
+
+        doc_lengths = [sum(terms.values()) for terms in doc_terms]
+        avg_length = (sum(doc_lengths) / len(doc_lengths)) if doc_lengths else 1.0
+        doc_freq = Counter(term for terms in doc_terms for term in terms)
+        total_docs = len(doc_terms)
+
+        postings = {}
+        for doc_id, terms in enumerate(doc_terms):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[doc_id] / avg_length)
+            for term, tf in terms.items():
+                idf = math.log(1 + (total_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                weight = idf * tf * (BM25_K1 + 1) / (tf + norm)
+                doc_ids, weights = postings.setdefault(term, ([], []))
+                doc_ids.append(doc_id)
+                weights.append(round(weight, 6))
+
+        return cls(doc_codes, postings, corpus_fingerprint(loader))
+
+    def search(self, text: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """Rank models for a query; returns [(code, score), ...] best first"""
+        scores = {}
+        for term in set(tokenize(text)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            for doc_id, weight in zip(*posting):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(self.doc_codes[doc_id], score) for doc_id, score in best]
+
+    def save(self, path: Path):
+        """Persist the index as JSON (atomic replace)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'fingerprint': self.fingerprint,
+                'doc_codes': self.doc_codes,
+                'postings': self.postings,
+            }, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['BM25Index']:
+        """Load a persisted index; None if missing or from another format version"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != INDEX_VERSION:
+            return None
+        return cls(data['doc_codes'], data['postings'], data.get('fingerprint', ''))
+
+
+def default_index_path(loader: ModelLoader) -> Path:
+    return loader.models_dir.parent / '.cache' / 'model-search-index.json'
+
+
+def load_or_build_index(loader: Optional[ModelLoader] = None, index_path: Optional[Path] = None,
+                        rebuild: bool = False) -> BM25Index:
+    """Load the persisted index, rebuilding it if missing or stale"""
+    loader = loader or ModelLoader()
+    index_path = Path(index_path) if index_path else default_index_path(loader)
+
+    index = None if rebuild else BM25Index.load(index_path)
+    if index is None or index.fingerprint != corpus_fingerprint(loader):
+        index = BM25Index.build(loader)
+        try:
+            index.save(index_path)
+        except OSError as e:
+            print(f"⚠️  Could not write search index {index_path}: {e}", file=sys.stderr)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search HUMMBL models with BM25')
+    parser.add_argument('query', nargs='?', help='Problem description or search text')
+    parser.add_argument('--top', '-k', type=int, default=10, help='Number of results (default: 10)')
+    parser.add_argument('--index', help='Index file (default: .cache/model-search-index.json)')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the index from model files')
+    args = parser.parse_args()
+
+    loader = ModelLoader()
+    index = load_or_build_index(loader, args.index, rebuild=args.rebuild)
+    if args.rebuild:
+        print(f"✅ Indexed {len(index.doc_codes)} models ({len(index.postings)} terms)")
+    if not args.query:
+        return
+
+    start = time.perf_counter()
+    results = index.search(args.query, top_k=args.top)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for rank, (code, score) in enumerate(results, 1):
+        model = loader.load_model(code)
+        name = model.get('name', '') if model else ''
+        print(f"{rank:2d}. {code:6s} {score:6.3f}  {name}")
+    print(f"\n({len(results)} results in {elapsed_ms:.3f} ms)")
+
+
+if __name__ == '__main__':
+    main()
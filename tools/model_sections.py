@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Single-pass section tokenizer for HUMMBL model files.
+
+A model file is YAML-style frontmatter followed by markdown sections:
+
+    ---
+    code: DE01
+    name: Root Cause Analysis
+    ---
+    # DE01 - Root Cause Analysis
+    ## Description
+    ...
+    ## Related Models
+    ...
+
+`iter_sections` walks a file once and yields the frontmatter block plus the
+span of every `#`/`##` section. All field extractors (frontmatter, description,
+example, related models) are built on it, so each file is scanned once no
+matter how many fields are read. Headings inside fenced code blocks are
+ignored, and `###` sub-headings stay part of their parent section.
+
+Duplicated headings (e.g. two `## Related Models` sections) are all kept:
+description and example use the first non-empty section, related models are
+merged across every section.
+
+`ModelRecord` is the compact, lazily-decoded result type returned by
+`ModelLoader`: frontmatter is parsed eagerly, while description, example and
+related models are decoded from recorded byte offsets on first access.
+
+Usage:
+    python tools/model_sections.py models/DE/DE01.md
+    python tools/model_sections.py --benchmark --files 10000
+"""
+
+import argparse
+import gc
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+# Pseudo-heading yielded for the frontmatter block
+FRONTMATTER = '---'
+
+# One scan finds every heading line and code fence in the file
+_BOUNDARY_PATTERN = r'^(?:(#{1,2})[ \t]+([^\n]*)|```[^\n]*)$'
+_BOUNDARY_RE = re.compile(_BOUNDARY_PATTERN, re.MULTILINE)
+_BOUNDARY_RE_BYTES = re.compile(_BOUNDARY_PATTERN.encode(), re.MULTILINE)
+
+# Model codes referenced in Related Models sections (e.g. DE01, IN02, synthetic DE1234)
+RELATED_CODE_RE = re.compile(r'([A-Z]{2}\d{2,})')
+
+Text = Union[str, bytes]
+
+# Sections a ModelRecord decodes lazily
+LAZY_SECTIONS = ('description', 'example', 'related models')
+
+# Bytes read per chunk when only a model's frontmatter is needed
+HEAD_READ_SIZE = 1024
+
+
+def find_frontmatter(content: Text) -> Optional[Tuple[int, int]]:
+    """Return the (start, end) span of the frontmatter block, or None"""
+    fence = b'---' if isinstance(content, bytes) else '---'
+    if content.startswith(fence):
+        close = content.find(fence, 3)
+        if close != -1:
+            return 3, close
+    return None
+
+
+def iter_sections(content: Text, start: int = 0) -> Iterator[Tuple[str, int, int]]:
+    """
+    Yield (heading, start, end) spans for a model file in a single pass.
+
+    The frontmatter block comes first (heading FRONTMATTER) when present, then
+    the preamble before the first heading (heading ''), then one item per `#`
+    or `##` heading in file order. start/end delimit the section body (the text
+    after the heading line). Accepts str or bytes; offsets index into the input.
+    A non-zero start resumes scanning after an already-parsed frontmatter.
+    """
+    is_bytes = isinstance(content, bytes)
+    boundary_re = _BOUNDARY_RE_BYTES if is_bytes else _BOUNDARY_RE
+
+    pos = start
+    if start == 0:
+        span = find_frontmatter(content)
+        if span:
+            yield FRONTMATTER, span[0], span[1]
+            pos = span[1] + 3
+
+    heading = ''
+    body_start = pos
+    in_code = False
+    for match in boundary_re.finditer(content, pos):
+        if match.group(1) is None:
+            in_code = not in_code
+            continue
+        if in_code:
+            continue
+        yield heading, body_start, match.start()
+        title = match.group(2).strip()
+        heading = title.decode('utf-8', 'replace') if is_bytes else title
+        body_start = min(match.end() + 1, len(content))
+    yield heading, body_start, len(content)
+
+
+def parse_frontmatter(block: str, intern: bool = False) -> Dict[str, str]:
+    """
+    Parse `key: value` lines from a frontmatter block.
+
+    intern=True interns keys and values, so the repeated strings across a large
+    corpus (keys, status, version, transformation) are stored once.
+    """
+    frontmatter = {}
+    for line in block.strip().split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            if intern:
+                frontmatter[sys.intern(key.strip())] = sys.intern(value.strip())
+            else:
+                frontmatter[key.strip()] = value.strip()
+    return frontmatter
+
+
+def split_sections(content: str) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """
+    Tokenize a model file into its frontmatter and section bodies.
+
+    Returns:
+        (frontmatter, sections) where sections maps a lower-cased heading to
+        the list of its section bodies in file order.
+    """
+    frontmatter = {}
+    sections = {}
+    for heading, start, end in iter_sections(content):
+        if heading == FRONTMATTER:
+            frontmatter = parse_frontmatter(content[start:end])
+        else:
+            sections.setdefault(heading.lower(), []).append(content[start:end])
+    return frontmatter, sections
+
+
+def first_section(sections: Dict[str, List[str]], heading: str) -> Optional[str]:
+    """Return the first non-empty body for a heading (stripped), or None"""
+    for body in sections.get(heading.lower(), []):
+        body = body.strip()
+        if body:
+            return body
+    return None
+
+
+def extract_description(sections: Dict[str, List[str]]) -> str:
+    """Extract the Description section"""
+    return first_section(sections, 'Description') or ''
+
+
+def extract_example(sections: Dict[str, List[str]]) -> Optional[str]:
+    """Extract the raw Example section"""
+    return first_section(sections, 'Example')
+
+
+def extract_related_models(sections: Dict[str, List[str]]) -> List[str]:
+    """Extract model codes from every Related Models section, in first-seen order"""
+    models = {}
+    for body in sections.get('related models', []):
+        for code in RELATED_CODE_RE.findall(body):
+            models[code] = None
+    return list(models)
+
+
+class ModelRecord:
+    """
+    A parsed model file with lazily-decoded sections.
+
+    Only the frontmatter (name, status, ...) is parsed when the record is built;
+    the record keeps the byte offset where the markdown body starts. Description,
+    example and related models are tokenized from that offset and decoded
+    together on first access with a single read. If the file changed since the
+    record was built (mtime/size stamp), the whole file is re-parsed first.
+
+    Supports the read-only dict interface of the old per-model dicts
+    (``record['name']``, ``record.get('description')``, ``'related_models' in record``).
+    """
+
+    __slots__ = ('code', 'path', 'frontmatter', '_stamp', '_body_offset',
+                 '_description', '_example', '_related_models')
+
+    FIELDS = ('description', 'example', 'related_models')
+
+    def __init__(self, code: str, path: str, frontmatter: Dict[str, str], body_offset: int = 0,
+                 stamp: Optional[Tuple[int, int]] = None):
+        self.code = code
+        self.path = path
+        self.frontmatter = frontmatter
+        self._body_offset = body_offset
+        self._stamp = stamp
+        # _description, _example and _related_models stay unset until decoded
+
+    @classmethod
+    def from_bytes(cls, code: str, path: str, raw: bytes, stamp: Optional[Tuple[int, int]] = None,
+                   materialize: bool = False) -> Optional['ModelRecord']:
+        """
+        Build a record from the start of a model file; None if there is no frontmatter.
+
+        raw only needs to extend past the closing frontmatter fence unless
+        materialize=True, in which case it must be the whole file.
+        """
+        span = find_frontmatter(raw)
+        if span is None:
+            return None
+        frontmatter = parse_frontmatter(raw[span[0]:span[1]].decode('utf-8'), intern=True)
+        if not frontmatter:
+            return None
+        record = cls(code, path, frontmatter, span[1] + 3, stamp)
+        if materialize:
+            record._decode_sections(raw)
+        return record
+
+    @property
+    def name(self) -> str:
+        return self.frontmatter.get('name', '')
+
+    @property
+    def description(self) -> str:
+        try:
+            return self._description
+        except AttributeError:
+            return self.materialize()._description
+
+    @property
+    def example(self) -> Optional[str]:
+        try:
+            return self._example
+        except AttributeError:
+            return self.materialize()._example
+
+    @property
+    def related_models(self) -> List[str]:
+        try:
+            return self._related_models
+        except AttributeError:
+            return self.materialize()._related_models
+
+    def materialize(self) -> 'ModelRecord':
+        """Decode the lazy sections now (one file read)"""
+        if hasattr(self, '_description'):
+            return self
+        with open(self.path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            raw = f.read()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._stamp is not None and self._stamp != stamp:
+            # File changed after the record was built - offsets are stale
+            fresh = ModelRecord.from_bytes(self.code, self.path, raw, stamp)
+            if fresh is not None:
+                self.frontmatter = fresh.frontmatter
+                self._body_offset = fresh._body_offset
+            self._stamp = stamp
+        self._decode_sections(raw)
+        return self
+
+    def _decode_sections(self, raw: bytes):
+        sections = {}
+        for heading, start, end in iter_sections(raw, self._body_offset):
+            heading = heading.lower()
+            if heading in LAZY_SECTIONS:
+                sections.setdefault(heading, []).append(raw[start:end].decode('utf-8'))
+        self._description = extract_description(sections)
+        self._example = extract_example(sections)
+        self._related_models = extract_related_models(sections)
+
+    def keys(self) -> List[str]:
+        return list(dict.fromkeys([*self.frontmatter, 'code', *self.FIELDS]))
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __contains__(self, key) -> bool:
+        return key == 'code' or key in self.FIELDS or key in self.frontmatter
+
+    def __getitem__(self, key: str):
+        if key == 'code':
+            return self.code
+        if key in self.FIELDS:
+            return getattr(self, key)
+        return self.frontmatter[key]
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self) -> Dict:
+        """Plain dict with every field decoded"""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"ModelRecord({self.code!r}, name={self.name!r})"
+
+
+def read_model_record(code: str, path: str, materialize: bool = False) -> Optional[ModelRecord]:
+    """
+    Read a model file into a ModelRecord.
+
+    Unless materialize is set, only the head of the file up to the closing
+    frontmatter fence is read; sections are decoded lazily by the record.
+    """
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        if materialize:
+            raw = f.read()
+        else:
+            raw = f.read(HEAD_READ_SIZE)
+            while raw.startswith(b'---') and raw.find(b'---', 3) == -1:
+                chunk = f.read(HEAD_READ_SIZE)
+                if not chunk:
+                    break
+                raw += chunk
+    return ModelRecord.from_bytes(code, path, raw, (stat.st_mtime_ns, stat.st_size),
+                                  materialize=materialize)
+
+
+def _legacy_parse(content: str) -> Dict:
+    """Previous per-section regex parser, kept for benchmarking"""
+    frontmatter = {}
+    if content.startswith('---'):
+        parts = content.split('---', 2)
+        if len(parts) >= 3:
+            frontmatter = parse_frontmatter(parts[1])
+    match = re.search(r'## Description\s*\n\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
+    description = match.group(1).strip() if match else ''
+    related = []
+    match = re.search(r'## Related Models\s*\n\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
+    if match:
+        related = list(set(re.findall(r'([A-Z]{2}\d{2})', match.group(1))))
+    match = re.search(r'##\s+Example\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL | re.IGNORECASE)
+    example = match.group(1).strip() if match else None
+    return {'frontmatter': frontmatter, 'description': description,
+            'related_models': related, 'example': example}
+
+
+def _single_pass_parse(content: str) -> Dict:
+    """Tokenizer-based parser producing the same fields as _legacy_parse"""
+    frontmatter, sections = split_sections(content)
+    return {'frontmatter': frontmatter, 'description': extract_description(sections),
+            'related_models': extract_related_models(sections),
+            'example': extract_example(sections)}
+
+
+def _write_benchmark_corpus(root: Path, files: int) -> List[Path]:
+    """Write a synthetic corpus of model files shaped like models/<T>/<code>.md"""
+    transforms = ['P', 'IN', 'CO', 'DE', 'RE', 'SY']
+    sentence = "Decompose the system into parts and examine how each one contributes. "
+    paths = []
+    for i in range(files):
+        transform = transforms[i % len(transforms)]
+        code = f"{transform}{i // len(transforms) + 1:02d}"
+        path = root / transform / f"{code}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        related = '\n'.join(f"- {transforms[(i + k) % 6]}{k + 1:02d} – Related model {k}"
+                            for k in range(4))
+        path.write_text(
+            f"---\ncode: {code}\nname: Synthetic Model {i}\ntransformation: {transform}\n"
+            f"status: draft\nversion: 0.1.0\n---\n\n# {code} - Synthetic Model {i}\n\n"
+            f"> One-line summary.\n\n## Description\n\n{sentence * 4}\n\n"
+            f"## Example\n\n{sentence * 2}\n\n## Related Models\n\n{related}\n\n"
+            f"## Related Models\n\n- TBD\n",
+            encoding='utf-8'
+        )
+        paths.append(path)
+    return paths
+
+
+def run_benchmark(files: int = 10000, repeat: int = 3) -> Dict:
+    """
+    Time the legacy regex parser against the single-pass tokenizer, and eager
+    per-model dicts against lazy ModelRecords for a name-only lookup workload.
+    """
+    root = Path(tempfile.mkdtemp(prefix='hummbl-sections-'))
+    try:
+        paths = _write_benchmark_corpus(root, files)
+        contents = [path.read_text(encoding='utf-8') for path in paths]
+        results = {'files': files, 'repeat': repeat}
+
+        def eager_dicts():
+            return [_single_pass_parse(path.read_text(encoding='utf-8')) for path in paths]
+
+        def lazy_records():
+            return [read_model_record(path.stem, str(path)) for path in paths]
+
+        workloads = (('regex', lambda: [_legacy_parse(content) for content in contents]),
+                     ('single_pass', lambda: [_single_pass_parse(content) for content in contents]),
+                     ('eager_names', lambda: [d['frontmatter']['name'] for d in eager_dicts()]),
+                     ('lazy_names', lambda: [record.name for record in lazy_records()]))
+        for label, workload in workloads:
+            best = None
+            for _ in range(repeat):
+                # Like timeit, keep the collector out of the timed region
+                gc.collect()
+                gc.disable()
+                try:
+                    start = time.perf_counter()
+                    workload()
+                    elapsed = time.perf_counter() - start
+                finally:
+                    gc.enable()
+                best = elapsed if best is None else min(best, elapsed)
+            results[f'{label}_seconds'] = round(best, 4)
+        results['speedup'] = round(results['regex_seconds'] / results['single_pass_seconds'], 2)
+
+        # Retained memory after loading the corpus for name lookups
+        for label, build in (('eager_dicts', eager_dicts), ('lazy_records', lazy_records)):
+            tracemalloc.start()
+            kept = build()
+            results[f'{label}_kib'] = round(tracemalloc.get_traced_memory()[0] / 1024, 1)
+            tracemalloc.stop()
+            del kept
+        return results
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tokenize HUMMBL model files into sections')
+    parser.add_argument('files', nargs='*', help='Model markdown files to tokenize')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='Benchmark against the legacy regex parser on a synthetic corpus')
+    parser.add_argument('--files', dest='file_count', type=int, default=10000,
+                        help='Synthetic corpus size for --benchmark (default: 10000)')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        print(json.dumps(run_benchmark(args.file_count), indent=2))
+        return
+
+    if not args.files:
+        parser.error('provide model files or --benchmark')
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        print(json.dumps({'file': path, **_single_pass_parse(content)}, indent=2, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
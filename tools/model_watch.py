@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Filesystem-watching ModelLoader for long-running processes.
+
+`ModelLoader.cache` is filled once and never invalidated, so a long-lived
+recommender or API process keeps serving old names after tools such as
+update_all_model_names.py rewrite model files. WatchingModelLoader watches
+`models/<T>/*.md` (inotify on Linux, stat polling elsewhere), re-parses only
+the files that changed and swaps the updated records in as a new cache dict.
+
+Every swap increments `generation`. Downstream caches (recommender results,
+enhanced-context JSON, search indexes) can store the generation they were
+built at and rebuild when it moves, or subscribe() to receive the exact set
+of changed codes.
+
+Usage:
+    loader = WatchingModelLoader()
+    loader.start()                      # background thread
+    ...
+    loader.generation                   # bumps on every applied change
+    loader.subscribe(lambda gen, codes: print(gen, codes))
+
+    # Or without a thread, e.g. once per request:
+    loader.refresh()
+
+    python tools/model_watch.py         # print changes as they happen
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from model_sections import ModelRecord
+from validate_relationships import MODEL_FILE_PATTERN, ModelLoader
+
+# inotify event masks (linux/inotify.h)
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+FILE_EVENTS = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE | IN_CREATE | IN_ATTRIB
+DIR_EVENTS = IN_CREATE | IN_MOVED_TO | IN_DELETE | IN_MOVED_FROM | IN_DELETE_SELF | IN_MOVE_SELF
+
+EVENT_HEADER = struct.Struct('iIII')
+
+# Seconds to wait for more events after the first one, so an editor's
+# write+rename or a bulk rewrite lands as a single generation
+DEBOUNCE_SECONDS = 0.05
+
+
+class PollingWatcher:
+    """Portable watcher: stat-scans the models directory and reports changed paths"""
+
+    def __init__(self, loader: ModelLoader, interval: float = 1.0):
+        self.loader = loader
+        self.interval = interval
+        self._stamps = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        return {
+            rel_path: (stat.st_mtime_ns, stat.st_size)
+            for rel_path, stat in self.loader._scan_model_files().items()
+        }
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """Return relative paths changed since the last call (empty set on timeout)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stamps = self._scan()
+            changed = {
+                rel_path for rel_path in stamps.keys() | self._stamps.keys()
+                if stamps.get(rel_path) != self._stamps.get(rel_path)
+            }
+            self._stamps = stamps
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            sleep_for = self.interval
+            if deadline is not None:
+                sleep_for = min(sleep_for, max(0.0, deadline - time.monotonic()))
+            time.sleep(sleep_for)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher over models/ and each models/<T>/ directory (via ctypes)"""
+
+    def __init__(self, loader: ModelLoader):
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError('inotify is only available on Linux')
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError('libc has no inotify support')
+
+        self.loader = loader
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._dirs = {}  # watch descriptor -> transformation dir name ('' for models/)
+        self._add_watch(loader.models_dir, '', DIR_EVENTS)
+        for entry in os.scandir(loader.models_dir):
+            if entry.is_dir():
+                self._add_watch(Path(entry.path), entry.name, FILE_EVENTS | DIR_EVENTS)
+
+    def _add_watch(self, path: Path, name: str, mask: int):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {path}')
+        self._dirs[wd] = name
+
+    def _read_events(self) -> Iterator[Tuple[int, int, str]]:
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+                offset += length
+                yield wd, mask, name
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[Set[str]]:
+        """
+        Return relative paths touched by filesystem events (empty set on timeout).
+
+        Returns None when the kernel queue overflowed or a new transformation
+        directory appeared, meaning the caller should rescan everything.
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        rescan = False
+        while True:
+            for wd, mask, name in self._read_events():
+                if mask & IN_Q_OVERFLOW:
+                    rescan = True
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                parent = self._dirs.get(wd)
+                if parent is None:
+                    continue
+                if mask & IN_ISDIR or parent == '':
+                    if mask & (IN_CREATE | IN_MOVED_TO) and parent == '':
+                        self._add_watch(self.loader.models_dir / name, name, FILE_EVENTS | DIR_EVENTS)
+                    rescan = True
+                elif name.endswith('.md'):
+                    changed.add(f"{parent}/{name}")
+            readable, _, _ = select.select([self.fd], [], [], DEBOUNCE_SECONDS)
+            if not readable:
+                break
+        return None if rescan else changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class WatchingModelLoader(ModelLoader):
+    """
+    ModelLoader whose cache follows the model files on disk.
+
+    Changed files are re-parsed outside the lock, then a new cache dict is
+    published in one reference swap, so readers see either the old or the new
+    set of records, never a mix. The generation counter increments once per
+    applied batch of changes. Snapshot files (snapshot=True) are only read at
+    start-up; they are brought up to date on the next process start.
+    """
+
+    def __init__(self, models_dir: str = None, snapshot=None, backend: str = 'auto',
+                 poll_interval: float = 1.0):
+        """
+        Args:
+            models_dir: Path to the models directory (auto-detected if omitted)
+            snapshot: Compiled snapshot mode (see ModelLoader)
+            backend: 'inotify', 'poll', or 'auto' (inotify when available)
+            poll_interval: Seconds between directory scans for the polling backend
+        """
+        super().__init__(models_dir, snapshot=snapshot)
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._subscribers: List[Callable[[int, Set[str]], None]] = []
+        self._thread = None
+        self._stop = threading.Event()
+        self._stamps = self._stat_models()
+
+        self.watcher = None
+        if backend in ('auto', 'inotify'):
+            try:
+                self.watcher = InotifyWatcher(self)
+            except OSError:
+                if backend == 'inotify':
+                    raise
+        if self.watcher is None:
+            self.watcher = PollingWatcher(self, interval=poll_interval)
+        self.backend = 'inotify' if isinstance(self.watcher, InotifyWatcher) else 'poll'
+
+    def _stat_models(self, rel_paths: Optional[Set[str]] = None) -> Dict[str, Tuple[int, int]]:
+        """(mtime_ns, size) per model file; only the given paths if provided"""
+        if rel_paths is None:
+            return {
+                rel_path: (stat.st_mtime_ns, stat.st_size)
+                for rel_path, stat in self._scan_model_files().items()
+            }
+        stamps = {}
+        for rel_path in rel_paths:
+            try:
+                stat = os.stat(self.models_dir / rel_path)
+            except OSError:
+                continue
+            stamps[rel_path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def load_model(self, model_code: str) -> Optional[ModelRecord]:
+        model_data = self.cache.get(model_code)
+        if model_data is not None:
+            return model_data
+        # Misses insert into the cache; serialize them with swaps so a record
+        # read before a change cannot land in the freshly published dict
+        with self._lock:
+            return super().load_model(model_code)
+
+    def iter_models(self, workers: Optional[int] = None,
+                    executor: str = 'process') -> Iterator[Tuple[str, ModelRecord]]:
+        # Collect under the lock rather than holding it across yields
+        with self._lock:
+            models = list(super().iter_models(workers=workers, executor=executor))
+        yield from models
+
+    def subscribe(self, callback: Callable[[int, Set[str]], None]):
+        """Call callback(generation, changed_codes) after each applied change"""
+        self._subscribers.append(callback)
+
+    def refresh(self, timeout: float = 0.0) -> Set[str]:
+        """
+        Apply pending file changes; returns the set of changed model codes.
+
+        Waits up to timeout seconds for a change (None blocks until one arrives).
+        """
+        return self._apply(self.watcher.wait(timeout))
+
+    def _apply(self, rel_paths: Optional[Set[str]]) -> Set[str]:
+        if rel_paths is not None and not rel_paths:
+            return set()
+
+        with self._lock:
+            candidates = set(self._stamps) if rel_paths is None else set(rel_paths)
+            current = self._stat_models(None if rel_paths is None else candidates)
+            if rel_paths is None:
+                candidates |= set(current)
+            changed_paths = {
+                rel_path for rel_path in candidates
+                if current.get(rel_path) != self._stamps.get(rel_path)
+            }
+            if not changed_paths:
+                return set()
+            cache = self.cache
+
+        changed_codes = {Path(rel_path).stem for rel_path in changed_paths}
+        changed_codes = {code for code in changed_codes if MODEL_FILE_PATTERN.match(code)}
+        # Only records that were already loaded are re-parsed; others load on demand
+        jobs = [
+            (code, str(self.models_dir / rel_path))
+            for rel_path in sorted(changed_paths)
+            for code in (Path(rel_path).stem,)
+            if code in cache and rel_path in current
+        ]
+        parsed = dict(self._parse_files(jobs, materialize=True))
+
+        with self._lock:
+            new_cache = dict(self.cache)
+            for code in changed_codes:
+                new_cache.pop(code, None)
+            for code, model_data in parsed.items():
+                if model_data is not None:
+                    new_cache[code] = model_data
+            for rel_path in changed_paths:
+                if rel_path in current:
+                    self._stamps[rel_path] = current[rel_path]
+                else:
+                    self._stamps.pop(rel_path, None)
+            self.cache = new_cache
+            self.generation += 1
+            generation = self.generation
+
+        for callback in list(self._subscribers):
+            try:
+                callback(generation, changed_codes)
+            except Exception as e:
+                print(f"⚠️  Model watch subscriber failed: {e}", file=sys.stderr)
+        return changed_codes
+
+    def start(self) -> 'WatchingModelLoader':
+        """Apply changes from a background daemon thread until stop()"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='model-watch', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh(timeout=0.5)
+            except Exception as e:
+                print(f"⚠️  Model watch error: {e}", file=sys.stderr)
+                self._stop.wait(1.0)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self.watcher.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch HUMMBL model files and report reloads')
+    parser.add_argument('--models-dir', help='Models directory (auto-detected if omitted)')
+    parser.add_argument('--backend', choices=['auto', 'inotify', 'poll'], default='auto')
+    parser.add_argument('--interval', type=float, default=1.0, help='Polling interval in seconds')
+    args = parser.parse_args()
+
+    loader = WatchingModelLoader(args.models_dir, backend=args.backend, poll_interval=args.interval)
+    models = loader.load_all()
+    print(f"👀 Watching {len(models)} models in {loader.models_dir} ({loader.backend})")
+    try:
+        while True:
+            changed = loader.refresh(timeout=None)
+            if not changed:
+                continue
+            for code in sorted(changed):
+                model = loader.load_model(code)
+                status = f"'{model.get('name', '')}'" if model else 'removed'
+                print(f"generation {loader.generation}: {code} -> {status}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loader.close()
+
+
+if __name__ == '__main__':
+    main()
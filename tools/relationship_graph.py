@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+Compact CSR (compressed sparse row) graph over HUMMBL relationships.
+
+SY19, the validator, centrality and visualization tools all need the same
+adjacency structure. RelationshipGraph builds it once from the relationships
+list (or from columns) as NumPy arrays:
+
+    offsets    int64[N+1]  arcs of node i are offsets[i]:offsets[i+1]
+    neighbors  int32[E]    target node ID of each arc
+    strength   float32[E]  relationship strength
+    type       uint8[E]    index into graph.type_names
+    direction  uint8[E]    index into graph.direction_names
+    rel_index  int32[E]    index of the source relationship
+    is_reverse bool[E]     arc is the reverse expansion of a bidirectional relationship
+
+Bidirectional relationships are expanded once (A->B plus B->A). Arcs are
+grouped with a stable linear-time radix ordering, so per-node neighbor order
+matches appending arcs in relationship order (the order the dict-of-lists
+graphs used) and the build stays linear for million-edge graphs.
+
+Usage:
+    graph = RelationshipGraph.from_relationships(relationships)
+    node = graph.node_id('DE07')
+    for target in graph.forward.neighbors_of(node):
+        print(graph.nodes[target])
+
+    python tools/relationship_graph.py data/relationships.json   # summary + build time
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from model_codes import normalize_code
+
+# Known relationship types (uint8 codes 0..5); unknown types are appended per graph
+RELATIONSHIP_TYPE_NAMES = (
+    'SCAFFOLDS',
+    'COMPOSES_WITH',
+    'REFINES',
+    'PARALLELS',
+    'CONTRASTS_WITH',
+    'CONFLICTS',
+)
+
+# Known directions; index 1 marks relationships that are expanded both ways
+DIRECTION_NAMES = ('unidirectional', 'bidirectional')
+BIDIRECTIONAL = 1
+
+
+def stable_order(keys: np.ndarray, num_keys: int) -> np.ndarray:
+    """
+    Stable argsort of non-negative integer keys in linear time.
+
+    NumPy's stable sort is a radix sort for 16-bit integers, so keys are
+    sorted in one uint16 pass, or two passes (low then high half) above 65536.
+    """
+    if num_keys <= 1 << 16:
+        return np.argsort(keys.astype(np.uint16), kind='stable')
+    order = np.argsort((keys & 0xFFFF).astype(np.uint16), kind='stable')
+    high = (keys[order] >> 16).astype(np.uint16)
+    return order[np.argsort(high, kind='stable')]
+
+
+class CSRView:
+    """One direction (forward or reverse) of a RelationshipGraph"""
+
+    __slots__ = ('offsets', 'neighbors', 'strength', 'type', 'direction', 'rel_index', 'is_reverse')
+
+    def __init__(self, offsets, neighbors, strength, type, direction, rel_index, is_reverse):
+        self.offsets = offsets
+        self.neighbors = neighbors
+        self.strength = strength
+        self.type = type
+        self.direction = direction
+        self.rel_index = rel_index
+        self.is_reverse = is_reverse
+
+    def degree(self) -> np.ndarray:
+        """Number of arcs per node"""
+        return np.diff(self.offsets)
+
+    def span(self, node: int) -> slice:
+        """Slice of the arc arrays belonging to node"""
+        return slice(int(self.offsets[node]), int(self.offsets[node + 1]))
+
+    def neighbors_of(self, node: int) -> np.ndarray:
+        return self.neighbors[self.offsets[node]:self.offsets[node + 1]]
+
+    def sources(self) -> np.ndarray:
+        """Owning node of every arc (inverse of offsets)"""
+        return np.repeat(np.arange(len(self.offsets) - 1, dtype=np.int32), self.degree())
+
+
+class RelationshipGraph:
+    """CSR adjacency over relationships with forward and reverse views"""
+
+    def __init__(self, nodes: Sequence[str], src: np.ndarray, dst: np.ndarray,
+                 strength: np.ndarray, type_ids: np.ndarray, direction_ids: np.ndarray,
+                 type_names: Sequence[str] = RELATIONSHIP_TYPE_NAMES,
+                 direction_names: Sequence[str] = DIRECTION_NAMES,
+                 relationships: Optional[Sequence[Dict]] = None,
+                 expand_bidirectional: bool = True,
+                 normalized: bool = False,
+                 active: Optional[np.ndarray] = None):
+        """
+        Build from per-relationship columns (one entry per relationship).
+
+        Args:
+            nodes: Node codes; src/dst hold indexes into this list
+            src, dst: Endpoint node IDs per relationship
+            strength: Strength per relationship (kept exactly in rel_strength;
+                arcs carry a float32 copy)
+            type_ids, direction_ids: Indexes into type_names / direction_names
+            relationships: Optional source records, for attribute lookups
+            expand_bidirectional: Add a reverse arc for bidirectional relationships
+            normalized: Whether node codes were normalized (IN8 -> IN08)
+            active: Optional bool mask per relationship; inactive (removed)
+                relationships keep their index but get no arcs
+        """
+        self.nodes = list(nodes)
+        self.type_names = list(type_names)
+        self.direction_names = list(direction_names)
+        self.relationships = relationships
+        self.normalized = normalized
+        self.expand_bidirectional = expand_bidirectional
+
+        # Per-relationship columns (strength kept exactly as float64)
+        self.rel_src = src = np.asarray(src, dtype=np.int32)
+        self.rel_dst = dst = np.asarray(dst, dtype=np.int32)
+        self.rel_strength = np.asarray(strength, dtype=np.float64)
+        self.rel_type = type_ids = np.asarray(type_ids, dtype=np.uint8)
+        self.rel_direction = direction_ids = np.asarray(direction_ids, dtype=np.uint8)
+        num_rels = len(src)
+
+        # Expand arcs in relationship order: each bidirectional reverse arc
+        # directly follows its forward arc
+        if expand_bidirectional:
+            arcs_per_rel = 1 + (direction_ids == BIDIRECTIONAL)
+        else:
+            arcs_per_rel = np.ones(num_rels, dtype=np.int64)
+        if active is not None:
+            arcs_per_rel = arcs_per_rel * np.asarray(active, dtype=bool)
+        rel_index = np.repeat(np.arange(num_rels, dtype=np.int32), arcs_per_rel)
+        is_reverse = np.zeros(len(rel_index), dtype=bool)
+        first_arc = np.cumsum(arcs_per_rel) - arcs_per_rel
+        is_reverse[first_arc[arcs_per_rel == 2] + 1] = True
+        self.rel_active = active
+
+        arc_src = np.where(is_reverse, dst[rel_index], src[rel_index])
+        arc_dst = np.where(is_reverse, src[rel_index], dst[rel_index])
+        arc_strength = self.rel_strength[rel_index].astype(np.float32)
+        arc_type = type_ids[rel_index]
+        arc_direction = direction_ids[rel_index]
+
+        self.forward = self._view(arc_src, arc_dst, arc_strength, arc_type, arc_direction,
+                                  rel_index, is_reverse)
+        self.reverse = self._view(arc_dst, arc_src, arc_strength, arc_type, arc_direction,
+                                  rel_index, is_reverse)
+
+    def _view(self, owner, other, strength, type_ids, direction_ids, rel_index, is_reverse) -> CSRView:
+        num_nodes = len(self.nodes)
+        order = stable_order(owner, num_nodes)
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owner, minlength=num_nodes), out=offsets[1:])
+        return CSRView(offsets, other[order], strength[order], type_ids[order],
+                       direction_ids[order], rel_index[order], is_reverse[order])
+
+    @classmethod
+    def from_relationships(cls, relationships: Sequence[Dict], normalize: bool = False,
+                           expand_bidirectional: bool = True) -> 'RelationshipGraph':
+        """
+        Build from relationship dicts (from/to/type/strength/direction).
+
+        Node IDs follow first appearance (from, then to, per relationship),
+        which is also the node order of a networkx graph built edge by edge.
+        Columnar tables (relationships_columnar.RelationshipTable) are used
+        directly without touching individual rows.
+        """
+        if hasattr(relationships, 'graph_columns'):
+            nodes, src, dst = relationships.graph_columns(normalize)
+            return cls(nodes, src, dst, relationships.strength, relationships.type,
+                       relationships.direction, type_names=relationships.type_names,
+                       direction_names=relationships.direction_names,
+                       relationships=relationships, expand_bidirectional=expand_bidirectional,
+                       normalized=normalize)
+
+        node_ids: Dict[str, int] = {}
+        type_ids = {name: i for i, name in enumerate(RELATIONSHIP_TYPE_NAMES)}
+        direction_ids = {name: i for i, name in enumerate(DIRECTION_NAMES)}
+        num_rels = len(relationships)
+        src = np.empty(num_rels, dtype=np.int32)
+        dst = np.empty(num_rels, dtype=np.int32)
+        strength = np.empty(num_rels, dtype=np.float64)
+        rel_types = np.empty(num_rels, dtype=np.uint8)
+        directions = np.empty(num_rels, dtype=np.uint8)
+
+        for i, rel in enumerate(relationships):
+            from_model, to_model = rel['from'], rel['to']
+            if normalize:
+                from_model, to_model = normalize_code(from_model), normalize_code(to_model)
+            src[i] = node_ids.setdefault(from_model, len(node_ids))
+            dst[i] = node_ids.setdefault(to_model, len(node_ids))
+            strength[i] = rel['strength']
+            rel_types[i] = type_ids.setdefault(rel['type'], len(type_ids))
+            directions[i] = direction_ids.setdefault(rel['direction'], len(direction_ids))
+
+        return cls(list(node_ids), src, dst, strength, rel_types, directions,
+                   type_names=list(type_ids), direction_names=list(direction_ids),
+                   relationships=relationships, expand_bidirectional=expand_bidirectional,
+                   normalized=normalize)
+
+    @classmethod
+    def from_json(cls, json_path: str, **kwargs) -> 'RelationshipGraph':
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return cls.from_relationships(json.load(f), **kwargs)
+
+    @cached_property
+    def node_ids(self) -> Dict[str, int]:
+        """code -> node ID"""
+        return {code: node for node, code in enumerate(self.nodes)}
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def num_arcs(self) -> int:
+        return len(self.forward.neighbors)
+
+    @property
+    def num_relationships(self) -> int:
+        return len(self.rel_strength)
+
+    def node_id(self, code: str) -> Optional[int]:
+        """Node ID for a code (normalized first if the graph was built normalized)"""
+        node = self.node_ids.get(code)
+        if node is None and self.normalized:
+            node = self.node_ids.get(normalize_code(code))
+        return node
+
+    def degree(self) -> np.ndarray:
+        """Total (out + in) arc degree per node"""
+        return self.forward.degree() + self.reverse.degree()
+
+    def patch_relationship(self, index: int, strength: Optional[float] = None,
+                           type_id: Optional[int] = None):
+        """
+        Change one relationship's strength and/or type in place, arcs included.
+
+        Only the arc spans of its endpoints are searched (O(degree)). Changes
+        that add or remove arcs (direction, new or removed relationships) need
+        a rebuild; see RelationshipEditor.
+        """
+        for name in ('rel_strength', 'rel_type'):
+            column = getattr(self, name)
+            if not column.flags.writeable:
+                # Columns memory-mapped from a .hrel file are read-only
+                setattr(self, name, column.copy())
+        if strength is not None:
+            self.rel_strength[index] = strength
+        if type_id is not None:
+            self.rel_type[index] = type_id
+        endpoints = {int(self.rel_src[index]), int(self.rel_dst[index])}
+        for view in (self.forward, self.reverse):
+            for node in endpoints:
+                span = view.span(node)
+                arcs = np.flatnonzero(view.rel_index[span] == index) + span.start
+                if strength is not None:
+                    view.strength[arcs] = strength
+                if type_id is not None:
+                    view.type[arcs] = type_id
+
+    def arc_order(self) -> np.ndarray:
+        """Permutation of forward arcs back into expansion (relationship) order"""
+        return np.lexsort((self.forward.is_reverse, self.forward.rel_index))
+
+    def to_networkx(self, attributes: bool = True):
+        """
+        Equivalent networkx DiGraph (nodes and edges inserted in source order).
+
+        Parallel arcs collapse as in DiGraph.add_edge: the last one's attributes win.
+        """
+        import networkx as nx
+
+        G = nx.DiGraph()
+        G.add_nodes_from(self.nodes)
+        order = self.arc_order()
+        sources = self.forward.sources()[order]
+        targets = self.forward.neighbors[order]
+        rel_index = self.forward.rel_index[order]
+        nodes = self.nodes
+        if not attributes:
+            G.add_edges_from((nodes[s], nodes[t]) for s, t in zip(sources.tolist(), targets.tolist()))
+            return G
+
+        edge_data = [self.relationship_attributes(i) for i in range(self.num_relationships)]
+        G.add_edges_from(
+            (nodes[s], nodes[t], edge_data[r])
+            for s, t, r in zip(sources.tolist(), targets.tolist(), rel_index.tolist())
+        )
+        return G
+
+    def relationship_attributes(self, index: int) -> Dict:
+        """type/strength/direction/description of one relationship"""
+        if self.relationships is not None:
+            rel = self.relationships[index]
+            return {
+                'type': rel['type'],
+                'strength': rel['strength'],
+                'direction': rel['direction'],
+                'description': rel.get('description', ''),
+            }
+        return {
+            'type': self.type_names[self.rel_type[index]],
+            'strength': float(self.rel_strength[index]),
+            'direction': self.direction_names[self.rel_direction[index]],
+            'description': '',
+        }
+
+    def __repr__(self) -> str:
+        return (f"RelationshipGraph({self.num_nodes} nodes, {self.num_relationships} relationships, "
+                f"{self.num_arcs} arcs)")
+
+
+class RelationshipEditor:
+    """
+    Relationship edits for a live RelationshipGraph, without re-reading the source.
+
+    Keeps growable copies of the graph's per-relationship columns (amortized
+    O(1) appends) plus an ID index. Strength/type changes can be patched into
+    the current graph directly (RelationshipGraph.patch_relationship);
+    additions, removals and direction changes take effect in the graph
+    returned by build(), one vectorized CSR rebuild for any number of edits.
+    Removed relationships keep their row (inactive) so relationship indexes
+    stay stable. The editor doubles as the graph's relationship sequence for
+    attribute lookups.
+    """
+
+    def __init__(self, graph: RelationshipGraph):
+        self.nodes = list(graph.nodes)
+        self.node_ids = dict(graph.node_ids)
+        self.type_names = list(graph.type_names)
+        self.direction_names = list(graph.direction_names)
+        self.normalized = graph.normalized
+        self.expand_bidirectional = graph.expand_bidirectional
+        self.size = graph.num_relationships
+        capacity = max(16, self.size * 2)
+        self._columns = {}
+        for name, dtype, values in (('src', np.int32, graph.rel_src), ('dst', np.int32, graph.rel_dst),
+                                    ('strength', np.float64, graph.rel_strength),
+                                    ('type', np.uint8, graph.rel_type),
+                                    ('direction', np.uint8, graph.rel_direction)):
+            column = np.zeros(capacity, dtype=dtype)
+            column[:self.size] = values
+            self._columns[name] = column
+        active = np.zeros(capacity, dtype=bool)
+        active[:self.size] = True if graph.rel_active is None else graph.rel_active
+        self._columns['active'] = active
+
+        self._base = graph.relationships
+        if self._base is None:
+            ids = [f"REL-{index + 1:03d}" for index in range(self.size)]
+        elif hasattr(self._base, 'ids'):
+            ids = self._base.ids()
+        else:
+            ids = [rel['id'] for rel in self._base]
+        self._index = {rel_id: index for index, rel_id in enumerate(ids) if active[index]}
+        # Per-row id/description for added rows and description edits
+        self._overrides: Dict[int, Dict] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> Dict:
+        """Current relationship dict for a row (same shape as the JSON)"""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        columns = self._columns
+        rel = {}
+        if self._base is not None and index < len(self._base):
+            rel.update(self._base[index])
+        rel.update({
+            'from': self.nodes[columns['src'][index]],
+            'to': self.nodes[columns['dst'][index]],
+            'type': self.type_names[columns['type'][index]],
+            'strength': float(columns['strength'][index]),
+            'direction': self.direction_names[columns['direction'][index]],
+        })
+        rel.update(self._overrides.get(index, {}))
+        return rel
+
+    def index_of(self, rel_id: str) -> int:
+        """Row of an active relationship; KeyError if unknown or removed"""
+        try:
+            return self._index[rel_id]
+        except KeyError:
+            raise KeyError(f"Unknown relationship {rel_id}") from None
+
+    def _node(self, code: str) -> int:
+        if self.normalized:
+            code = normalize_code(code)
+        node = self.node_ids.get(code)
+        if node is None:
+            node = self.node_ids[code] = len(self.nodes)
+            self.nodes.append(code)
+        return node
+
+    def type_id(self, name: str) -> int:
+        if name not in self.type_names:
+            if name not in RELATIONSHIP_TYPE_NAMES:
+                raise ValueError(f"Unknown relationship type '{name}'")
+            self.type_names.append(name)
+        return self.type_names.index(name)
+
+    def direction_id(self, name: str) -> int:
+        if name not in self.direction_names:
+            raise ValueError(f"Unknown direction '{name}' (expected one of {', '.join(self.direction_names)})")
+        return self.direction_names.index(name)
+
+    def validate(self, from_model: Optional[str] = None, to_model: Optional[str] = None,
+                 rel_type: Optional[str] = None, strength: Optional[float] = None,
+                 direction: Optional[str] = None, description: Optional[str] = None,
+                 rel_id: Optional[str] = None):
+        """
+        Check edit fields without changing anything (None skips a field).
+
+        Raises TypeError for non-string codes, names, IDs or descriptions and
+        ValueError for unknown types/directions, an ID that already exists or
+        a strength that is not a finite number in [0.0, 1.0].
+        """
+        if rel_id is not None:
+            if not isinstance(rel_id, str):
+                raise TypeError(f"'id' must be a string, got {rel_id!r}")
+            if rel_id in self._index:
+                raise ValueError(f"Relationship {rel_id} already exists")
+        for field, value in (('from', from_model), ('to', to_model)):
+            if value is not None and (not isinstance(value, str) or not value):
+                raise TypeError(f"'{field}' must be a non-empty model code string, got {value!r}")
+        for field, value in (('type', rel_type), ('direction', direction), ('description', description)):
+            if value is not None and not isinstance(value, str):
+                raise TypeError(f"'{field}' must be a string, got {value!r}")
+        if rel_type is not None and rel_type not in self.type_names and rel_type not in RELATIONSHIP_TYPE_NAMES:
+            raise ValueError(f"Unknown relationship type '{rel_type}'")
+        if direction is not None:
+            self.direction_id(direction)
+        if strength is not None:
+            if isinstance(strength, bool) or not isinstance(strength, (int, float, np.floating, np.integer)):
+                raise TypeError(f"'strength' must be a number, got {strength!r}")
+            if not (math.isfinite(strength) and 0.0 <= strength <= 1.0):
+                raise ValueError(f"'strength' must be a finite number in [0.0, 1.0], got {strength!r}")
+
+    def validate_add(self, from_model: str, to_model: str, rel_type: str, strength: float,
+                     direction: str = 'unidirectional', rel_id: Optional[str] = None, description: str = ''):
+        """validate() for a new relationship, whose fields (except id) are all required"""
+        for field, value in (('from', from_model), ('to', to_model), ('type', rel_type),
+                             ('strength', strength), ('direction', direction), ('description', description)):
+            if value is None:
+                raise TypeError(f"'{field}' is required")
+        self.validate(from_model, to_model, rel_type, strength, direction, description, rel_id)
+
+    def add(self, from_model: str, to_model: str, rel_type: str, strength: float,
+            direction: str = 'unidirectional', rel_id: Optional[str] = None, description: str = '') -> int:
+        """Append a relationship; returns its row"""
+        self.validate_add(from_model, to_model, rel_type, strength, direction, rel_id, description)
+        if rel_id is None:
+            number = len(self._index) + 1
+            while f"REL-{number:03d}" in self._index:
+                number += 1
+            rel_id = f"REL-{number:03d}"
+        type_id, direction_id = self.type_id(rel_type), self.direction_id(direction)
+        if self.size == len(self._columns['src']):
+            for name, column in self._columns.items():
+                grown = np.zeros(len(column) * 2, dtype=column.dtype)
+                grown[:self.size] = column
+                self._columns[name] = grown
+        index = self.size
+        values = {'src': self._node(from_model), 'dst': self._node(to_model), 'strength': strength,
+                  'type': type_id, 'direction': direction_id, 'active': True}
+        for name, value in values.items():
+            self._columns[name][index] = value
+        self.size += 1
+        self._index[rel_id] = index
+        self._overrides[index] = {'id': rel_id, 'description': description}
+        return index
+
+    def remove(self, rel_id: str) -> int:
+        """Deactivate a relationship; returns its row"""
+        index = self.index_of(rel_id)
+        self._columns['active'][index] = False
+        del self._index[rel_id]
+        return index
+
+    def update(self, rel_id: str, strength: Optional[float] = None, rel_type: Optional[str] = None,
+               direction: Optional[str] = None, description: Optional[str] = None) -> int:
+        """Change fields of a relationship; returns its row"""
+        index = self.index_of(rel_id)
+        self.validate(rel_type=rel_type, strength=strength, direction=direction, description=description)
+        type_id = None if rel_type is None else self.type_id(rel_type)
+        direction_id = None if direction is None else self.direction_id(direction)
+        if strength is not None:
+            self._columns['strength'][index] = strength
+        if type_id is not None:
+            self._columns['type'][index] = type_id
+        if direction_id is not None:
+            self._columns['direction'][index] = direction_id
+        if description is not None:
+            self._overrides.setdefault(index, {})['description'] = description
+        return index
+
+    def column(self, name: str) -> np.ndarray:
+        """Live view of a column (src, dst, strength, type, direction, active)"""
+        return self._columns[name][:self.size]
+
+    def build(self) -> RelationshipGraph:
+        """CSR graph of the current relationships (rows keep their indexes)"""
+        active = self.column('active').copy()
+        return RelationshipGraph(
+            self.nodes, self.column('src').copy(), self.column('dst').copy(),
+            self.column('strength').copy(), self.column('type').copy(), self.column('direction').copy(),
+            type_names=self.type_names, direction_names=self.direction_names, relationships=self,
+            expand_bidirectional=self.expand_bidirectional, normalized=self.normalized,
+            active=None if active.all() else active,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the CSR relationship graph and print a summary')
+    parser.add_argument('input', nargs='?', default='data/relationships.json', help='Relationships JSON')
+    parser.add_argument('--normalize', action='store_true', help='Normalize model codes (IN8 -> IN08)')
+    parser.add_argument('--no-expand', action='store_true', help='Do not expand bidirectional relationships')
+    args = parser.parse_args()
+
+    with open(args.input, 'r', encoding='utf-8') as f:
+        relationships = json.load(f)
+    start = time.perf_counter()
+    graph = RelationshipGraph.from_relationships(relationships, normalize=args.normalize,
+                                                 expand_bidirectional=not args.no_expand)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(graph)
+    print(f"Built in {elapsed_ms:.2f} ms")
+    degree = graph.degree()
+    top = np.argsort(-degree, kind='stable')[:10]
+    print("Top nodes by degree: " + ', '.join(f"{graph.nodes[i]}({degree[i]})" for i in top))
+
+
+if __name__ == '__main__':
+    main()
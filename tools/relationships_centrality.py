@@ -1,15 +1,252 @@
+#!/usr/bin/env python3
+"""
+Centrality measures for the relationship graph, with a persisted artifact.
+
+Degree, PageRank, betweenness and eigenvector centrality are computed once
+per graph and stored as one .npz file per graph under .cache/centrality/,
+keyed by a hash of the node list and arcs; any change to relationships.json
+or its edit log selects a new file. SY19Recommender(centrality_measure=...)
+loads the chosen measure from it instead of recomputing.
+
+Measures (on the graph the recommender traverses: bidirectional relationships
+expanded into two arcs):
+    degree       in + out arcs (the recommender's built-in measure)
+    pagerank     PageRank on the simple directed graph (damping 0.85)
+    betweenness  normalized directed betweenness (Brandes); sampled from
+                 BETWEENNESS_SAMPLES sources on larger graphs
+    eigenvector  leading eigenvector of the undirected simple graph (unit L2 norm)
+
+Usage:
+    python tools/relationships_centrality.py data/relationships.json              # print measures
+    python tools/relationships_centrality.py data/relationships.json --precompute # write the artifact
+"""
+
+import argparse
+import hashlib
 import json
 import sys
-import networkx as nx
+import time
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from relationship_graph import RelationshipGraph
+from relationships_columnar import load_relationship_table
+
+FORMAT_VERSION = 1
+
+MEASURES = ('degree', 'pagerank', 'betweenness', 'eigenvector')
+
+DEFAULT_CENTRALITY_DIR = Path(__file__).parent.parent / '.cache' / 'centrality'
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-10
+PAGERANK_MAX_ITERATIONS = 1000
+
+# Exact betweenness needs one BFS per node; above this many nodes, sample this many sources
+BETWEENNESS_SAMPLES = 256
+
+
+def centrality_key(graph: RelationshipGraph, betweenness_samples: int = BETWEENNESS_SAMPLES) -> str:
+    """Hash of everything the measures depend on"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        'version': FORMAT_VERSION,
+        'nodes': graph.nodes,
+        'pagerank_damping': PAGERANK_DAMPING,
+        'betweenness_samples': min(betweenness_samples, graph.num_nodes),
+    }).encode('utf-8'))
+    for array in (graph.forward.offsets, graph.forward.neighbors):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def _simple_adjacency(graph: RelationshipGraph):
+    """scipy CSR matrix with a 1 per distinct (source, target) arc, self-loops dropped"""
+    from scipy import sparse
+    num_nodes = graph.num_nodes
+    sources, targets = graph.forward.sources(), graph.forward.neighbors
+    keep = sources != targets
+    adjacency = sparse.csr_matrix((np.ones(int(keep.sum())), (sources[keep], targets[keep])),
+                                  shape=(num_nodes, num_nodes))
+    adjacency.sum_duplicates()
+    adjacency.data[:] = 1.0
+    return adjacency
+
+
+def pagerank(adjacency) -> np.ndarray:
+    """PageRank by power iteration; dangling nodes jump uniformly (as networkx.pagerank)"""
+    num_nodes = adjacency.shape[0]
+    if num_nodes == 0:
+        return np.zeros(0)
+    out_degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_degree == 0
+    # transition[target, source] = 1 / out_degree[source]
+    transition = (adjacency.multiply(1.0 / np.where(dangling, 1.0, out_degree)[:, None])).T.tocsr()
+    rank = np.full(num_nodes, 1.0 / num_nodes)
+    for _ in range(PAGERANK_MAX_ITERATIONS):
+        previous = rank
+        rank = PAGERANK_DAMPING * (transition @ rank + previous[dangling].sum() / num_nodes)
+        rank += (1.0 - PAGERANK_DAMPING) / num_nodes
+        if np.abs(rank - previous).sum() < PAGERANK_TOLERANCE:
+            break
+    return rank / rank.sum()
+
+
+def eigenvector_centrality(adjacency) -> np.ndarray:
+    """Leading eigenvector of the symmetrized adjacency, non-negative with unit L2 norm"""
+    num_nodes = adjacency.shape[0]
+    symmetric = ((adjacency + adjacency.T) > 0).astype(np.float64)
+    if symmetric.nnz == 0:
+        return np.zeros(num_nodes)
+    if num_nodes < 3:
+        _, vectors = np.linalg.eigh(symmetric.toarray())
+        vector = vectors[:, -1]
+    else:
+        from scipy.sparse.linalg import eigsh
+        _, vectors = eigsh(symmetric, k=1, which='LA', v0=np.ones(num_nodes))
+        vector = vectors[:, 0]
+    vector = np.abs(vector)
+    return vector / np.linalg.norm(vector)
+
+
+def betweenness_centrality(adjacency, samples: int = BETWEENNESS_SAMPLES, seed: int = 0) -> np.ndarray:
+    """
+    Normalized directed betweenness (Brandes), exact up to `samples` nodes.
+
+    Each source's BFS and dependency accumulation run level by level on the
+    CSR arrays (one bincount per level). Larger graphs use `samples` random
+    sources and scale by n / samples, like networkx's k parameter.
+    """
+    num_nodes = adjacency.shape[0]
+    betweenness = np.zeros(num_nodes)
+    if num_nodes < 3:
+        return betweenness
+    offsets, neighbors = adjacency.indptr, adjacency.indices.astype(np.int64)
+    arc_source = np.repeat(np.arange(num_nodes), np.diff(offsets))
+    if samples < num_nodes:
+        sources = np.sort(np.random.default_rng(seed).choice(num_nodes, samples, replace=False))
+    else:
+        sources = np.arange(num_nodes)
 
-# Usage: python relationships_centrality.py data/relationships.json
+    distance = np.empty(num_nodes, dtype=np.int64)
+    for source in sources.tolist():
+        distance.fill(-1)
+        distance[source] = 0
+        paths = np.zeros(num_nodes)
+        paths[source] = 1.0
+        frontier = np.array([source])
+        levels = []
+        level = 0
+        while len(frontier):
+            starts = offsets[frontier]
+            counts = offsets[frontier + 1] - starts
+            arcs = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(int(counts.sum()))
+            targets = neighbors[arcs]
+            unseen = targets[distance[targets] < 0]
+            distance[unseen] = level + 1
+            # Shortest-path DAG arcs into the next level
+            on_path = distance[targets] == level + 1
+            tails, heads = arc_source[arcs[on_path]], targets[on_path]
+            paths += np.bincount(heads, weights=paths[tails], minlength=num_nodes)
+            levels.append((tails, heads))
+            frontier = np.flatnonzero(np.bincount(unseen, minlength=num_nodes))
+            level += 1
 
-def main(input_json):
-    with open(input_json, 'r', encoding='utf-8') as f:
-        relationships = json.load(f)
-    G = nx.DiGraph()
-    for rel in relationships:
-        G.add_edge(rel['from'], rel['to'], type=rel['type'], strength=rel['strength'], direction=rel['direction'], description=rel['description'])
+        dependency = np.zeros(num_nodes)
+        for tails, heads in reversed(levels):
+            dependency += np.bincount(tails, weights=paths[tails] / paths[heads] * (1.0 + dependency[heads]),
+                                      minlength=num_nodes)
+        dependency[source] = 0.0
+        betweenness += dependency
+
+    scale = 1.0 / ((num_nodes - 1) * (num_nodes - 2))
+    if len(sources) < num_nodes:
+        scale *= num_nodes / len(sources)
+    return betweenness * scale
+
+
+class CentralityTable:
+    """All centrality measures of one graph, aligned with graph.nodes"""
+
+    def __init__(self, nodes: List[str], values: Dict[str, np.ndarray], key: str):
+        self.nodes = nodes
+        self.values = values
+        self.key = key
+
+    @classmethod
+    def build(cls, graph: RelationshipGraph, betweenness_samples: int = BETWEENNESS_SAMPLES,
+              progress: bool = False) -> 'CentralityTable':
+        adjacency = _simple_adjacency(graph)
+        values = {'degree': graph.degree().astype(np.float64)}
+        for measure, compute in (('pagerank', lambda: pagerank(adjacency)),
+                                 ('eigenvector', lambda: eigenvector_centrality(adjacency)),
+                                 ('betweenness', lambda: betweenness_centrality(adjacency, betweenness_samples))):
+            start = time.perf_counter()
+            values[measure] = compute()
+            if progress:
+                print(f"   {measure}: {time.perf_counter() - start:.2f}s", file=sys.stderr)
+        return cls(list(graph.nodes), values, centrality_key(graph, betweenness_samples))
+
+    def measure(self, name: str) -> Dict[str, float]:
+        """model -> value for one measure (degree values are arc counts, as ints)"""
+        if name not in MEASURES:
+            raise ValueError(f"Unknown centrality measure '{name}' (expected one of {', '.join(MEASURES)})")
+        values = self.values[name]
+        if name == 'degree':
+            values = values.astype(np.int64)
+        return dict(zip(self.nodes, values.tolist()))
+
+    def top(self, name: str, count: int = 10) -> List[tuple]:
+        values = self.values[name]
+        order = np.argsort(-values, kind='stable')[:count]
+        return [(self.nodes[node], float(values[node])) for node in order.tolist()]
+
+    def save(self, path: Union[str, Path]):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp.npz')
+        np.savez(tmp_path, nodes=np.array(self.nodes), key=np.array(self.key), **self.values)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'CentralityTable':
+        with np.load(path) as data:
+            return cls(data['nodes'].tolist(), {measure: data[measure] for measure in MEASURES},
+                       str(data['key']))
+
+
+def centrality_path(key: str, directory: Union[str, Path, None] = None) -> Path:
+    return Path(directory or DEFAULT_CENTRALITY_DIR) / f"{key[:20]}.npz"
+
+
+def load_or_build_centrality(graph: RelationshipGraph, directory: Union[str, Path, None] = None,
+                             betweenness_samples: int = BETWEENNESS_SAMPLES,
+                             progress: bool = False) -> CentralityTable:
+    """Persisted centrality table for this graph, computed and saved if missing"""
+    key = centrality_key(graph, betweenness_samples)
+    path = centrality_path(key, directory)
+    if path.exists():
+        try:
+            table = CentralityTable.load(path)
+            if table.key == key:
+                return table
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️  Recomputing unreadable centrality table {path}: {e}", file=sys.stderr)
+    table = CentralityTable.build(graph, betweenness_samples, progress=progress)
+    try:
+        table.save(path)
+    except OSError as e:
+        print(f"⚠️  Could not write centrality table {path}: {e}", file=sys.stderr)
+    return table
+
+
+def print_measures(input_json):
+    import networkx as nx
+    relationships = load_relationship_table(input_json)
+    G = RelationshipGraph.from_relationships(relationships, expand_bidirectional=False).to_networkx()
     print("Node centrality:")
     print(nx.degree_centrality(G))
     print("Betweenness centrality:")
@@ -24,8 +261,30 @@ def main(input_json):
     except ImportError:
         print("Community detection requires networkx >=2.2")
 
+
+def main():
+    parser = argparse.ArgumentParser(description='Relationship graph centrality')
+    parser.add_argument('input', help='Relationships JSON')
+    parser.add_argument('--precompute', action='store_true',
+                        help='Compute all measures and write the centrality artifact')
+    parser.add_argument('--dir', help=f'Artifact directory (default: {DEFAULT_CENTRALITY_DIR})')
+    parser.add_argument('--betweenness-samples', type=int, default=BETWEENNESS_SAMPLES,
+                        help=f'Betweenness source samples on larger graphs (default: {BETWEENNESS_SAMPLES})')
+    args = parser.parse_args()
+
+    if not args.precompute:
+        print_measures(args.input)
+        return
+
+    start = time.perf_counter()
+    graph = RelationshipGraph.from_relationships(load_relationship_table(args.input))
+    table = load_or_build_centrality(graph, args.dir, args.betweenness_samples, progress=True)
+    print(f"✅ {len(table.nodes)} models ({time.perf_counter() - start:.1f}s) -> "
+          f"{centrality_path(table.key, args.dir)}")
+    for measure in MEASURES:
+        top = ', '.join(f"{code} {value:.4g}" for code, value in table.top(measure, 5))
+        print(f"   {measure:12s} {top}")
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python relationships_centrality.py <input_json>")
-        sys.exit(1)
-    main(sys.argv[1])
+    main()
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Binary columnar companion format for relationships (`.hrel`).
+
+`data/relationships.json` is pretty-printed and every tool json.load()s it
+into a list of dicts. The `.hrel` file stores the same data as fixed-width
+columns that can be memory-mapped, so opening it costs a header parse and an
+mmap regardless of size, and graph construction never touches Python objects
+per relationship.
+
+File layout (little-endian):
+
+    b'HREL'  uint32 version  uint32 header_length  header (UTF-8 JSON)
+    columns, each 64-byte aligned:
+        id           uint32   string index
+        src, dst     int32    node index (nodes column)
+        type         uint8    index into header 'types'
+        direction    uint8    index into header 'directions'
+        strength     float64  (exact JSON value)
+        description  uint32   string index
+        node_names   bytes    newline-separated node codes, first-appearance order
+        string_offsets uint64, string_data bytes   interned UTF-8 string table
+
+The header records the source file's size and mtime (and those of its
+pending edit log, see relationships_editlog.py). Tools call
+load_relationships() / load_relationship_table() with the JSON path; a
+sibling `<name>.hrel` is used when its recorded source stamp matches the
+JSON and regenerated (best effort) otherwise.
+
+Usage:
+    python tools/relationships_columnar.py data/relationships.json      # writes data/relationships.hrel
+    python tools/relationships_columnar.py data/relationships.csv -o out.hrel
+    python tools/relationships_columnar.py data/relationships.hrel --info
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from model_codes import normalize_code
+from relationship_graph import DIRECTION_NAMES, RELATIONSHIP_TYPE_NAMES
+from relationships_editlog import iter_current_relationships, log_path_for
+
+MAGIC = b'HREL'
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct('<4sII')
+ALIGNMENT = 64
+BINARY_SUFFIX = '.hrel'
+
+
+# On-disk dtype of each fixed-width column
+COLUMN_DTYPES = {
+    'id': '<u4',
+    'src': '<i4',
+    'dst': '<i4',
+    'type': 'u1',
+    'direction': 'u1',
+    'strength': '<f8',
+    'description': '<u4',
+}
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class RelationshipTable:
+    """
+    Columnar relationships, usable as a read-only sequence of relationship dicts.
+
+    Rows are built on access; column arrays (src, dst, type, direction,
+    strength) and the node list are available directly for vectorized code.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray], strings, nodes: List[str],
+                 types: Sequence[str], directions: Sequence[str], path: Optional[Path] = None,
+                 buffer=None):
+        self.id = columns['id']
+        self.src = columns['src']
+        self.dst = columns['dst']
+        self.type = columns['type']
+        self.direction = columns['direction']
+        self.strength = columns['strength']
+        self.description = columns['description']
+        self.nodes = nodes
+        self.type_names = list(types)
+        self.direction_names = list(directions)
+        self.path = path
+        self._strings = strings
+        self._buffer = buffer  # keeps the mmap alive
+
+    @classmethod
+    def from_relationships(cls, relationships: Iterable[Dict]) -> 'RelationshipTable':
+        """Encode relationship dicts (any iterable, consumed once) into an in-memory table"""
+        strings: Dict[str, int] = {}
+        node_ids: Dict[str, int] = {}
+        type_ids = {name: i for i, name in enumerate(RELATIONSHIP_TYPE_NAMES)}
+        direction_ids = {name: i for i, name in enumerate(DIRECTION_NAMES)}
+        # Growable typed buffers so streamed input never materializes as a list of dicts
+        buffers = {
+            'id': array('I'),
+            'src': array('i'),
+            'dst': array('i'),
+            'type': array('B'),
+            'direction': array('B'),
+            'strength': array('d'),
+            'description': array('I'),
+        }
+        for rel in relationships:
+            buffers['id'].append(strings.setdefault(rel['id'], len(strings)))
+            buffers['src'].append(node_ids.setdefault(rel['from'], len(node_ids)))
+            buffers['dst'].append(node_ids.setdefault(rel['to'], len(node_ids)))
+            buffers['type'].append(type_ids.setdefault(rel['type'], len(type_ids)))
+            buffers['direction'].append(direction_ids.setdefault(rel['direction'], len(direction_ids)))
+            buffers['strength'].append(rel['strength'])
+            buffers['description'].append(strings.setdefault(rel.get('description', ''), len(strings)))
+        columns = {name: np.asarray(buffer, dtype=COLUMN_DTYPES[name]) for name, buffer in buffers.items()}
+        return cls(columns, list(strings), list(node_ids), list(type_ids), list(direction_ids))
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'RelationshipTable':
+        """Memory-map a .hrel file"""
+        path = Path(path)
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = read_header(buffer)
+
+        def column(name):
+            spec = header['columns'][name]
+            return np.frombuffer(buffer, dtype=spec['dtype'], count=spec['count'], offset=spec['offset'])
+
+        columns = {name: column(name) for name in COLUMN_DTYPES}
+        strings = _StringTable(column('string_offsets'), column('string_data'))
+        node_names = column('node_names').tobytes().decode('utf-8')
+        nodes = node_names.split('\n') if node_names else []
+        return cls(columns, strings, nodes, header['types'], header['directions'], path=path, buffer=buffer)
+
+    def __len__(self) -> int:
+        return len(self.src)
+
+    def __getitem__(self, index: int) -> Dict:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return {
+            'id': self._strings[int(self.id[index])],
+            'from': self.nodes[self.src[index]],
+            'to': self.nodes[self.dst[index]],
+            'type': self.type_names[self.type[index]],
+            'strength': float(self.strength[index]),
+            'direction': self.direction_names[self.direction[index]],
+            'description': self._strings[int(self.description[index])],
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.to_list())
+
+    def to_list(self) -> List[Dict]:
+        """Materialize all rows as relationship dicts (same shape as the JSON)"""
+        strings = self._strings
+        nodes = self.nodes
+        types = self.type_names
+        directions = self.direction_names
+        if isinstance(strings, _StringTable):
+            strings = strings.decode_all()
+        return [
+            {
+                'id': strings[rel_id],
+                'from': nodes[src],
+                'to': nodes[dst],
+                'type': types[rel_type],
+                'strength': strength,
+                'direction': directions[direction],
+                'description': strings[description],
+            }
+            for rel_id, src, dst, rel_type, strength, direction, description in zip(
+                self.id.tolist(), self.src.tolist(), self.dst.tolist(), self.type.tolist(),
+                self.strength.tolist(), self.direction.tolist(), self.description.tolist())
+        ]
+
+    def ids(self) -> List[str]:
+        """Relationship IDs in row order"""
+        strings = self._strings
+        if isinstance(strings, _StringTable):
+            strings = strings.decode_all()
+        return [strings[rel_id] for rel_id in self.id.tolist()]
+
+    def graph_columns(self, normalize: bool = False) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """(nodes, src, dst) for RelationshipGraph; normalize merges IN8/IN08 nodes"""
+        if not normalize:
+            return self.nodes, self.src, self.dst
+        canonical_ids: Dict[str, int] = {}
+        remap = np.array([
+            canonical_ids.setdefault(normalize_code(code), len(canonical_ids)) for code in self.nodes
+        ], dtype=np.int32)
+        return list(canonical_ids), remap[self.src], remap[self.dst]
+
+    def write(self, path: Union[str, Path], source: Optional[Dict] = None):
+        """Write the table as a .hrel file (atomic replace)"""
+        strings = self._strings
+        if isinstance(strings, _StringTable):
+            strings = strings.decode_all()
+        # Node codes are stored as one block so opening decodes them in a single split
+        if any('\n' in code for code in self.nodes):
+            raise ValueError('model codes must not contain newlines')
+        node_names = np.frombuffer('\n'.join(self.nodes).encode('utf-8'), dtype='u1')
+        encoded = [string.encode('utf-8') for string in strings]
+        string_offsets = np.zeros(len(encoded) + 1, dtype='<u8')
+        np.cumsum([len(s) for s in encoded], out=string_offsets[1:])
+        string_data = np.frombuffer(b''.join(encoded), dtype='u1')
+
+        arrays = {name: getattr(self, name).astype(dtype, copy=False) for name, dtype in COLUMN_DTYPES.items()}
+        arrays.update({
+            'node_names': node_names,
+            'string_offsets': string_offsets,
+            'string_data': string_data,
+        })
+        header = {
+            'version': FORMAT_VERSION,
+            'count': len(self),
+            'types': self.type_names,
+            'directions': self.direction_names,
+            'source': source or {},
+            'columns': {},
+        }
+        # Column offsets depend on the header length; iterate until it is stable
+        header_bytes = b''
+        while True:
+            offset = _align(PREAMBLE.size + len(header_bytes))
+            for name, column in arrays.items():
+                header['columns'][name] = {'dtype': column.dtype.str, 'count': len(column), 'offset': offset}
+                offset = _align(offset + column.nbytes)
+            encoded_header = json.dumps(header, separators=(',', ':')).encode('utf-8')
+            stable = len(encoded_header) == len(header_bytes)
+            header_bytes = encoded_header
+            if stable:
+                break
+
+        path = Path(path)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+            f.write(header_bytes)
+            for name, column in arrays.items():
+                f.write(b'\0' * (header['columns'][name]['offset'] - f.tell()))
+                f.write(column.tobytes())
+        os.replace(tmp_path, path)
+
+    def close(self):
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+
+class _StringTable:
+    """Lazily decoded view of the interned UTF-8 string table"""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.data[self.offsets[index]:self.offsets[index + 1]].tobytes().decode('utf-8')
+
+    def decode_all(self) -> List[str]:
+        blob = self.data.tobytes()
+        offsets = self.offsets.tolist()
+        return [blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+
+def read_header(buffer) -> Dict:
+    """Parse and validate the .hrel preamble + JSON header"""
+    magic, version, header_length = PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError('not a .hrel relationships file')
+    if version != FORMAT_VERSION:
+        raise ValueError(f'unsupported .hrel version {version}')
+    return json.loads(bytes(buffer[PREAMBLE.size:PREAMBLE.size + header_length]))
+
+
+def read_header_file(path: Union[str, Path]) -> Dict:
+    """Read only the header of a .hrel file"""
+    with open(path, 'rb') as f:
+        preamble = f.read(PREAMBLE.size)
+        if len(preamble) < PREAMBLE.size:
+            raise ValueError('not a .hrel relationships file')
+        _, _, header_length = PREAMBLE.unpack(preamble)
+        return read_header(preamble + f.read(header_length))
+
+
+def binary_path_for(json_path: Union[str, Path]) -> Path:
+    """Companion .hrel path for a relationships JSON/CSV file"""
+    return Path(json_path).with_suffix(BINARY_SUFFIX)
+
+
+def source_stamp(path: Path) -> Dict:
+    """Size/mtime stamp of a relationships source file and its pending edit log"""
+    stat = path.stat()
+    stamp = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    # Pending edit-log entries are part of the current data
+    log_path = log_path_for(path)
+    if log_path.exists():
+        log_stat = log_path.stat()
+        stamp['editlog'] = {'size': log_stat.st_size, 'mtime_ns': log_stat.st_mtime_ns}
+    return stamp
+
+
+def _fresh_binary(source_path: Path, binary_path: Path) -> bool:
+    """True if binary_path was generated from the current contents of source_path"""
+    try:
+        return read_header_file(binary_path).get('source') == source_stamp(source_path)
+    except (OSError, ValueError):
+        return False
+
+
+def convert(source_path: Union[str, Path], binary_path: Union[str, Path, None] = None) -> RelationshipTable:
+    """Generate the .hrel companion for a JSON or CSV relationships file"""
+    source_path = Path(source_path)
+    binary_path = Path(binary_path) if binary_path else binary_path_for(source_path)
+    stamp = source_stamp(source_path)
+    table = RelationshipTable.from_relationships(iter_current_relationships(source_path))
+    table.write(binary_path, source=stamp)
+    return table
+
+
+def load_relationship_table(path: Union[str, Path], regenerate: bool = True) -> RelationshipTable:
+    """
+    Load relationships as a columnar table.
+
+    A .hrel path is memory-mapped directly. For a JSON/CSV path the sibling
+    .hrel is used when it is up to date; otherwise the source is parsed and,
+    if regenerate is set, the companion is rewritten for the next load.
+    """
+    path = Path(path)
+    if path.suffix == BINARY_SUFFIX:
+        return RelationshipTable.open(path)
+    binary_path = binary_path_for(path)
+    if _fresh_binary(path, binary_path):
+        try:
+            return RelationshipTable.open(binary_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable {binary_path}: {e}", file=sys.stderr)
+
+    stamp = source_stamp(path)
+    table = RelationshipTable.from_relationships(iter_current_relationships(path))
+    if regenerate:
+        try:
+            table.write(binary_path, source=stamp)
+        except OSError as e:
+            print(f"⚠️  Could not write {binary_path}: {e}", file=sys.stderr)
+    return table
+
+
+def load_relationships(path: Union[str, Path], regenerate: bool = True) -> List[Dict]:
+    """Load relationships as a list of dicts, via the .hrel companion when it is current"""
+    path = Path(path)
+    if path.suffix != BINARY_SUFFIX and not _fresh_binary(path, binary_path_for(path)):
+        relationships = list(iter_current_relationships(path))
+        if regenerate:
+            try:
+                RelationshipTable.from_relationships(relationships).write(
+                    binary_path_for(path), source=source_stamp(path))
+            except OSError as e:
+                print(f"⚠️  Could not write {binary_path_for(path)}: {e}", file=sys.stderr)
+        return relationships
+    return load_relationship_table(path, regenerate=regenerate).to_list()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert relationships JSON/CSV to the .hrel columnar format')
+    parser.add_argument('input', help='relationships .json, .csv or .hrel file')
+    parser.add_argument('--output', '-o', help='Output .hrel path (default: next to the input)')
+    parser.add_argument('--info', action='store_true', help='Print the header of a .hrel file')
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if args.info or input_path.suffix == BINARY_SUFFIX:
+        print(json.dumps(read_header_file(input_path), indent=2))
+        return
+
+    start = time.perf_counter()
+    table = convert(input_path, args.output)
+    elapsed = time.perf_counter() - start
+    output = Path(args.output) if args.output else binary_path_for(input_path)
+    print(f"✅ Wrote {len(table)} relationships ({len(table.nodes)} models) to {output} "
+          f"in {elapsed:.2f}s ({output.stat().st_size:,} bytes)")
+
+
+if __name__ == '__main__':
+    main()
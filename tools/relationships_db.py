@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed relationship store with indexed queries.
+
+Questions such as "all SCAFFOLDS into DE07" or "edges touching a hub with
+strength > 0.8" otherwise scan the whole relationships list. The store keeps a
+SQLite copy of data/relationships.json (plus any pending edit-log changes)
+with B-tree indexes on from, to, type and strength, so each query costs
+O(log E + matches).
+
+The database lives in .cache/ and is rebuilt automatically whenever the
+source stamp (JSON size/mtime and edit log) changes.
+
+Usage:
+    from relationships_db import RelationshipStore
+
+    with RelationshipStore('data/relationships.json') as store:
+        store.query(to_model='DE07', types='SCAFFOLDS')
+        store.query(touching='SY01', min_strength=0.8, normalized=True)
+
+    python tools/relationships_db.py --to DE07 --type SCAFFOLDS
+    python tools/relationships_db.py --touching SY01 --min-strength 0.8 --count
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+sys.path.insert(0, str(Path(__file__).parent))
+from model_codes import normalize_code
+from relationships_columnar import source_stamp
+from relationships_editlog import iter_current_relationships
+
+SCHEMA_VERSION = 1
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / '.cache' / 'relationships.sqlite3'
+
+# Relationship dict keys, in JSON order, and their columns
+FIELDS = (
+    ('id', 'id'),
+    ('from', 'from_model'),
+    ('to', 'to_model'),
+    ('type', 'type'),
+    ('strength', 'strength'),
+    ('direction', 'direction'),
+    ('description', 'description'),
+)
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE relationships (
+    pos INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    from_model TEXT NOT NULL,
+    to_model TEXT NOT NULL,
+    from_norm TEXT NOT NULL,
+    to_norm TEXT NOT NULL,
+    type TEXT NOT NULL,
+    strength REAL NOT NULL,
+    direction TEXT NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX idx_from ON relationships (from_model, type, strength);
+CREATE INDEX idx_to ON relationships (to_model, type, strength);
+CREATE INDEX idx_from_norm ON relationships (from_norm, type, strength);
+CREATE INDEX idx_to_norm ON relationships (to_norm, type, strength);
+CREATE INDEX idx_type ON relationships (type, strength);
+CREATE INDEX idx_strength ON relationships (strength);
+CREATE INDEX idx_id ON relationships (id);
+"""
+
+_SELECT_COLUMNS = ', '.join(column for _, column in FIELDS)
+
+
+class RelationshipStore:
+    """Indexed, query-only view of a relationships file, kept in sync with its source"""
+
+    def __init__(self, source: Union[str, Path] = 'data/relationships.json',
+                 db_path: Union[str, Path, None] = None):
+        self.source = Path(source)
+        self.db_path = Path(db_path) if db_path else self._default_db_path()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.sync()
+
+    def _default_db_path(self) -> Path:
+        repo_data = Path(__file__).parent.parent / 'data' / 'relationships.json'
+        if self.source.resolve() == repo_data.resolve():
+            return DEFAULT_DB_PATH
+        # Other sources get their own database next to the default one
+        digest = hashlib.sha1(str(self.source.resolve()).encode('utf-8')).hexdigest()[:12]
+        return DEFAULT_DB_PATH.with_name(f"relationships-{digest}.sqlite3")
+
+    def _stored_stamp(self) -> Optional[Dict]:
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+            version = self.conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        except sqlite3.DatabaseError:
+            return None
+        if row is None or version is None or int(version[0]) != SCHEMA_VERSION:
+            return None
+        return json.loads(row[0])
+
+    def sync(self) -> bool:
+        """Rebuild the database if the source changed; returns True if it was rebuilt"""
+        stamp = source_stamp(self.source)
+        if self._stored_stamp() == stamp:
+            return False
+        self.rebuild(iter_current_relationships(self.source), stamp)
+        return True
+
+    def rebuild(self, relationships: Iterable[Dict], stamp: Dict):
+        """Replace the database contents with relationships (streamed, one transaction)"""
+        tables = [row[0] for row in self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")]
+        # executescript() commits first, so the schema change runs in its own transaction
+        self.conn.executescript(''.join(f"DROP TABLE {table};\n" for table in tables) + _SCHEMA)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO relationships VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (pos, rel['id'], rel['from'], rel['to'], normalize_code(rel['from']),
+                     normalize_code(rel['to']), rel['type'], rel['strength'], rel['direction'],
+                     rel.get('description', ''))
+                    for pos, rel in enumerate(relationships)
+                ),
+            )
+            self.conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ('schema', str(SCHEMA_VERSION)),
+                ('source', json.dumps(stamp, sort_keys=True)),
+            ])
+        self.conn.execute('ANALYZE')
+
+    def _where(self, from_model: Optional[str], to_model: Optional[str], touching: Optional[str],
+               types: Union[str, Sequence[str], None], min_strength: Optional[float],
+               max_strength: Optional[float], direction: Optional[str], normalized: bool):
+        from_column, to_column = ('from_norm', 'to_norm') if normalized else ('from_model', 'to_model')
+        prepare = normalize_code if normalized else (lambda code: code)
+        clauses, params = [], []
+        if from_model is not None:
+            clauses.append(f"{from_column} = ?")
+            params.append(prepare(from_model))
+        if to_model is not None:
+            clauses.append(f"{to_column} = ?")
+            params.append(prepare(to_model))
+        if types is not None:
+            types = [types] if isinstance(types, str) else list(types)
+            clauses.append(f"type IN ({', '.join('?' * len(types))})")
+            params.extend(types)
+        if min_strength is not None:
+            clauses.append("strength >= ?")
+            params.append(min_strength)
+        if max_strength is not None:
+            clauses.append("strength <= ?")
+            params.append(max_strength)
+        if direction is not None:
+            clauses.append("direction = ?")
+            params.append(direction)
+        if touching is not None:
+            # Two index lookups (outgoing, incoming) instead of a scan over both columns
+            code = prepare(touching)
+            extra = ''.join(f" AND {clause}" for clause in clauses)
+            clauses = [
+                f"pos IN (SELECT pos FROM relationships WHERE {from_column} = ?{extra} "
+                f"UNION SELECT pos FROM relationships WHERE {to_column} = ?{extra})"
+            ]
+            params = [code, *params, code, *params]
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def query(self, from_model: Optional[str] = None, to_model: Optional[str] = None,
+              touching: Optional[str] = None, types: Union[str, Sequence[str], None] = None,
+              min_strength: Optional[float] = None, max_strength: Optional[float] = None,
+              direction: Optional[str] = None, normalized: bool = False,
+              limit: Optional[int] = None) -> List[Dict]:
+        """
+        Relationships matching all given filters, in file order.
+
+        Args:
+            from_model / to_model: Source / target model code
+            touching: Model code on either end
+            types: Relationship type or list of types
+            min_strength / max_strength: Inclusive strength bounds
+            direction: 'unidirectional' or 'bidirectional'
+            normalized: Compare model codes in canonical form (IN8 == IN08)
+            limit: Maximum number of rows
+        """
+        where, params = self._where(from_model, to_model, touching, types, min_strength,
+                                    max_strength, direction, normalized)
+        sql = f"SELECT {_SELECT_COLUMNS} FROM relationships{where} ORDER BY pos"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        keys = [key for key, _ in FIELDS]
+        return [dict(zip(keys, row)) for row in self.conn.execute(sql, params)]
+
+    def count(self, from_model: Optional[str] = None, to_model: Optional[str] = None,
+              touching: Optional[str] = None, types: Union[str, Sequence[str], None] = None,
+              min_strength: Optional[float] = None, max_strength: Optional[float] = None,
+              direction: Optional[str] = None, normalized: bool = False) -> int:
+        """Number of relationships matching the filters (see query())"""
+        where, params = self._where(from_model, to_model, touching, types, min_strength,
+                                    max_strength, direction, normalized)
+        return self.conn.execute(f"SELECT COUNT(*) FROM relationships{where}", params).fetchone()[0]
+
+    def get(self, relationship_id: str) -> Optional[Dict]:
+        """Relationship by ID (first occurrence), or None"""
+        row = self.conn.execute(
+            f"SELECT {_SELECT_COLUMNS} FROM relationships WHERE id = ? ORDER BY pos LIMIT 1",
+            (relationship_id,)).fetchone()
+        return dict(zip([key for key, _ in FIELDS], row)) if row else None
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM relationships").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'RelationshipStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query relationships through the indexed SQLite store')
+    parser.add_argument('--relationships', '-r', default='data/relationships.json',
+                        help='Path to relationships.json (default: data/relationships.json)')
+    parser.add_argument('--db', help=f'SQLite database path (default: {DEFAULT_DB_PATH})')
+    parser.add_argument('--from', dest='from_model', help='Source model code')
+    parser.add_argument('--to', dest='to_model', help='Target model code')
+    parser.add_argument('--touching', help='Model code on either end')
+    parser.add_argument('--type', action='append', dest='types', help='Relationship type (repeatable)')
+    parser.add_argument('--min-strength', type=float)
+    parser.add_argument('--max-strength', type=float)
+    parser.add_argument('--direction', choices=['unidirectional', 'bidirectional'])
+    parser.add_argument('--normalized', action='store_true', help='Match codes in canonical form (IN8 == IN08)')
+    parser.add_argument('--limit', type=int)
+    parser.add_argument('--count', action='store_true', help='Print only the number of matches')
+    args = parser.parse_args()
+
+    filters = dict(
+        from_model=args.from_model, to_model=args.to_model, touching=args.touching,
+        types=args.types, min_strength=args.min_strength, max_strength=args.max_strength,
+        direction=args.direction, normalized=args.normalized,
+    )
+    with RelationshipStore(args.relationships, args.db) as store:
+        if args.count:
+            print(store.count(**filters))
+        else:
+            print(json.dumps(store.query(limit=args.limit, **filters), indent=2))
+
+
+if __name__ == '__main__':
+    main()
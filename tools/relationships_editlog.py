@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Append-only edit log for relationship fixes.
+
+Instead of rewriting data/relationships.json for every fix run, field-level
+changes are appended to data/relationships.editlog.jsonl, one JSON object per
+line:
+
+    {"seq": 12, "ts": "2026-03-01T10:15:00", "id": "REL-042", "field": "strength",
+     "old": 0.7, "new": 0.8, "reason": "Strength refinement", "source": "batches 1,2"}
+
+The current relationships are the snapshot (relationships.json) with the log
+replayed over it; every old value is checked during replay, so a snapshot
+edited behind the log's back is reported instead of silently overwritten.
+Appending a fix set costs O(changes). compact() folds the log into a new
+snapshot and moves the folded entries to relationships.editlog.archive.jsonl;
+because entries keep their old values, any earlier point in time can be
+reconstructed by replaying forward (after the snapshot) or reverting backward
+(before it).
+
+Tools that load relationships through relationships_columnar pick up pending
+log entries automatically.
+
+Usage:
+    python tools/relationships_editlog.py log                       # list pending changes
+    python tools/relationships_editlog.py materialize -o out.json   # snapshot + log
+    python tools/relationships_editlog.py as-of 2026-03-01T00:00:00 -o then.json
+    python tools/relationships_editlog.py as-of --seq 40 -o then.json
+    python tools/relationships_editlog.py compact
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+sys.path.insert(0, str(Path(__file__).parent))
+from relationships_stream import iter_relationships, write_json_array
+
+LOG_SUFFIX = '.editlog.jsonl'
+ARCHIVE_SUFFIX = '.editlog.archive.jsonl'
+
+# compact() automatically once the pending log reaches this fraction of the snapshot size
+AUTO_COMPACT_RATIO = 0.25
+
+
+class EditLogConflict(ValueError):
+    """A log entry's old value does not match the relationship it is replayed onto"""
+
+
+def log_path_for(snapshot_path: Union[str, Path]) -> Path:
+    """Edit log path for a relationships snapshot (data/relationships.editlog.jsonl)"""
+    snapshot_path = Path(snapshot_path)
+    return snapshot_path.with_name(snapshot_path.stem + LOG_SUFFIX)
+
+
+def archive_path_for(snapshot_path: Union[str, Path]) -> Path:
+    """Archive of compacted log entries for a relationships snapshot"""
+    snapshot_path = Path(snapshot_path)
+    return snapshot_path.with_name(snapshot_path.stem + ARCHIVE_SUFFIX)
+
+
+def _iter_entries(path: Path) -> Iterator[Dict]:
+    if not path.exists():
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _last_entry(path: Path) -> Optional[Dict]:
+    """Last entry of a JSONL file, read from the end (no full scan)"""
+    if not path.exists():
+        return None
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        block = b''
+        while end > 0:
+            start = max(0, end - 4096)
+            f.seek(start)
+            block = f.read(end - start) + block
+            end = start
+            lines = block.strip().split(b'\n')
+            if len(lines) > 1 or end == 0:
+                return json.loads(lines[-1]) if lines[-1] else None
+    return None
+
+
+def _entry_selected(entry: Dict, until_seq: Optional[int], until_ts: Optional[str]) -> bool:
+    if until_seq is not None and entry['seq'] > until_seq:
+        return False
+    if until_ts is not None and entry['ts'] > until_ts:
+        return False
+    return True
+
+
+class EditLog:
+    """Pending field-level changes to a relationships snapshot"""
+
+    def __init__(self, snapshot_path: Union[str, Path] = 'data/relationships.json'):
+        self.snapshot_path = Path(snapshot_path)
+        self.path = log_path_for(self.snapshot_path)
+        self.archive_path = archive_path_for(self.snapshot_path)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.entries())
+
+    def __bool__(self) -> bool:
+        return self.path.exists() and self.path.stat().st_size > 0
+
+    def entries(self, until_seq: Optional[int] = None, until_ts: Optional[str] = None) -> Iterator[Dict]:
+        """Pending (not yet compacted) entries, optionally only up to a seq/timestamp"""
+        for entry in _iter_entries(self.path):
+            if _entry_selected(entry, until_seq, until_ts):
+                yield entry
+
+    def archived_entries(self) -> Iterator[Dict]:
+        """Entries already folded into the snapshot by compact()"""
+        return _iter_entries(self.archive_path)
+
+    def next_seq(self) -> int:
+        last = _last_entry(self.path) or _last_entry(self.archive_path)
+        return last['seq'] + 1 if last else 1
+
+    def append(self, changes: Iterable[Dict], source: str = '') -> List[Dict]:
+        """
+        Append changes ({'id', 'field', 'old', 'new', 'reason'}) to the log.
+
+        Returns the written entries (with seq/ts assigned).
+        """
+        seq = self.next_seq()
+        ts = datetime.now().isoformat(timespec='seconds')
+        entries = []
+        for change in changes:
+            entry = {
+                'seq': seq,
+                'ts': ts,
+                'id': change['id'],
+                'field': change['field'],
+                'old': change.get('old'),
+                'new': change['new'],
+                'reason': change.get('reason', ''),
+            }
+            if source:
+                entry['source'] = source
+            entries.append(entry)
+            seq += 1
+        if entries:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        return entries
+
+    def pending_by_id(self, until_seq: Optional[int] = None, until_ts: Optional[str] = None) -> Dict[str, List[Dict]]:
+        """Pending entries grouped by relationship ID, in log order"""
+        by_id: Dict[str, List[Dict]] = {}
+        for entry in self.entries(until_seq, until_ts):
+            by_id.setdefault(entry['id'], []).append(entry)
+        return by_id
+
+    def iter_materialized(self, until_seq: Optional[int] = None, until_ts: Optional[str] = None,
+                          strict: bool = True) -> Iterator[Dict]:
+        """Stream the snapshot with pending entries (up to seq/ts) applied"""
+        pending = self.pending_by_id(until_seq, until_ts)
+        return _apply_pending(iter_relationships(self.snapshot_path), pending, strict)
+
+    def materialize(self, until_seq: Optional[int] = None, until_ts: Optional[str] = None,
+                    strict: bool = True) -> List[Dict]:
+        return list(self.iter_materialized(until_seq, until_ts, strict))
+
+    def as_of(self, until_seq: Optional[int] = None, until_ts: Optional[str] = None) -> List[Dict]:
+        """
+        Relationships as they were at a point in time (seq or timestamp).
+
+        Points after the last compaction replay pending entries forward;
+        earlier points revert archived entries (newest first) using their old values.
+        """
+        reverted = [
+            entry for entry in self.archived_entries()
+            if not _entry_selected(entry, until_seq, until_ts)
+        ]
+        if not reverted:
+            return self.materialize(until_seq, until_ts)
+        undo: Dict[str, List[Dict]] = {}
+        for entry in reversed(reverted):
+            undo.setdefault(entry['id'], []).append({
+                **entry, 'old': entry['new'], 'new': entry['old']
+            })
+        return list(_apply_pending(iter_relationships(self.snapshot_path), undo, strict=True))
+
+    def compact(self) -> int:
+        """Fold pending entries into a new snapshot; returns the number of entries folded"""
+        entries = list(self.entries())
+        if not entries:
+            return 0
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + '.tmp')
+        write_json_array(self.iter_materialized(), tmp_path)
+        # The snapshot swap is atomic; a crash before the log is archived leaves
+        # entries whose old values no longer match, which replay reports as a conflict.
+        os.replace(tmp_path, self.snapshot_path)
+        with open(self.archive_path, 'a', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+        self.path.unlink()
+        return len(entries)
+
+    def should_compact(self) -> bool:
+        """True once the pending log is large relative to the snapshot"""
+        if not self:
+            return False
+        return self.path.stat().st_size >= AUTO_COMPACT_RATIO * self.snapshot_path.stat().st_size
+
+
+def _apply_pending(relationships: Iterable[Dict], pending: Dict[str, List[Dict]],
+                   strict: bool) -> Iterator[Dict]:
+    remaining = set(pending)
+    for rel in relationships:
+        entries = pending.get(rel.get('id'))
+        if entries:
+            remaining.discard(rel['id'])
+            for entry in entries:
+                field = entry['field']
+                if strict and rel.get(field) != entry['old']:
+                    raise EditLogConflict(
+                        f"Edit #{entry['seq']} expects {rel['id']}.{field} == {entry['old']!r}, "
+                        f"found {rel.get(field)!r}"
+                    )
+                rel[field] = entry['new']
+        yield rel
+    if strict and remaining:
+        raise EditLogConflict(f"Edit log references unknown relationships: {sorted(remaining)}")
+
+
+def iter_current_relationships(snapshot_path: Union[str, Path]) -> Iterator[Dict]:
+    """Stream relationships from a snapshot with its pending edit log (if any) applied"""
+    log = EditLog(snapshot_path)
+    if log:
+        return log.iter_materialized()
+    return iter_relationships(snapshot_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect, materialize and compact the relationships edit log')
+    parser.add_argument('--snapshot', default='data/relationships.json', help='Relationships snapshot')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('log', help='List pending changes')
+    materialize_parser = subparsers.add_parser('materialize', help='Write snapshot + pending changes')
+    materialize_parser.add_argument('--output', '-o', required=True)
+    as_of_parser = subparsers.add_parser('as-of', help='Write relationships as of a timestamp or seq')
+    as_of_parser.add_argument('timestamp', nargs='?', help='ISO timestamp (e.g. 2026-03-01T12:00:00)')
+    as_of_parser.add_argument('--seq', type=int, help='Last edit sequence number to include')
+    as_of_parser.add_argument('--output', '-o', required=True)
+    subparsers.add_parser('compact', help='Fold pending changes into the snapshot')
+
+    args = parser.parse_args()
+    log = EditLog(args.snapshot)
+
+    if args.command == 'log':
+        count = 0
+        for entry in log.entries():
+            count += 1
+            print(f"#{entry['seq']} {entry['ts']} {entry['id']}: {entry['field']} "
+                  f"{entry['old']} → {entry['new']} ({entry['reason']})")
+        print(f"{count} pending change(s) in {log.path}")
+    elif args.command == 'materialize':
+        count = write_json_array(log.iter_materialized(), args.output)
+        print(f"✅ Wrote {count} relationships to {args.output}")
+    elif args.command == 'as-of':
+        if args.timestamp is None and args.seq is None:
+            parser.error('as-of needs a timestamp or --seq')
+        count = write_json_array(log.as_of(until_seq=args.seq, until_ts=args.timestamp), args.output)
+        print(f"✅ Wrote {count} relationships to {args.output}")
+    elif args.command == 'compact':
+        folded = log.compact()
+        print(f"✅ Folded {folded} change(s) into {log.snapshot_path}")
+
+
+if __name__ == '__main__':
+    main()
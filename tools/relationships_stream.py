@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Streaming readers and writers for relationship records.
+
+Relationship dumps can be far larger than the 3,300-line data/relationships.json.
+The readers here yield one relationship dict at a time from CSV exports, JSON
+arrays or JSONL files, holding only a small read buffer in memory; the writers
+consume any iterable of records. Conversion and validation of multi-GB dumps
+therefore run in bounded RAM.
+
+write_json_array() output is byte-identical to json.dump(records, f, indent=2),
+so existing data/relationships.json files do not change when regenerated.
+
+Usage:
+    from relationships_stream import iter_relationships, write_json_array
+
+    for rel in iter_relationships('data/relationships.json'):   # .csv, .json or .jsonl
+        ...
+    write_json_array(iter_relationships('data/relationships.csv'), 'out.json')
+"""
+
+import csv
+import json
+import re
+from pathlib import Path
+from typing import Dict, IO, Iterable, Iterator, Optional, Union
+
+# Characters read per refill of the JSON array buffer
+CHUNK_SIZE = 1 << 16
+
+# Largest single array element accepted (guards against buffering a corrupt file whole)
+MAX_ELEMENT_SIZE = 1 << 26
+
+# Input formats understood by iter_relationships()
+FORMATS = ('csv', 'json', 'jsonl')
+
+JSONL_SUFFIXES = ('.jsonl', '.ndjson')
+
+_WHITESPACE = ' \t\n\r'
+_SKIP_WHITESPACE = re.compile(r'[ \t\n\r]*').match
+_SEPARATOR = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*').match
+
+PathOrFile = Union[str, Path, IO[str]]
+
+
+def csv_row_to_relationship(rel: Dict[str, str]) -> Dict:
+    """Map a CSV export row (relation_id, from_model, ...) to a relationship dict"""
+    return {
+        'id': rel.get('relation_id', '').strip(),
+        'from': rel.get('from_model', '').strip(),
+        'to': rel.get('to_model', '').strip(),
+        'type': rel.get('relation_type', '').strip().upper(),
+        'strength': float(rel.get('strength', 0)),
+        'direction': rel.get('direction', '').strip(),
+        'description': rel.get('description', '').strip()
+    }
+
+
+def iter_csv(path: Union[str, Path]) -> Iterator[Dict]:
+    """Yield relationships from a CSV export (an optional title row is skipped)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        # Skip first row if it's a title
+        if header and 'HUMMBL-Relationships' in header[0]:
+            header = next(reader, None)
+        if header is None:
+            return
+        for row in reader:
+            yield csv_row_to_relationship(dict(zip(header, row)))
+
+
+def iter_jsonl(path: Union[str, Path]) -> Iterator[Dict]:
+    """Yield records from a JSONL file (one JSON value per line, blank lines ignored)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise json.JSONDecodeError(f"{e.msg} (line {line_number})", e.doc, e.pos) from None
+
+
+class _ArrayScanner:
+    """Incremental scanner over the elements of a top-level JSON array"""
+
+    def __init__(self, f: IO[str], chunk_size: int = CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        # Position of buffer[0] in the file, for error messages
+        self.chars_before = 0
+        self.lines_before = 0
+        self.column_offset = 0
+
+    def fill(self, size: int = 0) -> bool:
+        """Append the next chunk (dropping consumed text); False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.f.read(max(size, self.chunk_size))
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            consumed = self.buffer[:self.pos]
+            newlines = consumed.count('\n')
+            self.lines_before += newlines
+            if newlines:
+                self.column_offset = len(consumed) - consumed.rindex('\n') - 1
+            else:
+                self.column_offset += len(consumed)
+            self.chars_before += self.pos
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)"""
+        while True:
+            self.pos = _SKIP_WHITESPACE(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def error(self, msg: str, pos: Optional[int] = None) -> json.JSONDecodeError:
+        """JSONDecodeError with line/column/char positions relative to the whole file"""
+        pos = self.pos if pos is None else pos
+        exc = json.JSONDecodeError(msg, self.buffer, pos)
+        exc.pos = self.chars_before + pos
+        if exc.lineno == 1:
+            exc.colno += self.column_offset
+        exc.lineno += self.lines_before
+        exc.args = (f"{msg}: line {exc.lineno} column {exc.colno} (char {exc.pos})",)
+        return exc
+
+    def decode(self):
+        """Decode the value starting at the cursor, reading more input as needed"""
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Most likely an element cut off by the chunk boundary: double the window and retry
+                pending = len(self.buffer) - self.pos
+                if pending < MAX_ELEMENT_SIZE and self.fill(pending):
+                    continue
+                raise self.error(e.msg, e.pos) from None
+            # A number near the end of the buffer may continue in the next chunk ("2." + "5e-3")
+            if (isinstance(value, (int, float)) and len(self.buffer) - end <= 2
+                    and not self.eof and self.fill()):
+                continue
+            self.pos = end
+            return value
+
+    def separator(self) -> str:
+        """Consume the ',' or ']' after an element"""
+        separator = self.peek()
+        if separator not in (',', ']'):
+            raise self.error("Expecting ',' delimiter")
+        self.pos += 1
+        if separator == ',' and self.peek() == ']':
+            raise self.error('Expecting value')
+        return separator
+
+    def __iter__(self) -> Iterator:
+        if self.peek() != '[':
+            raise self.error('Expecting JSON array')
+        self.pos += 1
+        if self.peek() == ']':
+            self.pos += 1
+        else:
+            scan_once = self.decoder.scan_once
+            while True:
+                # Fast path: element and separator both complete inside the buffer
+                buffer = self.buffer
+                try:
+                    value, end = scan_once(buffer, self.pos)
+                    match = _SEPARATOR(buffer, end)
+                except (StopIteration, json.JSONDecodeError):
+                    match = None
+                if match is not None and match.end() < len(buffer) and buffer[match.end()] != ']':
+                    self.pos = match.end()
+                    separator = match.group(1)
+                else:
+                    value = self.decode()
+                    separator = self.separator()
+                yield value
+                if separator == ']':
+                    break
+        if self.peek():
+            raise self.error('Extra data')
+
+
+def iter_json_array(path: Union[str, Path], chunk_size: int = CHUNK_SIZE) -> Iterator:
+    """Yield the elements of a top-level JSON array without loading the whole file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from _ArrayScanner(f, chunk_size)
+
+
+def detect_format(path: Union[str, Path]) -> str:
+    """'csv', 'jsonl' or 'json' from the file suffix (a .json file holding JSONL is sniffed)"""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        return 'csv'
+    if suffix in JSONL_SUFFIXES:
+        return 'jsonl'
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            char = f.read(1)
+            if not char or char not in _WHITESPACE:
+                break
+    return 'jsonl' if char == '{' else 'json'
+
+
+def iter_relationships(path: Union[str, Path], fmt: Optional[str] = None) -> Iterator[Dict]:
+    """Yield relationships from a CSV, JSON array or JSONL file"""
+    fmt = fmt or detect_format(path)
+    if fmt == 'csv':
+        return iter_csv(path)
+    if fmt == 'jsonl':
+        return iter_jsonl(path)
+    if fmt == 'json':
+        return iter_json_array(path)
+    raise ValueError(f"Unknown relationships format '{fmt}' (expected one of {FORMATS})")
+
+
+def _open_output(target: PathOrFile):
+    if isinstance(target, (str, Path)):
+        return open(target, 'w', encoding='utf-8'), True
+    return target, False
+
+
+def write_json_array(records: Iterable, target: PathOrFile) -> int:
+    """Write records as an indent=2 JSON array (same bytes as json.dump); returns the count"""
+    f, owned = _open_output(target)
+    count = 0
+    try:
+        for record in records:
+            f.write('[\n  ' if count == 0 else ',\n  ')
+            f.write(json.dumps(record, indent=2).replace('\n', '\n  '))
+            count += 1
+        f.write('\n]' if count else '[]')
+    finally:
+        if owned:
+            f.close()
+    return count
+
+
+def write_jsonl(records: Iterable, target: PathOrFile) -> int:
+    """Write records one JSON object per line; returns the count"""
+    f, owned = _open_output(target)
+    count = 0
+    try:
+        for record in records:
+            f.write(json.dumps(record))
+            f.write('\n')
+            count += 1
+    finally:
+        if owned:
+            f.close()
+    return count
+
+
+def write_relationships(records: Iterable, target: Union[str, Path], fmt: Optional[str] = None) -> int:
+    """Write records as a JSON array or JSONL (chosen from the suffix when fmt is None)"""
+    if fmt is None:
+        fmt = 'jsonl' if Path(target).suffix.lower() in JSONL_SUFFIXES else 'json'
+    if fmt == 'jsonl':
+        return write_jsonl(records, target)
+    if fmt == 'json':
+        return write_json_array(records, target)
+    raise ValueError(f"Unknown output format '{fmt}' (expected 'json' or 'jsonl')")
@@ -1,34 +1,24 @@
-import csv
-import json
 import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from relationships_stream import iter_csv, iter_relationships, write_relationships
 
 # Usage: python relationships_to_json.py data/relationships.csv data/relationships.json
+#        python relationships_to_json.py data/relationships.csv relationships.jsonl   (or --jsonl)
+# Input may also be a JSON array or JSONL file; records are streamed, not held in memory.
+
+def read_relationships_csv(input_csv):
+    """Parse the relationships CSV export into relationship dicts."""
+    return list(iter_csv(input_csv))
 
-def main(input_csv, output_json):
-    relationships = []
-    with open(input_csv, 'r', encoding='utf-8') as f:
-        reader = csv.reader(f)
-        rows = list(reader)
-        # Skip first row if it's a title
-        if rows and 'HUMMBL-Relationships' in rows[0][0]:
-            rows = rows[1:]
-        header = rows[0]
-        for row in rows[1:]:
-            rel = dict(zip(header, row))
-            relationships.append({
-                'id': rel.get('relation_id', '').strip(),
-                'from': rel.get('from_model', '').strip(),
-                'to': rel.get('to_model', '').strip(),
-                'type': rel.get('relation_type', '').strip().upper(),
-                'strength': float(rel.get('strength', 0)),
-                'direction': rel.get('direction', '').strip(),
-                'description': rel.get('description', '').strip()
-            })
-    with open(output_json, 'w', encoding='utf-8') as f:
-        json.dump(relationships, f, indent=2)
+def main(input_path, output_path, jsonl=False):
+    records = iter_relationships(input_path)
+    return write_relationships(records, output_path, fmt='jsonl' if jsonl else None)
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python relationships_to_json.py <input_csv> <output_json>")
+    args = [arg for arg in sys.argv[1:] if arg != '--jsonl']
+    if len(args) != 2:
+        print("Usage: python relationships_to_json.py <input_csv> <output_json> [--jsonl]")
         sys.exit(1)
-    main(sys.argv[1], sys.argv[2])
+    main(args[0], args[1], jsonl='--jsonl' in sys.argv[1:])
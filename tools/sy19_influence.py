@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Precomputed k-hop influence tables for SY19 recommendations.
+
+For a fixed graph and fixed scoring constants, the scores a primary model
+contributes to every other model within max_hops never change. An influence
+table stores, per max_hops, one sparse row per model: the models it touches
+(in first-scored order), its summed contribution to each, and each entry's
+first reason arcs. With SY19Recommender(engine='influence') a recommendation
+is a sum of a few rows plus top-K selection, so latency no longer depends on
+hop depth.
+
+Tables are keyed by a hash of the scoring inputs (graph columns, node
+weights, TYPE_WEIGHTS, DIRECTION_WEIGHTS, HOP_DECAY, ALPHA, PRIMARY_BOOST)
+and persisted as .cache/sy19-influence/<key>-h<max_hops>.npz; any change to
+relationships.json, its edit log or the constants selects a new file.
+
+Single-primary recommendations are identical to the other engines. With
+several primaries, each model's score is the sum of per-primary row sums
+rather than of the individual contributions, so scores can differ in the
+last floating-point digit.
+
+Usage:
+    python tools/sy19_influence.py --max-hops 1 2 3           # precompute for data/relationships.json
+    python tools/sy19_recommend.py "problem" --engine influence
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from sy19_recommend import NO_PARENT, SY19Recommender, _first_occurrences
+
+FORMAT_VERSION = 1
+
+DEFAULT_INFLUENCE_DIR = Path(__file__).parent.parent / '.cache' / 'sy19-influence'
+
+# Reason arcs kept per row entry (recommendations show at most three reasons)
+REASONS_PER_ENTRY = 3
+
+# Rows grow towards N x N as max_hops reaches across the graph; refuse larger tables
+MAX_TABLE_BYTES = 1 << 30
+
+# Bytes per row entry: node (int32), score (float64), reason arcs (int32 each)
+ENTRY_BYTES = 4 + 8 + 4 * REASONS_PER_ENTRY
+
+
+def scoring_key(recommender: SY19Recommender, max_hops: int) -> str:
+    """Hash of everything a table's scores depend on"""
+    graph = recommender.relationship_graph
+    _, _, _, _, rel_weight, node_weight = recommender._vectorized_arrays()
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        'version': FORMAT_VERSION,
+        'max_hops': max_hops,
+        'nodes': graph.nodes,
+        'type_weights': recommender.TYPE_WEIGHTS,
+        'direction_weights': recommender.DIRECTION_WEIGHTS,
+        'hop_decay': recommender.HOP_DECAY,
+        'alpha': recommender.ALPHA,
+        'primary_boost': recommender.PRIMARY_BOOST,
+    }, sort_keys=True).encode('utf-8'))
+    for array in (graph.forward.offsets, graph.forward.neighbors, graph.forward.rel_index,
+                  rel_weight, node_weight):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+class InfluenceTable:
+    """Per-model score contribution rows (CSR) for one max_hops"""
+
+    def __init__(self, indptr: np.ndarray, nodes: np.ndarray, scores: np.ndarray,
+                 reasons: np.ndarray, key: str, max_hops: int):
+        self.indptr = indptr
+        self.nodes = nodes
+        self.scores = scores
+        self.reasons = reasons
+        self.key = key
+        self.max_hops = max_hops
+
+    @classmethod
+    def build(cls, recommender: SY19Recommender, max_hops: int, progress: bool = False,
+              max_bytes: int = MAX_TABLE_BYTES) -> 'InfluenceTable':
+        """
+        Propagate every model once and aggregate its records into a row.
+
+        Raises ValueError once the table would exceed max_bytes.
+        """
+        num_nodes = recommender.relationship_graph.num_nodes
+        row_nodes, row_scores, row_reasons = [], [], []
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        start = time.perf_counter()
+        for node in range(num_nodes):
+            nodes, scores, reasons = cls._aggregate(*recommender._propagate([node], max_hops), num_nodes)
+            row_nodes.append(nodes.astype(np.int32))
+            row_scores.append(scores)
+            row_reasons.append(reasons.astype(np.int32))
+            indptr[node + 1] = indptr[node] + len(nodes)
+            # Fail early on a projection from the first rows rather than after hours of work
+            rows_done = node + 1
+            projected = indptr[rows_done] * ENTRY_BYTES * (num_nodes / rows_done if rows_done >= 64 else 1)
+            if projected > max_bytes:
+                raise ValueError(
+                    f"Influence table for max_hops={max_hops} would exceed {max_bytes / 1e6:.0f} MB "
+                    f"(~{projected / 1e6:.0f} MB after {rows_done}/{num_nodes} rows); "
+                    f"use the vectorized engine for this graph"
+                )
+            if progress and (node + 1) % max(1, num_nodes // 20) == 0:
+                print(f"   {node + 1}/{num_nodes} rows ({time.perf_counter() - start:.1f}s)", file=sys.stderr)
+        return cls(
+            indptr,
+            np.concatenate(row_nodes),
+            np.concatenate(row_scores),
+            np.concatenate(row_reasons),
+            scoring_key(recommender, max_hops),
+            max_hops,
+        )
+
+    @staticmethod
+    def _aggregate(record_nodes: np.ndarray, record_scores: np.ndarray, record_arcs: np.ndarray,
+                   num_nodes: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """One row from a single primary's records: touched nodes, summed scores, first reason arcs"""
+        touched = record_nodes[_first_occurrences(record_nodes, num_nodes)]
+        sums = np.bincount(record_nodes, weights=record_scores, minlength=num_nodes)
+        position = np.empty(num_nodes, dtype=np.int64)
+        position[touched] = np.arange(len(touched))
+
+        reasons = np.full((len(touched), REASONS_PER_ENTRY), NO_PARENT, dtype=np.int64)
+        selected = np.flatnonzero(record_arcs != NO_PARENT)
+        selected = selected[np.argsort(record_nodes[selected], kind='stable')]
+        group_nodes = record_nodes[selected]
+        rank = np.arange(len(selected)) - np.searchsorted(group_nodes, group_nodes)
+        keep = rank < REASONS_PER_ENTRY
+        reasons[position[group_nodes[keep]], rank[keep]] = record_arcs[selected[keep]]
+        return touched, sums[touched], reasons
+
+    def rows(self, sources: List[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Concatenated rows of the given primaries, in order (records for _rank_records)"""
+        if not sources:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, np.zeros(0), np.zeros((0, REASONS_PER_ENTRY), dtype=np.int64)
+        slices = [slice(self.indptr[source], self.indptr[source + 1]) for source in sources]
+        return (
+            np.concatenate([self.nodes[s] for s in slices]).astype(np.int64),
+            np.concatenate([self.scores[s] for s in slices]),
+            np.concatenate([self.reasons[s] for s in slices]).astype(np.int64),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.nodes.nbytes + self.scores.nbytes + self.reasons.nbytes
+
+    def save(self, path: Union[str, Path]):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp.npz')
+        np.savez(tmp_path, indptr=self.indptr, nodes=self.nodes, scores=self.scores, reasons=self.reasons,
+                 key=np.array(self.key), max_hops=np.array(self.max_hops))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'InfluenceTable':
+        with np.load(path) as data:
+            return cls(data['indptr'], data['nodes'], data['scores'], data['reasons'],
+                       str(data['key']), int(data['max_hops']))
+
+
+def table_path(key: str, max_hops: int, directory: Union[str, Path, None] = None) -> Path:
+    return Path(directory or DEFAULT_INFLUENCE_DIR) / f"{key[:20]}-h{max_hops}.npz"
+
+
+def load_or_build_table(recommender: SY19Recommender, max_hops: int,
+                        directory: Union[str, Path, None] = None, progress: bool = False,
+                        max_bytes: int = MAX_TABLE_BYTES) -> InfluenceTable:
+    """Persisted table for the recommender's current scoring inputs, built and saved if missing"""
+    key = scoring_key(recommender, max_hops)
+    path = table_path(key, max_hops, directory)
+    if path.exists():
+        try:
+            table = InfluenceTable.load(path)
+            if table.key == key:
+                return table
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️  Rebuilding unreadable influence table {path}: {e}", file=sys.stderr)
+    table = InfluenceTable.build(recommender, max_hops, progress=progress, max_bytes=max_bytes)
+    table.save(path)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute SY19 influence tables')
+    parser.add_argument('--relationships', '-r', default='data/relationships.json',
+                        help='Path to relationships.json (default: data/relationships.json)')
+    parser.add_argument('--max-hops', type=int, nargs='+', default=[1, 2, 3],
+                        help='max_hops values to precompute (default: 1 2 3)')
+    parser.add_argument('--dir', help=f'Output directory (default: {DEFAULT_INFLUENCE_DIR})')
+    parser.add_argument('--max-mb', type=float, default=MAX_TABLE_BYTES / 1e6,
+                        help=f'Size limit per table in MB (default: {MAX_TABLE_BYTES / 1e6:.0f})')
+    args = parser.parse_args()
+
+    recommender = SY19Recommender(args.relationships)
+    for max_hops in args.max_hops:
+        start = time.perf_counter()
+        try:
+            table = load_or_build_table(recommender, max_hops, args.dir, progress=True,
+                                        max_bytes=int(args.max_mb * 1e6))
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ max_hops={max_hops}: {len(table.nodes)} entries, {table.nbytes / 1e6:.1f} MB "
+              f"({time.perf_counter() - start:.1f}s) -> {table_path(table.key, max_hops, args.dir)}")
+
+
+if __name__ == '__main__':
+    main()
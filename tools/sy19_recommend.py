@@ -10,13 +10,78 @@ Usage:
     python tools/sy19_recommend.py "API design for distributed system" --top 10
 """
 
+import heapq
 import json
 import sys
+import time
 import argparse
-from typing import List, Dict, Set, Tuple, Optional
-from collections import defaultdict
+from pathlib import Path
+from typing import List, Dict, Sequence, Set, Tuple, Optional
+from collections import OrderedDict, defaultdict, deque
 import re
 
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from relationship_graph import BIDIRECTIONAL, RelationshipEditor, RelationshipGraph
+from relationships_centrality import MEASURES, load_or_build_centrality
+from relationships_columnar import load_relationship_table, source_stamp
+from relationships_stream import iter_jsonl, write_jsonl
+
+# Parent markers in traversal records: the primary boost, and primary self-scores (no reason)
+PRIMARY_PARENT = -1
+NO_PARENT = -2
+
+
+def _frontier_arcs(offsets: np.ndarray, frontier: np.ndarray) -> np.ndarray:
+    """Arc indexes of all frontier nodes, in frontier order and then CSR order."""
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    # Per arc: its node's first arc, shifted back by the arcs of earlier frontier nodes
+    shifts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return shifts + np.arange(int(counts.sum()))
+
+
+def _first_occurrences(values: np.ndarray, size: int) -> np.ndarray:
+    """Positions of the first occurrence of each distinct value (values < size), ascending."""
+    if len(values) * 16 < size:
+        _, first = np.unique(values, return_index=True)
+        first.sort()
+        return first
+    # Linear scatter instead of a sort for large inputs
+    positions = np.arange(len(values))
+    first = np.full(size, len(values), dtype=np.int64)
+    np.minimum.at(first, values, positions)
+    return np.flatnonzero(first[values] == positions)
+
+
+def _top_k_positions(scores: np.ndarray, is_primary: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k best entries: primaries first, then score descending, ties by position.
+    
+    Same order as a full stable sort, but only entries scoring at least the
+    k-th best score (found with a partition) are sorted.
+    """
+    primary = np.flatnonzero(is_primary)
+    primary = primary[np.argsort(-scores[primary], kind='stable')][:k]
+    remaining = k - len(primary)
+    others = np.flatnonzero(~is_primary)
+    if remaining <= 0 or not len(others):
+        return primary
+    negated = -scores[others]
+    if len(others) > remaining:
+        # Keep every entry tied with the k-th best so ties still resolve by position
+        kth = negated[np.argpartition(negated, remaining - 1)[remaining - 1]]
+        candidates = np.flatnonzero(negated <= kth)
+        others, negated = others[candidates], negated[candidates]
+    others = others[np.argsort(negated, kind='stable')][:remaining]
+    return np.concatenate((primary, others))
+
+
+def _copy_recommendations(recommendations: List[Dict]) -> List[Dict]:
+    """Copies callers may modify without touching shared (cached) results."""
+    return [dict(rec, reasons=list(rec['reasons'])) for rec in recommendations]
+
 
 class SY19Recommender:
     """SY19 Meta-Model Selection - Recommends models based on problem description."""
@@ -46,127 +111,546 @@ class SY19Recommender:
     # Primary model boost (ensures primaries stay in top-K)
     PRIMARY_BOOST = 0.2
     
-    def __init__(self, relationships_json: str, centrality_data: Optional[Dict] = None):
+    # Personalized PageRank ('ppr' engine): damping, L1 convergence tolerance,
+    # iteration cap and number of converged vectors kept for warm starts
+    PPR_DAMPING = 0.85
+    PPR_TOLERANCE = 1e-10
+    PPR_MAX_ITERATIONS = 200
+    PPR_CACHE_SIZE = 128
+    
+    # Primary detection strategies for free-text problems
+    DETECTORS = ('keywords', 'bm25', 'hybrid')
+    
+    # Scoring engines (see recommend_models)
+    ENGINES = ('bfs', 'vectorized', 'influence', 'ppr')
+    
+    # Centrality measures for ALPHA weighting (see tools/relationships_centrality.py)
+    CENTRALITY_MEASURES = MEASURES
+    
+    # Number of auto-detected primaries
+    MAX_DETECTED_PRIMARIES = 3
+    
+    # Keyword mappings for the 'keywords' detector (basic - could be expanded);
+    # a keyword matches at a word start, so plurals and verb forms still hit
+    KEYWORD_MAP = {
+        # Bottleneck/failure related
+        'bottleneck': ['DE07'],
+        'failure': ['DE06', 'IN02'],
+        'error': ['DE06'],
+        'breakdown': ['DE06'],
+        
+        # System/composition related
+        'system': ['SY01'],
+        'architecture': ['CO01', 'CO09'],
+        'service': ['CO09'],
+        'microservice': ['CO09'],
+        'composition': ['CO01'],
+        'integration': ['CO05'],
+        
+        # Pipeline/flow related
+        'pipeline': ['CO03'],
+        'flow': ['CO03', 'DE08'],
+        'queue': ['CO12'],
+        'buffer': ['CO12'],
+        
+        # Cascade/effect related
+        'cascade': ['SY04'],
+        'effect': ['SY04', 'P09'],
+        'second-order': ['SY04', 'IN06'],
+        
+        # Feedback/recursion related
+        'feedback': ['RE06'],
+        'loop': ['RE06'],
+        'iteration': ['RE09', 'RE03'],
+        
+        # Perspective related
+        'perspective': ['P02'],
+        'stakeholder': ['P02'],
+        'viewpoint': ['P02', 'P03'],
+        
+        # Inversion related
+        'inversion': ['IN01'],
+        'invert': ['IN01'],
+        'premortem': ['IN02'],
+        
+        # Decomposition related
+        'decompose': ['DE01'],
+        'break down': ['DE01'],
+        'component': ['DE02'],
+    }
+    
+    def __init__(
+        self,
+        relationships_json: str,
+        centrality_data: Optional[Dict] = None,
+        detector: str = 'keywords',
+        search_index: Optional[str] = None,
+        engine: str = 'bfs',
+        influence_dir: Optional[str] = None,
+        cache_size: int = 256,
+        cache_ttl: Optional[float] = None,
+        centrality_measure: str = 'degree',
+        centrality_dir: Optional[str] = None
+    ):
         """
         Initialize recommender with relationships graph.
         
         Args:
             relationships_json: Path to relationships.json file
             centrality_data: Optional pre-computed centrality data (dict mapping model -> degree)
+            detector: Primary detection strategy - 'keywords' (built-in keyword map),
+                'bm25' (full-text search over model files), or 'hybrid' (keywords first,
+                remaining slots filled by BM25)
+            search_index: Optional path to the BM25 index file (see tools/model_search.py)
+            engine: Scoring engine - 'bfs' (multi-source BFS in Python), 'vectorized'
+                (level-synchronous NumPy propagation over the CSR arrays; identical
+                scores and rankings), 'influence' (sums of precomputed per-model rows,
+                see tools/sy19_influence.py) or 'ppr' (personalized PageRank seeded on
+                the primaries; ignores max_hops, scores are stationary probabilities)
+            influence_dir: Directory for persisted influence tables (default: .cache/sy19-influence)
+            cache_size: Maximum number of cached recommendation lists (0 disables the cache)
+            cache_ttl: Optional lifetime of cached results in seconds
+            centrality_measure: Centrality feeding the ALPHA node weight - 'degree'
+                (computed from the graph), or 'pagerank', 'betweenness' or
+                'eigenvector' (loaded from the persisted centrality artifact,
+                computed once per graph); ignored when centrality_data is given
+            centrality_dir: Directory for centrality artifacts (default: .cache/centrality)
         """
-        with open(relationships_json, 'r', encoding='utf-8') as f:
-            self.relationships = json.load(f)
+        if detector not in self.DETECTORS:
+            raise ValueError(f"Unknown detector '{detector}' (expected one of {', '.join(self.DETECTORS)})")
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}' (expected one of {', '.join(self.ENGINES)})")
+        if centrality_measure not in self.CENTRALITY_MEASURES:
+            raise ValueError(f"Unknown centrality measure '{centrality_measure}' "
+                             f"(expected one of {', '.join(self.CENTRALITY_MEASURES)})")
+        self.detector = detector
+        self.engine = engine
+        self.influence_dir = influence_dir
+        self.search_index_path = search_index
+        self._search_index = None
+        self._keyword_matcher = None
         
-        # Build graph structures
-        self.graph = defaultdict(list)  # model -> [(target, relationship_data), ...]
-        self.reverse_graph = defaultdict(list)  # target -> [(source, relationship_data), ...]
-        self.all_models = set()
+        # Result cache (LRU with optional TTL), invalidated when the graph changes
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._result_cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
         
-        for rel in self.relationships:
-            from_model = rel['from']
-            to_model = rel['to']
-            self.all_models.add(from_model)
-            self.all_models.add(to_model)
-            
-            # Store relationship with metadata
-            rel_data = {
-                'type': rel['type'],
-                'strength': rel['strength'],
-                'direction': rel['direction'],
-                'description': rel.get('description', '')
-            }
-            
-            self.graph[from_model].append((to_model, rel_data))
-            self.reverse_graph[to_model].append((from_model, rel_data))
-            
-            # Add reverse edge for bidirectional relationships
-            if rel['direction'] == 'bidirectional':
-                self.graph[to_model].append((from_model, rel_data))
-                self.reverse_graph[from_model].append((to_model, rel_data))
+        self.relationships_path = Path(relationships_json)
+        self._centrality_data = centrality_data
+        self.centrality_measure = centrality_measure
+        self.centrality_dir = centrality_dir
+        self.graph_version = 0
+        self.graph_edits = 0
+        self._scoring_constants = self._current_scoring_constants()
+        self._load_graph()
+    
+    def _load_graph(self):
+        """(Re)load relationships and everything derived from them."""
+        self._source_stamp = source_stamp(self.relationships_path)
+        
+        # Columnar table (memory-mapped .hrel companion when current)
+        self.relationships = load_relationship_table(self.relationships_path)
+        
+        # Shared CSR graph (bidirectional relationships expanded once)
+        self.relationship_graph = RelationshipGraph.from_relationships(self.relationships)
+        self.all_models = set(self.relationship_graph.nodes)
+        self._graph = None
+        self._reverse_graph = None
+        self._reset_scoring_state()
+        
+        # Live edits (add_edge/remove_edge/update_edge) since the load
+        self._editor = None
+        self._graph_stale = False
+        self._pending_in = defaultdict(list)
         
         # Compute centrality if not provided
-        if centrality_data:
-            self.centrality = centrality_data
-        else:
+        if self._centrality_data:
+            self.centrality = self._centrality_data
+        elif self.centrality_measure == 'degree':
             self.centrality = self._compute_degree_centrality()
+        else:
+            table = load_or_build_centrality(self.relationship_graph, self.centrality_dir)
+            self.centrality = table.measure(self.centrality_measure)
         
         # Normalize centrality for weighting
+        self._normalize_centrality()
+        
+        self.graph_version += 1
+        self._result_cache.clear()
+    
+    def _normalize_centrality(self):
         max_degree = max(self.centrality.values()) if self.centrality.values() else 1.0
+        self._max_degree = max_degree
         self.normalized_centrality = {
             model: deg / max_degree if max_degree > 0 else 0.0
             for model, deg in self.centrality.items()
         }
     
+    def _reset_scoring_state(self):
+        """Drop arrays and tables derived from the graph and the scoring constants."""
+        self._traversal = None
+        self._traversal_arrays = None
+        self._influence_tables = {}
+        self._ppr_matrix = None
+        self._ppr_vectors = OrderedDict()
+        self.ppr_iterations = 0
+    
+    def _current_scoring_constants(self) -> Tuple:
+        return (
+            tuple(sorted(self.TYPE_WEIGHTS.items())),
+            tuple(sorted(self.DIRECTION_WEIGHTS.items())),
+            self.HOP_DECAY,
+            self.ALPHA,
+            self.PRIMARY_BOOST,
+            self.PPR_DAMPING,
+            self.PPR_TOLERANCE,
+        )
+    
+    def refresh(self) -> bool:
+        """
+        Pick up changes to the relationships file (or its edit log) and to the scoring constants.
+        
+        Called by recommend_models(); returns True if the graph was reloaded.
+        Reloading replaces any live edits. Pending live edits that change arcs
+        are applied here (one CSR rebuild).
+        """
+        reloaded = self._refresh_source()
+        self._apply_edits()
+        return reloaded
+    
+    def _refresh_source(self) -> bool:
+        constants = self._current_scoring_constants()
+        if constants != self._scoring_constants:
+            self._scoring_constants = constants
+            self._reset_scoring_state()
+        if source_stamp(self.relationships_path) == self._source_stamp:
+            return False
+        self._load_graph()
+        return True
+    
+    def cache_info(self) -> Dict:
+        """Result cache statistics."""
+        return {
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'size': len(self._result_cache),
+            'maxsize': self.cache_size,
+            'ttl': self.cache_ttl,
+            'graph_version': self.graph_version,
+        }
+    
+    def cache_clear(self):
+        """Empty the result cache and reset its counters."""
+        self._result_cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    @property
+    def graph(self) -> Dict[str, List[Tuple[str, Dict]]]:
+        """model -> [(target, relationship_data), ...] (built from the CSR graph on first use)"""
+        self._apply_edits()
+        if self._graph is None:
+            self._graph, self._reverse_graph = self._build_adjacency_lists()
+        return self._graph
+    
+    @property
+    def reverse_graph(self) -> Dict[str, List[Tuple[str, Dict]]]:
+        """target -> [(source, relationship_data), ...]"""
+        self._apply_edits()
+        if self._reverse_graph is None:
+            self._graph, self._reverse_graph = self._build_adjacency_lists()
+        return self._reverse_graph
+    
+    def add_edge(self, from_model: str, to_model: str, rel_type: str, strength: float,
+                 direction: str = 'unidirectional', rel_id: Optional[str] = None,
+                 description: str = '') -> Dict:
+        """
+        Add a relationship to the live graph (new models are added as nodes).
+        
+        Degree centrality of both endpoints is patched (precomputed measures
+        are kept until the next reload) and cached results whose
+        primaries reach either endpoint are dropped; the CSR arrays are rebuilt
+        once before the next recommendation, however many edits came first.
+        Edits are in memory only and are replaced when the relationships file
+        or its edit log changes. Returns the new relationship. Invalid input
+        (non-string codes, unknown names, strength not finite or outside
+        [0, 1]) raises TypeError/ValueError and changes nothing.
+        """
+        self._refresh_source()
+        editor = self._get_editor()
+        # Reject bad input before the cache, centrality or the editor change
+        editor.validate_add(from_model, to_model, rel_type, strength, direction, rel_id, description)
+        self._invalidate_results({from_model, to_model})
+        index = editor.add(from_model, to_model, rel_type, strength, direction, rel_id, description)
+        self._shift_centrality(index, 1)
+        self._add_pending_arcs(index)
+        self._graph_stale = True
+        self.graph_edits += 1
+        return editor[index]
+    
+    def remove_edge(self, rel_id: str) -> Dict:
+        """Remove a relationship from the live graph (see add_edge); returns it. KeyError if unknown."""
+        self._refresh_source()
+        editor = self._get_editor()
+        relationship = editor[editor.index_of(rel_id)]
+        self._invalidate_results({relationship['from'], relationship['to']})
+        self._shift_centrality(editor.remove(rel_id), -1)
+        self._graph_stale = True
+        self.graph_edits += 1
+        return relationship
+    
+    def update_edge(self, rel_id: str, strength: Optional[float] = None, rel_type: Optional[str] = None,
+                    direction: Optional[str] = None, description: Optional[str] = None) -> Dict:
+        """
+        Change fields of a relationship in the live graph (see add_edge); returns it.
+        
+        Strength and type changes are patched into the CSR arcs and the scoring
+        arrays in place (O(degree)); a direction change adds or removes an arc
+        and waits for the rebuild like add_edge.
+        """
+        self._refresh_source()
+        editor = self._get_editor()
+        index = editor.index_of(rel_id)
+        relationship = editor[index]
+        # Reject bad input before the cache, centrality or the editor change
+        editor.validate(rel_type=rel_type, strength=strength, direction=direction, description=description)
+        self._invalidate_results({relationship['from'], relationship['to']})
+        
+        if direction is not None and editor.direction_id(direction) != editor.column('direction')[index]:
+            self._shift_centrality(index, -1)
+            editor.update(rel_id, strength, rel_type, direction, description)
+            self._shift_centrality(index, 1)
+            self._add_pending_arcs(index)
+            self._graph_stale = True
+        else:
+            editor.update(rel_id, strength, rel_type, None, description)
+            if strength is not None or rel_type is not None:
+                graph = self.relationship_graph
+                type_id = None if rel_type is None else editor.type_id(rel_type)
+                if self._graph_stale or (type_id is not None and type_id >= len(graph.type_names)):
+                    self._graph_stale = True
+                else:
+                    graph.patch_relationship(index, strength, type_id)
+                    self._patch_relationship_weight(index)
+                self._ppr_matrix = None
+                self._influence_tables = {}
+            self._graph = None
+            self._reverse_graph = None
+        self.graph_edits += 1
+        return editor[index]
+    
+    def _get_editor(self) -> RelationshipEditor:
+        if self._editor is None:
+            self._editor = RelationshipEditor(self.relationship_graph)
+            # Attribute lookups (descriptions, legacy adjacency lists) see the edits
+            self.relationship_graph.relationships = self._editor
+            self.relationships = self._editor
+        return self._editor
+    
+    def _apply_edits(self):
+        """Rebuild the CSR graph after edits that added or removed arcs."""
+        if not self._graph_stale:
+            return
+        self.relationship_graph = self._editor.build()
+        # Models whose last relationship was removed drop out, as on a reload
+        nodes = self.relationship_graph.nodes
+        self.all_models = {nodes[node] for node in np.flatnonzero(self.relationship_graph.degree()).tolist()}
+        self._graph = None
+        self._reverse_graph = None
+        self._traversal = None
+        self._traversal_arrays = None
+        self._ppr_matrix = None
+        self._influence_tables = {}
+        self._pending_in = defaultdict(list)
+        self._graph_stale = False
+    
+    def _add_pending_arcs(self, index: int):
+        """Record a relationship's arcs as incoming arcs until the next rebuild (for invalidation)."""
+        editor = self._editor
+        src, dst = int(editor.column('src')[index]), int(editor.column('dst')[index])
+        self._pending_in[dst].append(src)
+        if editor.expand_bidirectional and editor.column('direction')[index] == BIDIRECTIONAL:
+            self._pending_in[src].append(dst)
+    
+    def _shift_centrality(self, index: int, sign: int):
+        """Add (sign=1) or remove (sign=-1) one relationship's arcs from degree centrality."""
+        if self._centrality_data or self.centrality_measure != 'degree':
+            # Given or precomputed measures keep their values until the next reload
+            return
+        editor = self._editor
+        arcs = 2 if editor.expand_bidirectional and editor.column('direction')[index] == BIDIRECTIONAL else 1
+        codes = [editor.nodes[editor.column('src')[index]], editor.nodes[editor.column('dst')[index]]]
+        previous = {code: self.centrality.get(code, 0) for code in codes}
+        for code in codes:
+            self.centrality[code] = self.centrality.get(code, 0) + sign * arcs
+        for code in codes:
+            if not self.centrality.get(code, 1):
+                # No relationships left: the model leaves the graph
+                del self.centrality[code]
+                self.normalized_centrality.pop(code, None)
+        
+        max_degree = self._max_degree
+        if sign > 0:
+            max_degree = max([max_degree] + [self.centrality[code] for code in codes])
+        elif max_degree in previous.values():
+            # The (or a) most connected model lost arcs
+            max_degree = max(self.centrality.values(), default=1.0)
+        if max_degree != self._max_degree:
+            # Every node weight changes with the maximum degree
+            self._normalize_centrality()
+            self._traversal = None
+            self._traversal_arrays = None
+            self._result_cache.clear()
+            return
+        for code in codes:
+            if code in self.centrality:
+                self.normalized_centrality[code] = self.centrality[code] / max_degree if max_degree > 0 else 0.0
+    
+    def _patch_relationship_weight(self, index: int):
+        """Update one relationship's weight in the built scoring arrays (same product as when building them)."""
+        graph = self.relationship_graph
+        weight = (float(graph.rel_strength[index])
+                  * self.TYPE_WEIGHTS.get(graph.type_names[graph.rel_type[index]], 0.5)
+                  * self.DIRECTION_WEIGHTS.get(graph.direction_names[graph.rel_direction[index]], 1.0))
+        if self._traversal is not None:
+            self._traversal[3][index] = weight
+        if self._traversal_arrays is not None:
+            self._traversal_arrays[4][index] = weight
+    
+    def _upstream_distances(self, nodes: List[int], depth: int) -> np.ndarray:
+        """
+        Hops from each model to the nearest of nodes over incoming arcs (pending
+        ones included), depth + 1 where it is farther than depth.
+        """
+        reverse = self.relationship_graph.reverse
+        num_nodes = self.relationship_graph.num_nodes
+        distances = np.full(len(self._editor.nodes), depth + 1, dtype=np.int64)
+        frontier = np.unique(np.asarray(nodes, dtype=np.int64))
+        distances[frontier] = 0
+        for hop in range(1, depth + 1):
+            built = frontier[frontier < num_nodes]
+            sources = reverse.neighbors[_frontier_arcs(reverse.offsets, built)]
+            pending = [source for node in frontier.tolist() for source in self._pending_in.get(node, [])]
+            if pending:
+                sources = np.concatenate((sources, pending))
+            frontier = sources[distances[sources] > hop]
+            frontier = frontier[_first_occurrences(frontier, len(distances))]
+            if not len(frontier):
+                break
+            distances[frontier] = hop
+        return distances
+    
+    def _invalidate_results(self, models: Set[str]) -> int:
+        """
+        Drop cached results an edit touching these models can change.
+        
+        A result changes only if one of its primaries reaches an edited model
+        within its max_hops, or it is a PPR result (PageRank is global).
+        """
+        if not self._result_cache:
+            return 0
+        node_ids = self._editor.node_ids
+        depth = max(key[4] for key in self._result_cache)
+        distances = self._upstream_distances([node_ids[model] for model in models if model in node_ids], depth)
+        stale = [
+            key for key in self._result_cache
+            if key[1] == 'ppr' or any(
+                code in models or (code in node_ids and distances[node_ids[code]] <= key[4])
+                for code in key[2]
+            )
+        ]
+        for key in stale:
+            del self._result_cache[key]
+        return len(stale)
+    
+    def _build_adjacency_lists(self) -> Tuple[Dict, Dict]:
+        """Materialize dict-of-lists views of the CSR graph (one rel_data dict per relationship)."""
+        rel_data = [
+            {
+                'type': rel['type'],
+                'strength': rel['strength'],
+                'direction': rel['direction'],
+                'description': rel.get('description', '')
+            }
+            for rel in self.relationship_graph.relationships
+        ]
+        nodes = self.relationship_graph.nodes
+        adjacency = []
+        for view in (self.relationship_graph.forward, self.relationship_graph.reverse):
+            lists = defaultdict(list)
+            offsets = view.offsets.tolist()
+            neighbors = view.neighbors.tolist()
+            rel_index = view.rel_index.tolist()
+            for node, model in enumerate(nodes):
+                start, end = offsets[node], offsets[node + 1]
+                if start < end:
+                    lists[model] = [
+                        (nodes[target], rel_data[index])
+                        for target, index in zip(neighbors[start:end], rel_index[start:end])
+                    ]
+            adjacency.append(lists)
+        return adjacency[0], adjacency[1]
+    
     def _compute_degree_centrality(self) -> Dict[str, int]:
-        """Compute degree centrality for each model."""
-        centrality = {}
-        for model in self.all_models:
-            # Total degree (in + out)
-            out_degree = len(self.graph.get(model, []))
-            in_degree = len(self.reverse_graph.get(model, []))
-            centrality[model] = out_degree + in_degree
-        return centrality
+        """Compute degree centrality (in + out arcs) for each model."""
+        degree = self.relationship_graph.degree().tolist()
+        node_ids = self.relationship_graph.node_ids
+        return {model: degree[node_ids[model]] for model in self.all_models}
     
     def _detect_primaries_from_text(self, problem_text: str) -> List[str]:
+        """Detect primary models from problem text using the configured detector."""
+        if self.detector == 'keywords':
+            return self._detect_primaries_keywords(problem_text)
+        if self.detector == 'bm25':
+            return self._detect_primaries_bm25(problem_text)
+        
+        # Hybrid: explicit keyword hits first, BM25 fills the remaining slots
+        primaries = self._detect_primaries_keywords(problem_text)
+        for model in self._detect_primaries_bm25(problem_text, limit=self.MAX_DETECTED_PRIMARIES * 2):
+            if len(primaries) >= self.MAX_DETECTED_PRIMARIES:
+                break
+            if model not in primaries:
+                primaries.append(model)
+        return primaries
+    
+    def _get_search_index(self):
+        """Load (or build) the BM25 model index on first use."""
+        if self._search_index is None:
+            from model_search import load_or_build_index
+            self._search_index = load_or_build_index(index_path=self.search_index_path)
+        return self._search_index
+    
+    def _get_keyword_matcher(self):
+        """Load (or compile) the KEYWORD_MAP automaton on first use."""
+        if self._keyword_matcher is None:
+            from keyword_matcher import load_or_build_matcher
+            self._keyword_matcher = load_or_build_matcher(list(self.KEYWORD_MAP), boundary='prefix')
+        return self._keyword_matcher
+    
+    def _detect_primaries_bm25(self, problem_text: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Detect primary models by BM25 ranking of model descriptions and examples.
+        
+        Only models present in the relationships graph are returned.
+        """
+        limit = limit or self.MAX_DETECTED_PRIMARIES
+        index = self._get_search_index()
+        # Over-fetch so models missing from the graph don't starve the result
+        ranked = index.search(problem_text, top_k=limit + 10)
+        return [code for code, _ in ranked if code in self.all_models][:limit]
+    
+    def _detect_primaries_keywords(self, problem_text: str) -> List[str]:
         """
         Detect primary models from problem text using keyword matching.
         
-        This is a simple implementation. Could be enhanced with NLP in the future.
+        All KEYWORD_MAP keywords are found in one scan of the text; hits are
+        taken in KEYWORD_MAP order. Could be enhanced with NLP in the future.
         """
-        problem_lower = problem_text.lower()
         primaries = []
-        
-        # Keyword mappings (basic - could be expanded)
-        keyword_map = {
-            # Bottleneck/failure related
-            'bottleneck': ['DE07'],
-            'failure': ['DE06', 'IN02'],
-            'error': ['DE06'],
-            'breakdown': ['DE06'],
-            
-            # System/composition related
-            'system': ['SY01'],
-            'architecture': ['CO01', 'CO09'],
-            'service': ['CO09'],
-            'microservice': ['CO09'],
-            'composition': ['CO01'],
-            'integration': ['CO05'],
-            
-            # Pipeline/flow related
-            'pipeline': ['CO03'],
-            'flow': ['CO03', 'DE08'],
-            'queue': ['CO12'],
-            'buffer': ['CO12'],
-            
-            # Cascade/effect related
-            'cascade': ['SY04'],
-            'effect': ['SY04', 'P09'],
-            'second-order': ['SY04', 'IN06'],
-            
-            # Feedback/recursion related
-            'feedback': ['RE06'],
-            'loop': ['RE06'],
-            'iteration': ['RE09', 'RE03'],
-            
-            # Perspective related
-            'perspective': ['P02'],
-            'stakeholder': ['P02'],
-            'viewpoint': ['P02', 'P03'],
-            
-            # Inversion related
-            'inversion': ['IN01'],
-            'invert': ['IN01'],
-            'premortem': ['IN02'],
-            
-            # Decomposition related
-            'decompose': ['DE01'],
-            'break down': ['DE01'],
-            'component': ['DE02'],
-        }
-        
-        for keyword, models in keyword_map.items():
-            if keyword in problem_lower:
-                primaries.extend(models)
+        for keyword in self._get_keyword_matcher().matched(problem_text):
+            primaries.extend(self.KEYWORD_MAP[keyword])
         
         # Remove duplicates while preserving order
         seen = set()
@@ -176,7 +660,7 @@ class SY19Recommender:
                 seen.add(model)
                 unique_primaries.append(model)
         
-        return unique_primaries[:3]  # Top 3 detected primaries
+        return unique_primaries[:self.MAX_DETECTED_PRIMARIES]  # Top 3 detected primaries
     
     def recommend_models(
         self,
@@ -197,6 +681,107 @@ class SY19Recommender:
         Returns:
             List of recommended models with scores and reasons
         """
+        primaries = self._resolve_primaries(problem_text, primaries)
+        self.refresh()
+        
+        # Results depend on primary order (summation order, reasons, ties), so the key keeps it
+        key = (self.graph_version, self.engine, tuple(primaries), top_k, max_hops, self._scoring_constants)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return _copy_recommendations(cached)
+        
+        sources = self._source_nodes(primaries)
+        if self.engine == 'influence':
+            ranked = self._rank_records(sources, self.influence_table(max_hops).rows(sources), top_k)
+        elif self.engine == 'vectorized':
+            ranked = self._rank_vectorized(sources, max_hops, top_k)
+        elif self.engine == 'ppr':
+            ranked = self._rank_ppr(sources, top_k)
+        else:
+            ranked = self._rank_bfs(sources, max_hops, top_k)
+        recommendations = self._build_recommendations(sources, ranked)
+        self._cache_put(key, recommendations)
+        return _copy_recommendations(recommendations) if self.cache_size > 0 else recommendations
+    
+    def _cache_get(self, key: Tuple) -> Optional[List[Dict]]:
+        entry = self._result_cache.get(key)
+        if entry is not None:
+            stored_at, recommendations = entry
+            if self.cache_ttl is None or time.monotonic() - stored_at <= self.cache_ttl:
+                self._result_cache.move_to_end(key)
+                self.cache_hits += 1
+                return recommendations
+            del self._result_cache[key]
+        self.cache_misses += 1
+        return None
+    
+    def _cache_put(self, key: Tuple, recommendations: List[Dict]):
+        if self.cache_size <= 0:
+            return
+        self._result_cache[key] = (time.monotonic(), recommendations)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > self.cache_size:
+            self._result_cache.popitem(last=False)
+    
+    def recommend_batch(
+        self,
+        problems: Sequence[str],
+        primaries: Optional[Sequence[Optional[List[str]]]] = None,
+        top_k: int = 7,
+        max_hops: int = 2
+    ) -> List[List[Dict]]:
+        """
+        Recommend models for many problems at once.
+        
+        Primaries are detected for every problem first; problems that share a
+        primary list are scored once, and each distinct primary is propagated
+        once and its records reused by every list containing it. Results are
+        identical to calling recommend_models() per problem.
+        
+        Args:
+            problems: Problem descriptions
+            primaries: Optional explicit primaries per problem (None entries are detected)
+            top_k: Number of models to return per problem
+            max_hops: Maximum graph distance to traverse from primaries
+            
+        Returns:
+            One recommendation list per problem, in input order
+        """
+        if primaries is None:
+            primaries = [None] * len(problems)
+        elif len(primaries) != len(problems):
+            raise ValueError(f"Got {len(primaries)} primary lists for {len(problems)} problems")
+        
+        resolved = [
+            tuple(self._resolve_primaries(problem, explicit))
+            for problem, explicit in zip(problems, primaries)
+        ]
+        self.refresh()
+        source_records = {}
+        by_primaries = {}
+        for key in dict.fromkeys(resolved):
+            sources = self._source_nodes(key)
+            if self.engine == 'ppr':
+                by_primaries[key] = self._build_recommendations(sources, self._rank_ppr(sources, top_k))
+                continue
+            if self.engine == 'influence':
+                records = self.influence_table(max_hops).rows(sources)
+            else:
+                records = self._propagate(sources, max_hops, source_records)
+            by_primaries[key] = self._build_recommendations(sources, self._rank_records(sources, records, top_k))
+        
+        # Problems sharing primaries get their own copies of the shared result
+        return [_copy_recommendations(by_primaries[key]) for key in resolved]
+    
+    def influence_table(self, max_hops: int):
+        """Precomputed influence table for max_hops (loaded or built on first use, then persisted)."""
+        if max_hops not in self._influence_tables:
+            from sy19_influence import load_or_build_table
+            self._influence_tables[max_hops] = load_or_build_table(self, max_hops, self.influence_dir)
+        return self._influence_tables[max_hops]
+    
+    def _resolve_primaries(self, problem_text: str, primaries: Optional[Sequence[str]]) -> List[str]:
+        """Explicit primaries, else detected ones, else the top two hub models."""
         # Detect or use provided primaries
         if primaries is None:
             primaries = self._detect_primaries_from_text(problem_text)
@@ -210,106 +795,388 @@ class SY19Recommender:
             )
             primaries = [model for model, _ in sorted_centrality[:2]]
         
-        # Score all models by walking from primaries
-        model_scores = defaultdict(float)
-        model_reasons = defaultdict(list)  # Track why each model was recommended
-        
-        for primary in primaries:
-            if primary not in self.all_models:
-                continue
-            
-            # Give primary a boost (ensures it stays in top-K)
-            model_scores[primary] += self.PRIMARY_BOOST
-            model_reasons[primary].append(f"Primary model ({primary})")
-            
-            # Also score primary from its own outgoing relationships (self-recommendation)
-            for target, rel_data in self.graph.get(primary, []):
-                # Score the primary itself from its relationships (for centrality)
-                type_weight = self.TYPE_WEIGHTS.get(rel_data['type'], 0.5)
-                strength = rel_data['strength']
-                direction_weight = self.DIRECTION_WEIGHTS.get(rel_data['direction'], 1.0)
-                centrality_weight = 1.0 + self.ALPHA * self.normalized_centrality.get(primary, 0.0)
-                
-                # Primary gets a base score from its relationships (reduced since it's hop 0)
-                base_score = strength * type_weight * direction_weight * centrality_weight * 0.5
-                model_scores[primary] += base_score
-            
-            # BFS from primary
-            queue = [(primary, 0, [primary])]  # (current_model, hop, path)
-            visited = {primary}
-            
-            while queue:
-                current_model, hop, path = queue.pop(0)
-                
-                if hop >= max_hops:
-                    continue
-                
-                # Consider outgoing relationships
-                for target, rel_data in self.graph.get(current_model, []):
-                    if target in visited:
-                        continue
-                    
-                    # Calculate edge score
-                    type_weight = self.TYPE_WEIGHTS.get(rel_data['type'], 0.5)
-                    strength = rel_data['strength']
-                    direction_weight = self.DIRECTION_WEIGHTS.get(rel_data['direction'], 1.0)
-                    centrality_weight = 1.0 + self.ALPHA * self.normalized_centrality.get(target, 0.0)
-                    hop_decay = self.HOP_DECAY ** hop
-                    
-                    edge_score = strength * type_weight * direction_weight * centrality_weight * hop_decay
-                    
-                    # Add to target model score
-                    model_scores[target] += edge_score
-                    model_reasons[target].append(
-                        f"Via {current_model} → {target} ({rel_data['type']}, strength={strength:.2f})"
-                    )
-                    
-                    # Add to queue for next hop
-                    if hop + 1 < max_hops:
-                        queue.append((target, hop + 1, path + [target]))
-                        visited.add(target)
-        
-        # Ensure all primaries are included (even if score is 0)
-        for primary in primaries:
-            if primary in self.all_models and primary not in model_scores:
-                model_scores[primary] = self.PRIMARY_BOOST
-                model_reasons[primary] = [f"Primary model ({primary})"]
-        
-        # Sort by score and return top-K
-        scored_models = [
+        return list(primaries)
+    
+    def _source_nodes(self, primaries: Sequence[str]) -> List[int]:
+        """Node IDs of the primaries in the graph (unknown primaries are skipped)."""
+        node_ids = self.relationship_graph.node_ids
+        return [node_ids[primary] for primary in primaries if primary in self.all_models]
+    
+    def _build_recommendations(self, sources: List[int], ranked: List[Tuple[int, float, List]]) -> List[Dict]:
+        """Recommendation dicts for ranked (node, score, reason parents); reasons only for these."""
+        nodes = self.relationship_graph.nodes
+        primary_nodes = set(sources)
+        return [
             {
-                'model': model,
+                'model': nodes[node],
                 'score': score,
-                'reasons': model_reasons[model][:3] if model_reasons[model] else ["Direct recommendation"],
-                'centrality': self.centrality.get(model, 0),
-                'is_primary': model in primaries
+                'reasons': self._format_reasons(node, parents) or ["Direct recommendation"],
+                'centrality': self.centrality.get(nodes[node], 0),
+                'is_primary': node in primary_nodes
             }
-            for model, score in model_scores.items()
+            for node, score, parents in ranked
         ]
+    
+    def _rank_bfs(self, sources: List[int], max_hops: int, top_k: int) -> List[Tuple[int, float, List]]:
+        """Top-K (node, score, reason parents) from the multi-source BFS engine."""
+        records = self._traverse(sources, max_hops)
+        model_scores = self._merge_scores(records)
+        
+        # Top-K by score (descending), primaries first; nlargest keeps first-scored order for ties
+        primary_nodes = set(sources)
+        ranked = heapq.nlargest(
+            top_k,
+            model_scores.items(),
+            key=lambda item: (item[0] in primary_nodes, item[1])
+        )
+        model_reasons = self._collect_parents(records, [node for node, _ in ranked])
+        return [(node, score, model_reasons[node]) for node, score in ranked]
+    
+    def _traversal_lists(self) -> Tuple[List[int], List[int], List[int], List[float], List[float]]:
+        """
+        Flat Python lists for the BFS engine (built on first use).
         
-        # Sort by score (descending), but prioritize primaries
-        def sort_key(x):
-            # Primaries get priority in sorting
-            if x['is_primary']:
-                return (1, x['score'])
-            return (0, x['score'])
+        Returns (offsets, neighbors, arc_rel, rel_weight, node_weight): forward CSR
+        arcs, strength * type weight * direction weight per relationship, and
+        1 + ALPHA * normalized centrality per node.
+        """
+        if self._traversal is None:
+            graph = self.relationship_graph
+            type_weights = [self.TYPE_WEIGHTS.get(name, 0.5) for name in graph.type_names]
+            direction_weights = [self.DIRECTION_WEIGHTS.get(name, 1.0) for name in graph.direction_names]
+            rel_weight = [
+                strength * type_weights[rel_type] * direction_weights[direction]
+                for strength, rel_type, direction in zip(
+                    graph.rel_strength.tolist(), graph.rel_type.tolist(), graph.rel_direction.tolist())
+            ]
+            node_weight = [
+                1.0 + self.ALPHA * self.normalized_centrality.get(model, 0.0) for model in graph.nodes
+            ]
+            self._traversal = (graph.forward.offsets.tolist(), graph.forward.neighbors.tolist(),
+                               graph.forward.rel_index.tolist(), rel_weight, node_weight)
+        return self._traversal
+    
+    def _traverse(self, sources: List[int], max_hops: int) -> List[List[Tuple[int, float, int, int]]]:
+        """
+        Multi-source BFS from all primaries in one pass.
         
-        scored_models.sort(key=sort_key, reverse=True)
+        Queue entries carry their source index and each node keeps a bitmask of
+        the sources that have visited it, so every source sees exactly its own
+        BFS (visited per primary). Scored arcs are recorded per source as
+        (node, score, parent, relationship) parent pointers instead of paths.
+        """
+        offsets, neighbors, arc_rel, rel_weight, node_weight = self._traversal_lists()
+        records = [[] for _ in sources]
+        visited: Dict[int, int] = {}
+        queue = deque()
         
-        # Return top-K, but ensure all primaries are included
-        result = scored_models[:top_k]
-        primary_models = [m for m in scored_models if m['is_primary']]
+        for index, primary in enumerate(sources):
+            # Primary boost, plus a base score from its own outgoing relationships (hop 0)
+            own = records[index]
+            own.append((primary, self.PRIMARY_BOOST, PRIMARY_PARENT, -1))
+            primary_weight = node_weight[primary]
+            for arc in range(offsets[primary], offsets[primary + 1]):
+                own.append((primary, rel_weight[arc_rel[arc]] * primary_weight * 0.5, NO_PARENT, -1))
+            visited[primary] = visited.get(primary, 0) | (1 << index)
+            queue.append((primary, 0, index))
         
-        # Ensure primaries are in result
-        for primary in primary_models:
-            if primary not in result:
-                result.append(primary)
-                result = result[:top_k]  # Re-trim if needed
+        while queue:
+            current, hop, index = queue.popleft()
+            if hop >= max_hops:
+                continue
+            bit = 1 << index
+            own = records[index]
+            hop_decay = self.HOP_DECAY ** hop
+            expand = hop + 1 < max_hops
+            for arc in range(offsets[current], offsets[current + 1]):
+                target = neighbors[arc]
+                seen = visited.get(target, 0)
+                if seen & bit:
+                    continue
+                rel = arc_rel[arc]
+                own.append((target, rel_weight[rel] * node_weight[target] * hop_decay, current, rel))
+                if expand:
+                    queue.append((target, hop + 1, index))
+                    visited[target] = seen | bit
         
-        # Re-sort final result
-        result.sort(key=sort_key, reverse=True)
+        return records
+    
+    @staticmethod
+    def _merge_scores(records: List[List[Tuple[int, float, int, int]]]) -> Dict[int, float]:
+        """
+        Sum traversal records into node -> score (dict order is first-scored order).
         
-        return result[:top_k]
+        Sources are merged in primary order, so sums and tie order are the same
+        as scoring one primary after another.
+        """
+        scores: Dict[int, float] = {}
+        for own in records:
+            for node, score, _, _ in own:
+                scores[node] = scores.get(node, 0.0) + score
+        return scores
+    
+    @staticmethod
+    def _collect_parents(records: List[List[Tuple[int, float, int, int]]],
+                         nodes: List[int]) -> Dict[int, List[Tuple[int, int]]]:
+        """First three (parent, relationship) pointers of each given node, in record order"""
+        parents = {node: [] for node in nodes}
+        for own in records:
+            for node, _, parent, rel in own:
+                if parent != NO_PARENT:
+                    node_parents = parents.get(node)
+                    if node_parents is not None and len(node_parents) < 3:
+                        node_parents.append((parent, rel))
+        return parents
+    
+    def _vectorized_arrays(self) -> Tuple[np.ndarray, ...]:
+        """
+        NumPy counterparts of _traversal_lists() (same products, so same float64 values).
+        
+        Returns (offsets, neighbors, arc_rel, arc_source, rel_weight, node_weight).
+        """
+        if self._traversal_arrays is None:
+            graph = self.relationship_graph
+            type_weights = np.array([self.TYPE_WEIGHTS.get(name, 0.5) for name in graph.type_names])
+            direction_weights = np.array([self.DIRECTION_WEIGHTS.get(name, 1.0) for name in graph.direction_names])
+            rel_weight = graph.rel_strength * type_weights[graph.rel_type] * direction_weights[graph.rel_direction]
+            node_weight = 1.0 + self.ALPHA * np.array(
+                [self.normalized_centrality.get(model, 0.0) for model in graph.nodes], dtype=np.float64)
+            self._traversal_arrays = (graph.forward.offsets, graph.forward.neighbors, graph.forward.rel_index,
+                                      graph.forward.sources(), rel_weight, node_weight)
+        return self._traversal_arrays
+    
+    def _propagate(self, sources: List[int], max_hops: int,
+                   cache: Optional[Dict[int, Tuple]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized equivalent of _traverse(): level-synchronous propagation over the CSR arrays.
+        
+        Each level gathers the frontier's arcs in BFS queue order and drops
+        targets the source has already visited. Below max_hops only the first arc
+        into each new node scores (it marks the node visited, as in the BFS);
+        on the last level every remaining arc scores. Returns the concatenated
+        records (node, score, arc) in the order the BFS produces them, primary
+        by primary; arc is the scoring arc or PRIMARY_PARENT / NO_PARENT.
+        
+        Records depend only on the primary and max_hops; with a cache dict
+        (primary -> records, for one max_hops) each primary is propagated once.
+        """
+        offsets, neighbors, arc_rel, _, rel_weight, node_weight = self._vectorized_arrays()
+        visited = np.zeros(len(node_weight), dtype=bool)
+        chunks = []
+        
+        for primary in sources:
+            if cache is not None and primary in cache:
+                chunks.extend(cache[primary])
+                continue
+            first_chunk = len(chunks)
+            # Primary boost, plus a base score from its own outgoing relationships (hop 0)
+            own_arcs = np.arange(offsets[primary], offsets[primary + 1])
+            chunks.append((
+                np.full(len(own_arcs) + 1, primary, dtype=np.int64),
+                np.concatenate(([self.PRIMARY_BOOST], rel_weight[arc_rel[own_arcs]] * node_weight[primary] * 0.5)),
+                np.concatenate(([PRIMARY_PARENT], np.full(len(own_arcs), NO_PARENT, dtype=np.int64))),
+            ))
+            
+            frontier = np.array([primary], dtype=np.int64)
+            discovered = [frontier]
+            visited[primary] = True
+            for hop in range(max_hops):
+                arcs = _frontier_arcs(offsets, frontier)
+                targets = neighbors[arcs]
+                keep = ~visited[targets]
+                arcs, targets = arcs[keep], targets[keep]
+                if hop + 1 < max_hops:
+                    # First arc into each node wins; winners are the next frontier in queue order
+                    first = _first_occurrences(targets, len(node_weight))
+                    arcs, targets = arcs[first], targets[first]
+                    visited[targets] = True
+                    discovered.append(targets)
+                    frontier = targets
+                scores = rel_weight[arc_rel[arcs]] * node_weight[targets] * self.HOP_DECAY ** hop
+                chunks.append((targets.astype(np.int64), scores, arcs))
+                if not len(frontier):
+                    break
+            
+            for nodes in discovered:
+                visited[nodes] = False
+            if cache is not None:
+                cache[primary] = chunks[first_chunk:]
+        
+        if not chunks:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, np.zeros(0), empty
+        return tuple(np.concatenate(column) for column in zip(*chunks))
+    
+    def _rank_vectorized(self, sources: List[int], max_hops: int, top_k: int) -> List[Tuple[int, float, List]]:
+        """Top-K (node, score, reason parents) from the vectorized engine."""
+        return self._rank_records(sources, self._propagate(sources, max_hops), top_k)
+    
+    def _rank_records(self, sources: List[int], records: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                      top_k: int) -> List[Tuple[int, float, List]]:
+        """
+        Top-K (node, score, reason parents) from concatenated (node, score, arc) records.
+        
+        Records come from _propagate(), or from influence table rows, where arc
+        is a (records, k) array of each entry's first reason arcs.
+        """
+        record_nodes, record_scores, record_arcs = records
+        if not len(record_nodes) or top_k <= 0:
+            return []
+        
+        # bincount adds records in order, so sums match the BFS engine bit for bit
+        scores = np.bincount(record_nodes, weights=record_scores, minlength=self.relationship_graph.num_nodes)
+        # Touched nodes in first-scored order; the stable sort keeps that order for ties
+        touched = record_nodes[_first_occurrences(record_nodes, len(scores))]
+        top = touched[_top_k_positions(scores[touched], np.isin(touched, sources), top_k)]
+        
+        # First three reason records per top node, in record order
+        if record_arcs.ndim == 2:
+            record_nodes = np.repeat(record_nodes, record_arcs.shape[1])
+            record_arcs = record_arcs.ravel()
+        selected = np.flatnonzero((record_arcs != NO_PARENT) & np.isin(record_nodes, top))
+        selected = selected[np.argsort(record_nodes[selected], kind='stable')]
+        group_nodes = record_nodes[selected]
+        selected = selected[np.arange(len(selected)) - np.searchsorted(group_nodes, group_nodes) < 3]
+        _, _, arc_rel, arc_source, _, _ = self._vectorized_arrays()
+        parents = defaultdict(list)
+        for node, arc in zip(record_nodes[selected].tolist(), record_arcs[selected].tolist()):
+            if arc == PRIMARY_PARENT:
+                parents[node].append((PRIMARY_PARENT, -1))
+            else:
+                parents[node].append((int(arc_source[arc]), int(arc_rel[arc])))
+        
+        return [(node, float(scores[node]), parents[node]) for node in top.tolist()]
+    
+    def _ppr_transition(self) -> Tuple:
+        """
+        Transition matrix for personalized PageRank (built on first use).
+        
+        A walker at a model follows one of its forward arcs with probability
+        proportional to strength * type weight * direction weight. Returns
+        (matrix, out_weight, dangling): the scipy.sparse CSR matrix with
+        matrix[target, source] = P(source -> target), each node's total
+        outgoing weight, and the mask of nodes without outgoing weight (their
+        columns are empty).
+        """
+        if self._ppr_matrix is None:
+            from scipy import sparse
+            num_nodes = self.relationship_graph.num_nodes
+            _, neighbors, arc_rel, arc_source, rel_weight, _ = self._vectorized_arrays()
+            arc_weight = rel_weight[arc_rel]
+            out_weight = np.bincount(arc_source, weights=arc_weight, minlength=num_nodes)
+            dangling = out_weight <= 0
+            probability = arc_weight / np.where(dangling, 1.0, out_weight)[arc_source]
+            matrix = sparse.csr_matrix((probability, (neighbors, arc_source)), shape=(num_nodes, num_nodes))
+            self._ppr_matrix = (matrix, out_weight, dangling)
+        return self._ppr_matrix
+    
+    def personalized_pagerank(self, sources: List[int]) -> np.ndarray:
+        """
+        Personalized PageRank vector restarting uniformly at the given primaries.
+        
+        Power iteration y <- d * P y + (1 - d) * v until the L1 change drops
+        below PPR_TOLERANCE; mass reaching models without outgoing arcs is
+        dropped and y is normalized at the end, which equals PageRank with
+        dangling mass sent back to the primaries. y is linear in v, so the
+        converged y is kept per primary set (LRU, PPR_CACHE_SIZE; after live
+        graph edits only as a warm start) and a new set starts from the mean
+        of its primaries' cached vectors: exact when every primary has been
+        seen alone, close when it appeared in another set.
+        self.ppr_iterations reports the iterations of the last call.
+        """
+        key = tuple(sorted(sources))
+        cached = self._ppr_vectors.get(key)
+        if cached is not None and cached[2] == self.graph_edits:
+            self._ppr_vectors.move_to_end(key)
+            self.ppr_iterations = 0
+            return cached[1]
+        
+        matrix, _, _ = self._ppr_transition()
+        damping = self.PPR_DAMPING
+        restart = (1.0 - damping) * np.bincount(sources, minlength=matrix.shape[0]) / len(sources)
+        rank = self._ppr_warm_start(sources, restart)
+        iteration = 0
+        for iteration in range(1, self.PPR_MAX_ITERATIONS + 1):
+            next_rank = damping * (matrix @ rank) + restart
+            change = np.abs(next_rank - rank).sum()
+            rank = next_rank
+            if change < self.PPR_TOLERANCE:
+                break
+        self.ppr_iterations = iteration
+        
+        normalized = rank / rank.sum()
+        self._ppr_vectors[key] = (rank, normalized, self.graph_edits)
+        self._ppr_vectors.move_to_end(key)
+        while len(self._ppr_vectors) > self.PPR_CACHE_SIZE:
+            self._ppr_vectors.popitem(last=False)
+        return normalized
+    
+    def _ppr_warm_start(self, sources: List[int], restart: np.ndarray) -> np.ndarray:
+        """
+        Mean over primaries of their best cached vector: their own, else the
+        smallest cached set containing them, else their restart term alone.
+        """
+        estimates = []
+        for source in sources:
+            best_key = None
+            for key in self._ppr_vectors:
+                if source in key and (best_key is None or len(key) < len(best_key)):
+                    best_key = key
+            if best_key is not None:
+                # Vectors from before live edits are still close; models added since start at 0
+                estimate = self._ppr_vectors[best_key][0]
+                if len(estimate) < len(restart):
+                    estimate = np.concatenate((estimate, np.zeros(len(restart) - len(estimate))))
+                estimates.append(estimate)
+            else:
+                estimate = np.zeros(len(restart))
+                estimate[source] = 1.0 - self.PPR_DAMPING
+                estimates.append(estimate)
+        return np.mean(estimates, axis=0)
+    
+    def _rank_ppr(self, sources: List[int], top_k: int) -> List[Tuple[int, float, List]]:
+        """
+        Top-K (node, score, reason parents) by personalized PageRank.
+        
+        Reasons are the in-arcs carrying the most rank into each top node
+        (rank of the source times the arc's transition probability).
+        """
+        if not sources or top_k <= 0:
+            return []
+        rank = self.personalized_pagerank(sources)
+        candidates = np.flatnonzero(rank > 0)
+        top = candidates[_top_k_positions(rank[candidates], np.isin(candidates, sources), top_k)]
+        
+        graph = self.relationship_graph
+        _, out_weight, _ = self._ppr_transition()
+        rel_weight = self._vectorized_arrays()[4]
+        primary_nodes = set(sources)
+        ranked = []
+        for node in top.tolist():
+            parents = [(PRIMARY_PARENT, -1)] if node in primary_nodes else []
+            span = graph.reverse.span(node)
+            in_sources = graph.reverse.neighbors[span]
+            in_rels = graph.reverse.rel_index[span]
+            flow = rank[in_sources] * rel_weight[in_rels] / np.where(out_weight > 0, out_weight, 1.0)[in_sources]
+            for arc in np.argsort(-flow, kind='stable')[:3 - len(parents)].tolist():
+                if flow[arc] > 0:
+                    parents.append((int(in_sources[arc]), int(in_rels[arc])))
+            ranked.append((node, float(rank[node]), parents))
+        return ranked
+    
+    def _format_reasons(self, node: int, parents: List[Tuple[int, int]]) -> List[str]:
+        """Reason strings for a recommended node from its recorded parent pointers"""
+        graph = self.relationship_graph
+        nodes = graph.nodes
+        reasons = []
+        for parent, rel in parents:
+            if parent == PRIMARY_PARENT:
+                reasons.append(f"Primary model ({nodes[node]})")
+            else:
+                rel_type = graph.type_names[graph.rel_type[rel]]
+                strength = float(graph.rel_strength[rel])
+                reasons.append(f"Via {nodes[parent]} → {nodes[node]} ({rel_type}, strength={strength:.2f})")
+        return reasons
     
     def format_recommendations(self, recommendations: List[Dict], problem_text: str) -> str:
         """Format recommendations as readable text."""
@@ -325,7 +1192,10 @@ class SY19Recommender:
         for i, rec in enumerate(recommendations, 1):
             primary_tag = " 🔹 Primary" if rec['is_primary'] else ""
             lines.append(f"{i}. **{rec['model']}** (score: {rec['score']:.3f}){primary_tag}")
-            lines.append(f"   - Centrality: {rec['centrality']} connections")
+            if self.centrality_measure == 'degree' or self._centrality_data:
+                lines.append(f"   - Centrality: {rec['centrality']} connections")
+            else:
+                lines.append(f"   - Centrality: {rec['centrality']:.4g} ({self.centrality_measure})")
             if rec['reasons']:
                 lines.append(f"   - Why: {rec['reasons'][0]}")
             lines.append("")
@@ -333,6 +1203,31 @@ class SY19Recommender:
         return "\n".join(lines)
 
 
+def run_batch(recommender: SY19Recommender, input_path: str, output: Optional[str] = None,
+              primaries: Optional[List[str]] = None, top_k: int = 7, max_hops: int = 2) -> int:
+    """
+    Score a JSONL file of problems with recommend_batch().
+    
+    Each input line is a problem string or an object with 'problem' (and
+    optionally 'primaries'); the output repeats each object with a
+    'recommendations' list added. Returns the number of problems.
+    """
+    records = [
+        record if isinstance(record, dict) else {'problem': record}
+        for record in iter_jsonl(input_path)
+    ]
+    results = recommender.recommend_batch(
+        [record.get('problem', '') for record in records],
+        [record.get('primaries', primaries) for record in records],
+        top_k=top_k,
+        max_hops=max_hops
+    )
+    return write_jsonl(
+        ({**record, 'recommendations': recommendations} for record, recommendations in zip(records, results)),
+        output or sys.stdout
+    )
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -340,8 +1235,15 @@ def main():
     )
     parser.add_argument(
         "problem",
+        nargs="?",
         help="Problem description in natural language"
     )
+    parser.add_argument(
+        "--batch", "-b",
+        metavar="JSONL",
+        help="Score many problems: one problem string or {\"problem\": ..., \"primaries\": [...]} object "
+             "per line; writes JSONL recommendations to --output (default: stdout)"
+    )
     parser.add_argument(
         "--primaries", "-p",
         nargs="+",
@@ -368,12 +1270,43 @@ def main():
         "--output", "-o",
         help="Output file for formatted recommendations (default: stdout)"
     )
+    parser.add_argument(
+        "--detector",
+        choices=SY19Recommender.DETECTORS,
+        default="keywords",
+        help="Primary detection strategy when --primaries is not given (default: keywords)"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=SY19Recommender.ENGINES,
+        default="bfs",
+        help="Scoring engine: Python BFS, vectorized NumPy propagation, precomputed influence rows "
+             "or personalized PageRank (default: bfs)"
+    )
+    parser.add_argument(
+        "--centrality",
+        choices=SY19Recommender.CENTRALITY_MEASURES,
+        default="degree",
+        help="Centrality measure for node weighting; non-degree measures are read from the "
+             "precomputed artifact (see relationships_centrality.py --precompute) (default: degree)"
+    )
     
     args = parser.parse_args()
+    if args.problem is None and args.batch is None:
+        parser.error("a problem description or --batch is required")
+    if args.batch is not None and not Path(args.batch).exists():
+        parser.error(f"batch input not found: {args.batch}")
     
     try:
         # Create recommender
-        recommender = SY19Recommender(args.relationships)
+        recommender = SY19Recommender(args.relationships, detector=args.detector, engine=args.engine,
+                                      centrality_measure=args.centrality)
+        
+        if args.batch:
+            count = run_batch(recommender, args.batch, args.output, args.primaries, args.top, args.max_hops)
+            if args.output:
+                print(f"✓ {count} recommendation sets written to: {args.output}")
+            return
         
         # Get recommendations
         recommendations = recommender.recommend_models(
@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+Long-running SY19 recommendation server (asyncio HTTP/1.1 over TCP or a Unix socket).
+
+Each `sy19_recommend.py` run pays interpreter startup, the JSON parse, graph
+construction and centrality normalization to answer one query. The server
+does that once and keeps the recommender (graph, scoring arrays, result
+cache, keyword automaton) in memory. Connections are keep-alive and
+pipelined requests are answered in order.
+
+Endpoints (JSON responses):
+    GET  /recommend?problem=...&primaries=DE07,DE06&top_k=7&max_hops=2   (max_hops <= MAX_HOPS = 6)
+    POST /recommend         {"problem": ..., "primaries": [...], "top_k": 7, "max_hops": 2}
+    POST /recommend_batch   {"problems": [...], "primaries": [[...] or null, ...], "top_k": 7, "max_hops": 2}
+    GET  /model/<code>      model metadata, centrality and graph neighbors
+    GET  /health            graph size and version
+    GET  /stats             request count and result cache counters
+    POST   /edges           {"from": ..., "to": ..., "type": ..., "strength": ..., "direction": ..., "id": ...}
+    PATCH  /edges/<id>      {"strength": ..., "type": ..., "direction": ..., "description": ...}
+    DELETE /edges/<id>
+
+The /edges routes edit the in-memory graph (SY19Recommender.add_edge and
+friends) without touching relationships.json; only cached results the edit
+can change are dropped. The graph reloads automatically when
+relationships.json or its edit log changes (see SY19Recommender.refresh),
+which replaces live edits. Requests are handled on the event
+loop one at a time, so large batches delay other connections.
+
+Usage:
+    python tools/sy19_server.py --port 8019 --engine vectorized
+    python tools/sy19_server.py --unix /tmp/sy19.sock
+    python tools/sy19_server.py --loadgen --port 8019 --connections 8 --requests 20000 --pipeline 4
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent))
+from sy19_recommend import SY19Recommender
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8019
+
+# Largest accepted request body
+MAX_BODY_BYTES = 16 << 20
+
+# Largest accepted max_hops (each distinct value can build and persist an influence table)
+MAX_HOPS = 6
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    501: 'Not Implemented',
+}
+
+
+class HTTPError(Exception):
+    """Request error answered with status and a JSON {"error": message} body"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _int_param(params: Dict, name: str, default: int, maximum: Optional[int] = None) -> int:
+    value = params.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"'{name}' must be an integer")
+    if maximum is not None and not 0 <= value <= maximum:
+        raise HTTPError(400, f"'{name}' must be between 0 and {maximum}")
+    return value
+
+
+def _string_param(params: Dict, name: str, default: Optional[str] = None) -> Optional[str]:
+    value = params.get(name, default)
+    if value is not None and not isinstance(value, str):
+        raise HTTPError(400, f"'{name}' must be a string")
+    return value
+
+
+def _strength_param(params: Dict) -> Optional[float]:
+    """Relationship strength as a finite float in [0, 1]; None if absent"""
+    value = params.get('strength')
+    if value is None:
+        return None
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        strength = float(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, "'strength' must be a number")
+    if not (math.isfinite(strength) and 0.0 <= strength <= 1.0):
+        raise HTTPError(400, "'strength' must be a finite number between 0 and 1")
+    return strength
+
+
+def _primaries_param(value) -> Optional[List[str]]:
+    """Primaries from a JSON list or a comma-separated query value; None means detect"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [code.strip() for code in value.split(',') if code.strip()] or None
+    if isinstance(value, list) and all(isinstance(code, str) for code in value):
+        return value
+    raise HTTPError(400, "'primaries' must be a list of model codes")
+
+
+class SY19Server:
+    """Routes HTTP requests to one in-memory SY19Recommender"""
+
+    def __init__(self, recommender: SY19Recommender, models_dir: Optional[str] = None):
+        self.recommender = recommender
+        self.models_dir = models_dir
+        self._model_loader = None
+        self.requests_served = 0
+        self.started_at = time.time()
+
+    def _get_model_loader(self):
+        """ModelLoader for /model metadata, created on first use."""
+        if self._model_loader is None:
+            from validate_relationships import ModelLoader
+            self._model_loader = ModelLoader(self.models_dir)
+        return self._model_loader
+
+    def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Dict]:
+        """(status, JSON payload) for one request"""
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+        if method == 'GET':
+            params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        elif method in ('POST', 'PATCH'):
+            try:
+                params = json.loads(body) if body else {}
+            except ValueError as e:
+                raise HTTPError(400, f"Invalid JSON body: {e}")
+            if not isinstance(params, dict):
+                raise HTTPError(400, 'JSON body must be an object')
+        elif method == 'DELETE':
+            params = {}
+        else:
+            raise HTTPError(405, f"Method {method} not allowed")
+
+        if path == '/recommend':
+            return 200, self.recommend(params)
+        if path == '/recommend_batch':
+            if method != 'POST':
+                raise HTTPError(405, '/recommend_batch requires POST')
+            return 200, self.recommend_batch(params)
+        if path.startswith('/model/') and method == 'GET':
+            return 200, self.model(unquote(path[len('/model/'):]))
+        if path == '/health' and method == 'GET':
+            return 200, self.health()
+        if path == '/stats' and method == 'GET':
+            return 200, self.stats()
+        if path == '/edges' and method == 'POST':
+            return 200, self.add_edge(params)
+        if path.startswith('/edges/') and method in ('PATCH', 'DELETE'):
+            return 200, self.edit_edge(method, unquote(path[len('/edges/'):]), params)
+        raise HTTPError(404, f"No route for {method} {path}")
+
+    def recommend(self, params: Dict) -> Dict:
+        problem = params.get('problem', '')
+        if not isinstance(problem, str):
+            raise HTTPError(400, "'problem' must be a string")
+        recommendations = self.recommender.recommend_models(
+            problem,
+            primaries=_primaries_param(params.get('primaries')),
+            top_k=_int_param(params, 'top_k', 7),
+            max_hops=_int_param(params, 'max_hops', 2, MAX_HOPS),
+        )
+        return {'problem': problem, 'recommendations': recommendations}
+
+    def recommend_batch(self, params: Dict) -> Dict:
+        problems = params.get('problems')
+        if not isinstance(problems, list) or not all(isinstance(problem, str) for problem in problems):
+            raise HTTPError(400, "'problems' must be a list of strings")
+        primaries = params.get('primaries')
+        if primaries is not None:
+            if not isinstance(primaries, list) or len(primaries) != len(problems):
+                raise HTTPError(400, "'primaries' must be a list with one entry (or null) per problem")
+            primaries = [_primaries_param(entry) for entry in primaries]
+        results = self.recommender.recommend_batch(
+            problems,
+            primaries,
+            top_k=_int_param(params, 'top_k', 7),
+            max_hops=_int_param(params, 'max_hops', 2, MAX_HOPS),
+        )
+        return {'results': results}
+
+    def model(self, code: str) -> Dict:
+        self.recommender.refresh()
+        graph = self.recommender.relationship_graph
+        record = None
+        try:
+            record = self._get_model_loader().load_model(code)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not load model {code}: {e}", file=sys.stderr)
+        # The loader normalizes codes (DE7 -> DE07); the graph keeps them as written
+        node = graph.node_id(record.code if record is not None else code)
+        if node is None:
+            node = graph.node_id(code)
+        if node is None and record is None:
+            raise HTTPError(404, f"Unknown model {code}")
+
+        payload = record.to_dict() if record is not None else {'code': code}
+        if node is not None:
+            span = graph.forward.span(node)
+            payload['centrality'] = self.recommender.centrality.get(graph.nodes[node], 0)
+            payload['neighbors'] = [
+                {'model': graph.nodes[neighbor], **graph.relationship_attributes(rel)}
+                for neighbor, rel in zip(graph.forward.neighbors[span].tolist(),
+                                         graph.forward.rel_index[span].tolist())
+            ]
+        return payload
+
+    def add_edge(self, params: Dict) -> Dict:
+        missing = [name for name in ('from', 'to', 'type', 'strength') if params.get(name) is None]
+        if missing:
+            raise HTTPError(400, f"Missing field(s): {', '.join(missing)}")
+        from_model, to_model, rel_type = (_string_param(params, name) for name in ('from', 'to', 'type'))
+        strength = _strength_param(params)
+        direction = _string_param(params, 'direction', 'unidirectional')
+        rel_id = _string_param(params, 'id')
+        description = _string_param(params, 'description', '')
+        try:
+            relationship = self.recommender.add_edge(
+                from_model, to_model, rel_type, strength,
+                direction=direction, rel_id=rel_id, description=description,
+            )
+        except (TypeError, ValueError) as e:
+            raise HTTPError(400, str(e))
+        return {'relationship': relationship, 'graph_edits': self.recommender.graph_edits}
+
+    def edit_edge(self, method: str, rel_id: str, params: Dict) -> Dict:
+        try:
+            if method == 'DELETE':
+                relationship = self.recommender.remove_edge(rel_id)
+            else:
+                relationship = self.recommender.update_edge(
+                    rel_id,
+                    strength=_strength_param(params),
+                    rel_type=_string_param(params, 'type'),
+                    direction=_string_param(params, 'direction'),
+                    description=_string_param(params, 'description'),
+                )
+        except KeyError:
+            raise HTTPError(404, f"Unknown relationship {rel_id}")
+        except (TypeError, ValueError) as e:
+            raise HTTPError(400, str(e))
+        return {'relationship': relationship, 'graph_edits': self.recommender.graph_edits}
+
+    def health(self) -> Dict:
+        self.recommender.refresh()
+        graph = self.recommender.relationship_graph
+        return {
+            'status': 'ok',
+            'models': len(self.recommender.all_models),
+            # Removed relationships keep their (inactive) row until the next reload
+            'relationships': graph.num_relationships if graph.rel_active is None else int(graph.rel_active.sum()),
+            'graph_version': self.recommender.graph_version,
+            'graph_edits': self.recommender.graph_edits,
+            'engine': self.recommender.engine,
+            'centrality': self.recommender.centrality_measure,
+        }
+
+    def stats(self) -> Dict:
+        return {
+            'requests': self.requests_served,
+            'uptime_s': round(time.time() - self.started_at, 3),
+            'cache': self.recommender.cache_info(),
+        }
+
+    def respond(self, method: str, target: str, body: bytes) -> Tuple[int, bytes]:
+        """Status and encoded JSON body; errors never escape"""
+        self.requests_served += 1
+        try:
+            status, payload = self.dispatch(method, target, body)
+        except HTTPError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:  # keep serving other requests
+            print(f"❌ {method} {target}: {e!r}", file=sys.stderr)
+            status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+        try:
+            # NaN/Infinity are not JSON; never send them as a malformed body
+            encoded = json.dumps(payload, ensure_ascii=False, allow_nan=False)
+        except ValueError as e:
+            print(f"❌ {method} {target}: {e!r}", file=sys.stderr)
+            status, encoded = 500, json.dumps({'error': f"Response not serializable: {e}"})
+        return status, encoded.encode('utf-8')
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until it closes (keep-alive, pipelining in order)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._write(writer, 400, b'{"error": "Malformed request line"}', False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+                if 'transfer-encoding' in headers:
+                    await self._write(writer, 501, b'{"error": "Chunked bodies are not supported"}', False)
+                    break
+                try:
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    length = -1
+                if length < 0 or length > MAX_BODY_BYTES:
+                    status = 400 if length < 0 else 413
+                    await self._write(writer, status, b'{"error": "Invalid or too large Content-Length"}', False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = self.respond(method.upper(), target, body)
+                await self._write(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, status: int, payload: bytes, keep_alive: bool):
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + payload)
+        await writer.drain()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_path: Optional[str] = None):
+        if unix_path:
+            socket_path = Path(unix_path)
+            if socket_path.is_socket():
+                # Left behind by a previous server that was killed
+                socket_path.unlink()
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_path)
+            where = f"unix:{unix_path}"
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            where = f"http://{host}:{port}"
+        graph = self.recommender.relationship_graph
+        print(f"✅ SY19 server on {where} ({graph.num_nodes} models, {graph.num_relationships} relationships, "
+              f"engine={self.recommender.engine})", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+async def _open_connection(host: str, port: int, unix_path: Optional[str]):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    """Read one response; returns its status code"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Server closed the connection')
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def run_load(host: str, port: int, unix_path: Optional[str], target: str, connections: int,
+                   requests: int, pipeline: int, body: Optional[bytes] = None) -> Dict:
+    """
+    Drive the server with keep-alive connections and report latency percentiles.
+
+    Each connection sends `pipeline` requests back to back and then reads the
+    responses; a request's latency runs from its batch being sent to its
+    response being read.
+    """
+    method = 'POST' if body is not None else 'GET'
+    head = f"{method} {target} HTTP/1.1\r\nHost: {host}\r\n"
+    if body is not None:
+        head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+    request = (head + "\r\n").encode('latin-1') + (body or b'')
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    per_connection = [requests // connections + (i < requests % connections) for i in range(connections)]
+
+    async def worker(count: int):
+        reader, writer = await _open_connection(host, port, unix_path)
+        try:
+            while count > 0:
+                batch = min(pipeline, count)
+                sent_at = time.perf_counter()
+                writer.write(request * batch)
+                await writer.drain()
+                for _ in range(batch):
+                    status = await _read_response(reader)
+                    latencies.append(time.perf_counter() - sent_at)
+                    statuses[status] = statuses.get(status, 0) + 1
+                count -= batch
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(count) for count in per_connection if count))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(fraction: float) -> float:
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+    return {
+        'requests': len(latencies),
+        'seconds': elapsed,
+        'requests_per_s': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(0.50),
+        'p90_ms': percentile(0.90),
+        'p99_ms': percentile(0.99),
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+        'statuses': statuses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SY19 recommendation server and load generator')
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'Bind/connect address (default: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'TCP port (default: {DEFAULT_PORT})')
+    parser.add_argument('--unix', metavar='PATH', help='Serve on (or connect to) a Unix socket instead of TCP')
+    parser.add_argument('--relationships', '-r', default='data/relationships.json',
+                        help='Path to relationships.json (default: data/relationships.json)')
+    parser.add_argument('--models', help='Models directory for /model metadata (default: auto-detect)')
+    parser.add_argument('--engine', choices=SY19Recommender.ENGINES, default='bfs',
+                        help='Scoring engine (default: bfs)')
+    parser.add_argument('--detector', choices=SY19Recommender.DETECTORS, default='keywords',
+                        help='Primary detection strategy (default: keywords)')
+    parser.add_argument('--centrality', choices=SY19Recommender.CENTRALITY_MEASURES, default='degree',
+                        help='Centrality measure for node weighting (default: degree)')
+    parser.add_argument('--cache-size', type=int, default=256,
+                        help='Result cache entries, 0 disables (default: 256)')
+
+    load = parser.add_argument_group('load generator')
+    load.add_argument('--loadgen', action='store_true', help='Benchmark a running server instead of serving')
+    load.add_argument('--connections', '-c', type=int, default=4, help='Concurrent connections (default: 4)')
+    load.add_argument('--requests', '-n', type=int, default=10000, help='Total requests (default: 10000)')
+    load.add_argument('--pipeline', type=int, default=1, help='Requests in flight per connection (default: 1)')
+    load.add_argument('--path', default='/recommend?problem=feedback+loop+in+pipeline',
+                      help='Request target (default: /recommend?problem=feedback+loop+in+pipeline)')
+    load.add_argument('--body', help='JSON body; sends POST requests')
+    args = parser.parse_args()
+
+    if args.loadgen:
+        body = args.body.encode('utf-8') if args.body is not None else None
+        result = asyncio.run(run_load(args.host, args.port, args.unix, args.path, args.connections,
+                                      args.requests, max(1, args.pipeline), body))
+        print(f"📊 {result['requests']} requests in {result['seconds']:.2f}s "
+              f"({result['requests_per_s']:.0f} req/s, {args.connections} connections, "
+              f"pipeline {args.pipeline})")
+        print(f"   p50 {result['p50_ms']:.3f} ms   p90 {result['p90_ms']:.3f} ms   "
+              f"p99 {result['p99_ms']:.3f} ms   max {result['max_ms']:.3f} ms")
+        print(f"   statuses: {result['statuses']}")
+        return
+
+    recommender = SY19Recommender(args.relationships, detector=args.detector, engine=args.engine,
+                                  cache_size=args.cache_size, centrality_measure=args.centrality)
+    try:
+        asyncio.run(SY19Server(recommender, args.models).serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
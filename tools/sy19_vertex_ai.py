@@ -21,6 +21,7 @@ import re
 # Import base SY19 recommender
 sys.path.insert(0, str(Path(__file__).parent))
 from sy19_recommend import SY19Recommender
+from relationships_db import RelationshipStore
 
 # Import ModelLoader for loading model descriptions
 try:
@@ -28,7 +29,7 @@ try:
 except ImportError:
     # Fallback if validate_relationships not available
     class ModelLoader:
-        def __init__(self, models_dir=None):
+        def __init__(self, models_dir=None, snapshot=None):
             self.cache = {}
         def load_model(self, model_code):
             return None
@@ -83,7 +84,7 @@ class SY19VertexAIRecommender(SY19Recommender):
         self.vertex_ai_model = vertex_ai_model
         
         # Load model descriptions
-        self.model_loader = ModelLoader()
+        self.model_loader = ModelLoader(snapshot=True)
         self.model_cache = {}
         
         if use_api_key:
@@ -535,27 +536,33 @@ def main():
             f"",
         ])
         
-        for i, rec in enumerate(recommendations, 1):
-            primary_tag = " 🔹 Primary" if rec['is_primary'] else ""
-            confidence = rec.get('confidence', 0.5)
-            lines.append(f"{i}. **{rec['model']}** (score: {rec['score']:.3f}, confidence: {confidence:.2f}){primary_tag}")
-            lines.append(f"   - Centrality: {rec['centrality']} connections")
-            
-            # Add LLM explanation if available
-            if not args.no_llm:
-                # Get relationships for this model
-                model_rels = [r for r in recommender.relationships 
-                            if r['to'] == rec['model'] or r['from'] == rec['model']]
-                explanation = recommender.explain_recommendation(
-                    rec['model'], 
-                    args.problem,
-                    relationships=model_rels[:3]  # Top 3 relationships
-                )
-                lines.append(f"   - Why: {explanation}")
-            elif rec['reasons']:
-                lines.append(f"   - Why: {rec['reasons'][0]}")
-            
-            lines.append("")
+        # Indexed lookups for the per-model relationships used in explanations
+        relationship_store = None if args.no_llm else RelationshipStore(args.relationships)
+        
+        try:
+            for i, rec in enumerate(recommendations, 1):
+                primary_tag = " 🔹 Primary" if rec['is_primary'] else ""
+                confidence = rec.get('confidence', 0.5)
+                lines.append(f"{i}. **{rec['model']}** (score: {rec['score']:.3f}, confidence: {confidence:.2f}){primary_tag}")
+                lines.append(f"   - Centrality: {rec['centrality']} connections")
+                
+                # Add LLM explanation if available
+                if not args.no_llm:
+                    # Get relationships for this model
+                    model_rels = relationship_store.query(touching=rec['model'], limit=3)
+                    explanation = recommender.explain_recommendation(
+                        rec['model'], 
+                        args.problem,
+                        relationships=model_rels  # Top 3 relationships
+                    )
+                    lines.append(f"   - Why: {explanation}")
+                elif rec['reasons']:
+                    lines.append(f"   - Why: {rec['reasons'][0]}")
+                
+                lines.append("")
+        finally:
+            if relationship_store is not None:
+                relationship_store.close()
         
         output = "\n".join(lines)
         
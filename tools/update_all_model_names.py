@@ -16,13 +16,8 @@ from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
 
-def normalize_code(code: str) -> str:
-    """Normalize P1 -> P01, P10 -> P10, etc."""
-    if len(code) == 2 and code[1].isdigit():
-        transform = code[0]
-        num = int(code[1:])
-        return f"{transform}{num:02d}"
-    return code
+sys.path.insert(0, str(Path(__file__).parent))
+from model_codes import normalize_code
 
 
 def load_official_models() -> Dict[str, Dict]:
@@ -21,11 +21,26 @@ import json
 import os
 import sys
 import argparse
+import hashlib
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional, Union
 from datetime import datetime
 import re
 
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from model_codes import ModelRegistry, canonical_code, model_sort_key, normalize_code, transformation_of
+from model_sections import ModelRecord, read_model_record
+from relationship_graph import RelationshipGraph
+from relationships_columnar import load_relationships as load_relationships_file
+from relationships_db import RelationshipStore
+
+# Repository root for the validation phases (None: the parent of tools/); see --root
+REPO_ROOT: Optional[Path] = None
+
 # Relationship type definitions
 RELATIONSHIP_TYPES = {
     'SCAFFOLDS': 'A is a prerequisite or foundation for B',
@@ -54,10 +69,40 @@ EXPECTED_DIRECTIONS = {
     'CONFLICTS': ['bidirectional']
 }
 
+# Compiled model snapshot format version (bump when parsed fields change)
+SNAPSHOT_VERSION = 3
+
+# Model file stems recognised by directory scans (e.g. P01, DE07, SY1234)
+MODEL_FILE_PATTERN = re.compile(r'^[A-Z]{1,2}\d+$')
+
+# Below this many files, load_all() parses serially (pool startup dominates)
+PARALLEL_MIN_FILES = 256
+
+
+def _load_model_files(jobs: List[Tuple[str, str]],
+                      materialize: bool = False) -> List[Tuple[str, Optional[ModelRecord]]]:
+    """Pool worker: read and tokenize a chunk of (code, path) model files"""
+    results = []
+    for code, path in jobs:
+        try:
+            results.append((code, read_model_record(code, path, materialize)))
+        except Exception as e:
+            print(f"Error loading {code}: {e}", file=sys.stderr)
+            results.append((code, None))
+    return results
+
+
 class ModelLoader:
     """Loads and parses HUMMBL model files"""
     
-    def __init__(self, models_dir: str = None):
+    def __init__(self, models_dir: str = None, snapshot: Union[bool, str, Path, None] = None):
+        """
+        Args:
+            models_dir: Path to the models directory (auto-detected if omitted)
+            snapshot: Compiled snapshot mode. True uses the default
+                ``.cache/models-snapshot.pickle`` next to the models directory,
+                a path uses that file, None/False parses markdown on demand.
+        """
         if models_dir is None:
             # Find models directory - try multiple strategies
             repo_root = None
@@ -92,21 +137,34 @@ class ModelLoader:
         if not self.models_dir.exists():
             raise RuntimeError(f"Models directory not found: {self.models_dir}")
         self.cache = {}
-    
-    def load_model(self, model_code: str) -> Optional[Dict]:
-        """Load a model file and parse its metadata"""
-        if model_code in self.cache:
-            return self.cache[model_code]
+        
+        self.snapshot_path = None
+        if snapshot:
+            if snapshot is True:
+                snapshot = self.models_dir.parent / '.cache' / 'models-snapshot.pickle'
+            self.snapshot_path = Path(snapshot)
+            self._sync_snapshot()
+    
+    def load_model(self, model_code: str) -> Optional[ModelRecord]:
+        """
+        Load a model file and parse its metadata.
+        
+        Returns a ModelRecord (read-only dict interface); description, example
+        and related models are decoded on first access.
+        """
+        model_data = self.cache.get(model_code)
+        if model_data is not None:
+            return model_data
         
         # Normalize model code (e.g., IN8 -> IN08, DE1 -> DE01)
-        # Format: 1-2 uppercase letters followed by 1-2 digits
-        match = re.match(r'([A-Z]{1,2})(\d{1,2})', model_code)
-        if not match:
+        normalized_code = canonical_code(model_code)
+        if normalized_code is None:
             return None
+        transform = transformation_of(normalized_code)
         
-        transform, number = match.groups()
-        # Pad number to 2 digits
-        normalized_code = f"{transform}{number.zfill(2)}"
+        model_data = self.cache.get(normalized_code)
+        if model_data is not None:
+            return model_data
         
         model_file = self.models_dir / transform / f"{normalized_code}.md"
         
@@ -114,21 +172,11 @@ class ModelLoader:
             return None
         
         try:
-            with open(model_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Parse frontmatter
-            model_data = self._parse_frontmatter(content)
-            # Check if frontmatter has any content (not just empty dict)
-            if not model_data or len(model_data) == 0:
+            model_data = read_model_record(normalized_code, str(model_file))
+            if model_data is None:
                 return None
             
-            model_data['code'] = normalized_code
-            model_data['description'] = self._extract_description(content)
-            model_data['related_models'] = self._extract_related_models(content)
-            
-            # Cache both original and normalized codes
-            self.cache[model_code] = model_data
+            # Cache under the normalized code only
             self.cache[normalized_code] = model_data
             return model_data
         except Exception as e:
@@ -137,38 +185,138 @@ class ModelLoader:
             traceback.print_exc()
             return None
     
-    def _parse_frontmatter(self, content: str) -> Dict:
-        """Parse YAML frontmatter from model file"""
-        frontmatter = {}
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                for line in parts[1].strip().split('\n'):
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        frontmatter[key.strip()] = value.strip()
-        return frontmatter
-    
-    def _extract_description(self, content: str) -> str:
-        """Extract description section from model file"""
-        # Look for ## Description section
-        match = re.search(r'## Description\s*\n\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        if match:
-            return match.group(1).strip()
-        return ""
-    
-    def _extract_related_models(self, content: str) -> List[str]:
-        """Extract related models from model file"""
-        models = []
-        # Look for ## Related Models section
-        match = re.search(r'## Related Models\s*\n\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-        if match:
-            lines = match.group(1).strip().split('\n')
-            for line in lines:
-                # Extract model codes (e.g., DE01, P02)
-                codes = re.findall(r'([A-Z]{2}\d{2})', line)
-                models.extend(codes)
-        return list(set(models))
+    def iter_models(self, workers: Optional[int] = None,
+                    executor: str = 'process') -> Iterator[Tuple[str, ModelRecord]]:
+        """
+        Yield (code, model_data) for every model file, in stable model order.
+        
+        Files are discovered by scanning models/<T>/*.md. Uncached files are parsed
+        in a process pool (or thread pool with executor='thread') once the corpus
+        is larger than PARALLEL_MIN_FILES; workers defaults to the CPU count.
+        """
+        files = [
+            (Path(rel_path).stem, str(self.models_dir / rel_path))
+            for rel_path in self._scan_model_files()
+            if MODEL_FILE_PATTERN.match(Path(rel_path).stem)
+        ]
+        files.sort(key=lambda item: model_sort_key(item[0]))
+        
+        pending = [(code, path) for code, path in files if code not in self.cache]
+        parsed = dict(self._parse_files(pending, workers, executor))
+        
+        for code, _ in files:
+            model_data = self.cache.get(code)
+            if model_data is None:
+                model_data = parsed.get(code)
+                if model_data is None:
+                    continue
+                self.cache[code] = model_data
+            yield code, model_data
+    
+    def load_all(self, workers: Optional[int] = None,
+                 executor: str = 'process') -> Dict[str, ModelRecord]:
+        """Load every model file, returning a stable-ordered {code: model_data} mapping"""
+        return dict(self.iter_models(workers=workers, executor=executor))
+    
+    def _parse_files(self, jobs: List[Tuple[str, str]], workers: Optional[int] = None,
+                     executor: str = 'process',
+                     materialize: bool = False) -> Iterator[Tuple[str, Optional[ModelRecord]]]:
+        """Parse (code, path) jobs, in parallel for large corpora"""
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(jobs) < PARALLEL_MIN_FILES:
+            yield from _load_model_files(jobs, materialize)
+            return
+        
+        # A few chunks per worker keeps IPC overhead low and load balanced
+        chunk_size = max(1, len(jobs) // (workers * 4))
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        pool_class = ThreadPoolExecutor if executor == 'thread' else ProcessPoolExecutor
+        with pool_class(max_workers=workers) as pool:
+            for results in pool.map(_load_model_files, chunks, [materialize] * len(chunks)):
+                yield from results
+    
+    def _scan_model_files(self) -> Dict[str, os.stat_result]:
+        """Stat every models/<T>/<code>.md file, keyed by relative path"""
+        files = {}
+        for transform_dir in os.scandir(self.models_dir):
+            if not transform_dir.is_dir():
+                continue
+            for entry in os.scandir(transform_dir.path):
+                if entry.name.endswith('.md') and entry.is_file():
+                    files[f"{transform_dir.name}/{entry.name}"] = entry.stat()
+        return files
+    
+    def _sync_snapshot(self):
+        """
+        Load the compiled snapshot and bring it up to date with the markdown files.
+        
+        The manifest stores (mtime_ns, size, sha256) per file. Files whose mtime and
+        size are unchanged are trusted; otherwise the content hash decides whether
+        the file is re-parsed. The snapshot is rewritten only if something changed.
+        """
+        snapshot = None
+        if self.snapshot_path.exists():
+            try:
+                with open(self.snapshot_path, 'rb') as f:
+                    snapshot = pickle.load(f)
+            except Exception as e:
+                print(f"⚠️  Ignoring unreadable model snapshot {self.snapshot_path}: {e}", file=sys.stderr)
+        if (not isinstance(snapshot, dict)
+                or snapshot.get('version') != SNAPSHOT_VERSION
+                or snapshot.get('models_dir') != str(self.models_dir)):
+            snapshot = {'version': SNAPSHOT_VERSION, 'models_dir': str(self.models_dir),
+                        'manifest': {}, 'models': {}}
+        
+        old_manifest = snapshot['manifest']
+        manifest = {}
+        models = {}
+        stale = []
+        changed = False
+        
+        for rel_path, stat in sorted(self._scan_model_files().items()):
+            code = Path(rel_path).stem
+            previous = old_manifest.get(rel_path)
+            if previous and previous[0] == stat.st_mtime_ns and previous[1] == stat.st_size:
+                manifest[rel_path] = previous
+                models[code] = snapshot['models'].get(code)
+                continue
+            
+            with open(self.models_dir / rel_path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            manifest[rel_path] = (stat.st_mtime_ns, stat.st_size, digest)
+            changed = True
+            if previous and previous[2] == digest:
+                # Touched but not modified - keep the parsed record
+                models[code] = snapshot['models'].get(code)
+                continue
+            models[code] = None
+            stale.append((code, str(self.models_dir / rel_path)))
+        
+        # Snapshot records are fully decoded so warm starts never reopen files
+        models.update(self._parse_files(stale, materialize=True))
+        
+        if set(manifest) != set(old_manifest):
+            changed = True
+        
+        snapshot['manifest'] = manifest
+        snapshot['models'] = models
+        if changed:
+            self._write_snapshot(snapshot)
+        
+        for code, model_data in models.items():
+            if model_data is not None:
+                self.cache[code] = model_data
+    
+    def _write_snapshot(self, snapshot: Dict):
+        """Atomically write the compiled snapshot (best effort)"""
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_name(f"{self.snapshot_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"⚠️  Could not write model snapshot {self.snapshot_path}: {e}", file=sys.stderr)
 
 
 class RelationshipValidator:
@@ -374,15 +522,23 @@ class RelationshipValidator:
             return f"Found {len(all_issues)} issue(s) requiring attention"
 
 
+def find_repo_root() -> Path:
+    """Root holding models/, data/ and validation/ for the validation phases"""
+    if REPO_ROOT is not None:
+        return REPO_ROOT
+    return Path(__file__).parent.parent
+
+
+def relationships_path() -> Path:
+    """data/relationships.json under the repository root"""
+    return find_repo_root() / 'data' / 'relationships.json'
+
+
 def load_relationships(json_path: str = None) -> List[Dict]:
-    """Load relationships from JSON file"""
+    """Load relationships from JSON file (via the .hrel companion when it is current)"""
     if json_path is None:
-        # Find data directory relative to script location
-        script_dir = Path(__file__).parent
-        repo_root = script_dir.parent
-        json_path = repo_root / 'data' / 'relationships.json'
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        json_path = relationships_path()
+    return load_relationships_file(json_path)
 
 
 def get_batch(relationships: List[Dict], batch_num: int, batch_size: int = 50) -> List[Dict]:
@@ -397,8 +553,7 @@ def phase_prepare():
     print("Phase 1: Data Preparation")
     print("=" * 50)
     
-    script_dir = Path(__file__).parent
-    repo_root = script_dir.parent
+    repo_root = find_repo_root()
     json_path = repo_root / 'data' / 'relationships.json'
     
     if not json_path.exists():
@@ -433,8 +588,7 @@ def phase_prepare():
     print("   Please review and approve proceeding to batch validation")
     
     # Save input file for validation
-    script_dir = Path(__file__).parent
-    repo_root = script_dir.parent
+    repo_root = find_repo_root()
     validation_dir = repo_root / 'validation'
     validation_dir.mkdir(exist_ok=True)
     output_path = validation_dir / 'relationships-validation-input.json'
@@ -460,7 +614,7 @@ def phase_batch(batch_num: int):
     print(f"Validating {len(batch)} relationships...")
     
     # Validator will auto-detect models directory
-    validator = RelationshipValidator()
+    validator = RelationshipValidator(str(find_repo_root() / 'models'))
     results = []
     
     for rel in batch:
@@ -477,8 +631,7 @@ def phase_batch(batch_num: int):
         print(f"  {status_icon} {rel['id']}: {result['status']}")
     
     # Generate batch report
-    script_dir = Path(__file__).parent
-    repo_root = script_dir.parent
+    repo_root = find_repo_root()
     validation_dir = repo_root / 'validation'
     validation_dir.mkdir(exist_ok=True)
     report_path = validation_dir / f'relationships-batch-{batch_num:02d}-results.json'
@@ -521,21 +674,10 @@ def phase_consistency():
     relationships = load_relationships()
     print(f"Analyzing {len(relationships)} relationships for consistency...\n")
     
-    # Build relationship graph
-    graph = {}
-    reverse_graph = {}
-    for rel in relationships:
-        from_model = rel['from']
-        to_model = rel['to']
-        rel_id = rel['id']
-        
-        if from_model not in graph:
-            graph[from_model] = []
-        graph[from_model].append((to_model, rel))
-        
-        if to_model not in reverse_graph:
-            reverse_graph[to_model] = []
-        reverse_graph[to_model].append((from_model, rel))
+    # Build relationship graph (as stored, without bidirectional expansion)
+    graph = RelationshipGraph.from_relationships(relationships, expand_bidirectional=False)
+    canonical = ModelRegistry()
+    canonical_ids = np.array([canonical.intern(code) for code in graph.nodes], dtype=np.int32)
     
     issues = []
     
@@ -549,23 +691,15 @@ def phase_consistency():
         rel_type = rel['type']
         
         # Normalize model codes for comparison
-        def normalize_code(code):
-            match = re.match(r'([A-Z]{1,2})(\d{1,2})', code)
-            if match:
-                transform, number = match.groups()
-                return f"{transform}{number.zfill(2)}"
-            return code
-        
         from_norm = normalize_code(from_model)
         to_norm = normalize_code(to_model)
         
         # Check if reverse relationship exists
         reverse_exists = False
-        if to_norm in graph:
-            for target, rev_rel in graph[to_norm]:
-                if normalize_code(target) == from_norm:
-                    reverse_exists = True
-                    break
+        to_node = graph.node_ids.get(to_norm)
+        if to_node is not None:
+            targets = canonical_ids[graph.forward.neighbors_of(to_node)]
+            reverse_exists = bool(np.any(targets == canonical.id(from_norm)))
         
         # For bidirectional relationships, reverse should exist
         if direction == 'bidirectional' and not reverse_exists:
@@ -616,23 +750,16 @@ def phase_consistency():
     print("3. Hub Model Validation...")
     hub_issues = []
     
-    # Normalize model codes and count connections
-    def normalize_code(code):
-        match = re.match(r'([A-Z]{1,2})(\d{1,2})', code)
-        if match:
-            transform, number = match.groups()
-            return f"{transform}{number.zfill(2)}"
-        return code
-    
-    connection_counts = {}
-    for rel in relationships:
-        from_model = normalize_code(rel['from'])
-        to_model = normalize_code(rel['to'])
-        connection_counts[from_model] = connection_counts.get(from_model, 0) + 1
-        connection_counts[to_model] = connection_counts.get(to_model, 0) + 1
+    # Normalize model codes once (IDs in first-seen order) and count connections
+    registry = ModelRegistry()
+    endpoints = [(registry.intern(rel['from']), registry.intern(rel['to'])) for rel in relationships]
+    connection_counts = [0] * len(registry)
+    for from_id, to_id in endpoints:
+        connection_counts[from_id] += 1
+        connection_counts[to_id] += 1
     
     # Identify hubs (top 10% by connections)
-    sorted_models = sorted(connection_counts.items(), key=lambda x: x[1], reverse=True)
+    sorted_models = sorted(zip(registry.codes, connection_counts), key=lambda x: x[1], reverse=True)
     hub_threshold = sorted_models[len(sorted_models) // 10][1] if len(sorted_models) > 10 else sorted_models[0][1] if sorted_models else 0
     hubs = [model for model, count in sorted_models if count >= hub_threshold]
     
@@ -640,18 +767,16 @@ def phase_consistency():
     if sorted_models:
         print(f"   Top hubs: {', '.join([f'{m}({c})' for m, c in sorted_models[:5]])}")
     
-    # Validate hub relationships are appropriate
-    for hub in hubs[:5]:  # Check top 5 hubs
-        hub_rels = [rel for rel in relationships 
-                   if normalize_code(rel['from']) == hub or normalize_code(rel['to']) == hub]
-        # Check if hub has appropriate relationship types
-        types = [rel['type'] for rel in hub_rels]
-        if 'SCAFFOLDS' not in types and 'COMPOSES_WITH' not in types:
-            hub_issues.append({
-                'relationship': f'HUB-{hub}',
-                'issue': f"Hub model {hub} lacks SCAFFOLDS or COMPOSES_WITH relationships",
-                'recommendation': f"Review if {hub} should have more foundational relationships"
-            })
+    # Validate hub relationships are appropriate (indexed lookups)
+    with RelationshipStore(relationships_path()) as store:
+        for hub in hubs[:5]:  # Check top 5 hubs
+            # Check if hub has appropriate relationship types
+            if not store.count(touching=hub, types=['SCAFFOLDS', 'COMPOSES_WITH'], normalized=True):
+                hub_issues.append({
+                    'relationship': f'HUB-{hub}',
+                    'issue': f"Hub model {hub} lacks SCAFFOLDS or COMPOSES_WITH relationships",
+                    'recommendation': f"Review if {hub} should have more foundational relationships"
+                })
     
     print(f"   Found {len(hub_issues)} hub validation issues")
     issues.extend(hub_issues)
@@ -686,8 +811,7 @@ def phase_consistency():
     issues.extend(pattern_issues)
     
     # Generate report
-    script_dir = Path(__file__).parent
-    repo_root = script_dir.parent
+    repo_root = find_repo_root()
     validation_dir = repo_root / 'validation'
     validation_dir.mkdir(exist_ok=True)
     
@@ -702,7 +826,7 @@ def phase_consistency():
             'pattern_validation': len(pattern_issues)
         },
         'hub_models': {
-            hub: connection_counts[hub] for hub in hubs[:10]
+            hub: connection_counts[registry.id(hub)] for hub in hubs[:10]
         },
         'issues': issues
     }
@@ -730,21 +854,14 @@ def phase_missing():
     print("=" * 50)
     
     relationships = load_relationships()
-    model_loader = ModelLoader()
+    model_loader = ModelLoader(find_repo_root() / 'models')
     
     # Build set of existing relationships
     existing_rels = set()
     for rel in relationships:
         # Normalize model codes
-        def normalize(code):
-            match = re.match(r'([A-Z]{1,2})(\d{1,2})', code)
-            if match:
-                transform, number = match.groups()
-                return f"{transform}{number.zfill(2)}"
-            return code
-        
-        from_norm = normalize(rel['from'])
-        to_norm = normalize(rel['to'])
+        from_norm = normalize_code(rel['from'])
+        to_norm = normalize_code(rel['to'])
         # Store both directions
         existing_rels.add((from_norm, to_norm))
         existing_rels.add((to_norm, from_norm))
@@ -765,13 +882,6 @@ def phase_missing():
         all_models.add(rel['to'])
     
     # Normalize all model codes
-    def normalize_code(code):
-        match = re.match(r'([A-Z]{1,2})(\d{1,2})', code)
-        if match:
-            transform, number = match.groups()
-            return f"{transform}{number.zfill(2)}"
-        return code
-    
     normalized_models = {normalize_code(m): m for m in all_models}
     
     checked = 0
@@ -832,35 +942,34 @@ def phase_missing():
     hub_models = ['SY01', 'P02', 'P03', 'IN02', 'IN03']  # From consistency report
     major_transforms = ['P', 'IN', 'CO', 'DE', 'RE', 'SY']
     
-    for hub in hub_models:
-        hub_norm = normalize_code(hub)
-        hub_rels = [rel for rel in relationships 
-                   if normalize_code(rel['from']) == hub_norm or normalize_code(rel['to']) == hub_norm]
-        connected_transforms = set()
-        for rel in hub_rels:
-            from_norm = normalize_code(rel['from'])
-            to_norm = normalize_code(rel['to'])
-            if from_norm == hub_norm:
-                connected_transforms.add(to_norm[:2] if len(to_norm) >= 2 else to_norm[:1])
-            else:
-                connected_transforms.add(from_norm[:2] if len(from_norm) >= 2 else from_norm[:1])
-        
-        missing_transforms = [t for t in major_transforms if t not in connected_transforms]
-        if missing_transforms:
-            pattern_missing.append({
-                'source_model': hub_norm,
-                'target_models': missing_transforms,
-                'source': f"Hub model {hub_norm} missing connections to {', '.join(missing_transforms)}",
-                'priority': 'LOW',
-                'recommendation': f"Consider adding relationships from {hub_norm} to models in {', '.join(missing_transforms)}"
-            })
+    with RelationshipStore(relationships_path()) as store:
+        for hub in hub_models:
+            hub_norm = normalize_code(hub)
+            hub_rels = store.query(touching=hub_norm, normalized=True)
+            connected_transforms = set()
+            for rel in hub_rels:
+                from_norm = normalize_code(rel['from'])
+                to_norm = normalize_code(rel['to'])
+                if from_norm == hub_norm:
+                    connected_transforms.add(to_norm[:2] if len(to_norm) >= 2 else to_norm[:1])
+                else:
+                    connected_transforms.add(from_norm[:2] if len(from_norm) >= 2 else from_norm[:1])
+            
+            missing_transforms = [t for t in major_transforms if t not in connected_transforms]
+            if missing_transforms:
+                pattern_missing.append({
+                    'source_model': hub_norm,
+                    'target_models': missing_transforms,
+                    'source': f"Hub model {hub_norm} missing connections to {', '.join(missing_transforms)}",
+                    'priority': 'LOW',
+                    'recommendation': f"Consider adding relationships from {hub_norm} to models in {', '.join(missing_transforms)}"
+                })
     
     print(f"   Found {len(pattern_missing)} pattern completion opportunities")
     missing_candidates.extend(pattern_missing)
     
     # Generate report
-    script_dir = Path(__file__).parent
-    repo_root = script_dir.parent
+    repo_root = find_repo_root()
     validation_dir = repo_root / 'validation'
     validation_dir.mkdir(exist_ok=True)
     
@@ -905,8 +1014,7 @@ def phase_final():
     print("Phase 5: Final Validation Report Generation")
     print("=" * 50)
     
-    script_dir = Path(__file__).parent
-    repo_root = script_dir.parent
+    repo_root = find_repo_root()
     validation_dir = repo_root / 'validation'
     
     # Load all batch results
@@ -1085,9 +1193,15 @@ def main():
                        choices=['prepare', 'batch', 'consistency', 'missing', 'final'],
                        help='Validation phase to execute')
     parser.add_argument('--batch', type=int, help='Batch number (for batch phase)')
+    parser.add_argument('--root', type=Path,
+                       help='Repository root with models/, data/ and validation/ (default: parent of tools/)')
     
     args = parser.parse_args()
     
+    if args.root:
+        global REPO_ROOT
+        REPO_ROOT = args.root.resolve()
+    
     if args.phase == 'prepare':
         success = phase_prepare()
         sys.exit(0 if success else 1)
@@ -3,6 +3,9 @@
 Simple validation script for relationships.json
 Used in CI/CD to ensure JSON structure is valid.
 
+Pending changes in the edit log (data/relationships.editlog.jsonl) are
+applied first, so the relationships every loader sees are validated.
+
 Usage:
     python tools/validate_relationships_json.py [path/to/relationships.json]
 """
@@ -12,6 +15,59 @@ import sys
 from pathlib import Path
 from typing import Dict, List
 
+sys.path.insert(0, str(Path(__file__).parent))
+from relationships_editlog import EditLog, iter_current_relationships
+
+# Errors listed in the report (the total is always counted)
+MAX_REPORTED_ERRORS = 10
+
+
+def describe_json_value(json_path: Path) -> str:
+    """Python type name of a top-level JSON value (from its first character)"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+    if first == '[':
+        return 'list'
+    if first == '{':
+        return 'dict'
+    if first == '"':
+        return 'str'
+    return 'scalar' if first else 'empty file'
+
+
+def validate_relationship(i: int, rel, required_fields: List[str], valid_types: List[str],
+                          valid_directions: List[str]) -> List[str]:
+    """Schema errors for a single relationship record"""
+    errors = []
+    if not isinstance(rel, dict):
+        errors.append(f"Relationship {i}: Expected dict, got {type(rel).__name__}")
+        return errors
+    
+    # Check required fields
+    for field in required_fields:
+        if field not in rel:
+            errors.append(f"Relationship {i}: Missing required field '{field}'")
+    
+    # Check type is valid
+    if 'type' in rel and rel['type'] not in valid_types:
+        errors.append(f"Relationship {i}: Invalid type '{rel['type']}'. Must be one of {valid_types}")
+    
+    # Check direction is valid
+    if 'direction' in rel and rel['direction'] not in valid_directions:
+        errors.append(f"Relationship {i}: Invalid direction '{rel['direction']}'. Must be one of {valid_directions}")
+    
+    # Check strength is valid (0.0-1.0)
+    if 'strength' in rel:
+        try:
+            strength = float(rel['strength'])
+            if not (0.0 <= strength <= 1.0):
+                errors.append(f"Relationship {i}: Strength {strength} out of range [0.0, 1.0]")
+        except (ValueError, TypeError):
+            errors.append(f"Relationship {i}: Invalid strength value '{rel['strength']}'")
+    return errors
+
 
 def validate_relationships_json(json_path: Path) -> bool:
     """Validate relationships.json structure and schema."""
@@ -22,69 +78,54 @@ def validate_relationships_json(json_path: Path) -> bool:
         print(f"❌ ERROR: File not found: {json_path}")
         return False
     
-    # Check JSON is valid
+    # Required fields
+    required_fields = ['id', 'from', 'to', 'type', 'strength', 'direction', 'description']
+    valid_types = ['SCAFFOLDS', 'COMPOSES_WITH', 'REFINES', 'PARALLELS', 'CONTRASTS_WITH', 'CONFLICTS']
+    valid_directions = ['unidirectional', 'bidirectional']
+    
+    # The snapshot must be a JSON array (checked here: the edit log reader also accepts JSONL)
+    kind = describe_json_value(json_path)
+    if kind != 'list':
+        print(f"❌ ERROR: Expected list, got {kind}")
+        return False
+    
+    # Validate each relationship as it is streamed from the file (bounded memory)
+    log = EditLog(json_path)
+    if log:
+        print(f"📝 Applying pending edit log {log.path}")
+    error_count = 0
+    count = 0
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        for i, rel in enumerate(iter_current_relationships(json_path)):
+            count += 1
+            rel_errors = validate_relationship(i, rel, required_fields, valid_types, valid_directions)
+            error_count += len(rel_errors)
+            # Only the first few errors are reported, so only those are kept
+            errors.extend(rel_errors[:max(0, MAX_REPORTED_ERRORS - len(errors))])
     except json.JSONDecodeError as e:
-        print(f"❌ ERROR: Invalid JSON: {e}")
+        if e.msg == 'Expecting JSON array':
+            print(f"❌ ERROR: Expected list, got {describe_json_value(json_path)}")
+        else:
+            print(f"❌ ERROR: Invalid JSON: {e}")
         return False
     except Exception as e:
         print(f"❌ ERROR: Could not read file: {e}")
         return False
     
-    # Check it's a list
-    if not isinstance(data, list):
-        print(f"❌ ERROR: Expected list, got {type(data).__name__}")
-        return False
-    
     # Check at least one relationship exists
-    if len(data) == 0:
+    if count == 0:
         print("❌ ERROR: No relationships found in file")
         return False
     
-    print(f"✅ Found {len(data)} relationships")
-    
-    # Required fields
-    required_fields = ['id', 'from', 'to', 'type', 'strength', 'direction', 'description']
-    valid_types = ['SCAFFOLDS', 'COMPOSES_WITH', 'REFINES', 'PARALLELS', 'CONTRASTS_WITH', 'CONFLICTS']
-    valid_directions = ['unidirectional', 'bidirectional']
-    
-    # Validate each relationship
-    for i, rel in enumerate(data):
-        if not isinstance(rel, dict):
-            errors.append(f"Relationship {i}: Expected dict, got {type(rel).__name__}")
-            continue
-        
-        # Check required fields
-        for field in required_fields:
-            if field not in rel:
-                errors.append(f"Relationship {i}: Missing required field '{field}'")
-        
-        # Check type is valid
-        if 'type' in rel and rel['type'] not in valid_types:
-            errors.append(f"Relationship {i}: Invalid type '{rel['type']}'. Must be one of {valid_types}")
-        
-        # Check direction is valid
-        if 'direction' in rel and rel['direction'] not in valid_directions:
-            errors.append(f"Relationship {i}: Invalid direction '{rel['direction']}'. Must be one of {valid_directions}")
-        
-        # Check strength is valid (0.0-1.0)
-        if 'strength' in rel:
-            try:
-                strength = float(rel['strength'])
-                if not (0.0 <= strength <= 1.0):
-                    errors.append(f"Relationship {i}: Strength {strength} out of range [0.0, 1.0]")
-            except (ValueError, TypeError):
-                errors.append(f"Relationship {i}: Invalid strength value '{rel['strength']}'")
+    print(f"✅ Found {count} relationships")
     
     # Report errors
-    if errors:
-        print(f"\n❌ Validation failed with {len(errors)} error(s):")
-        for error in errors[:10]:  # Show first 10 errors
+    if error_count:
+        print(f"\n❌ Validation failed with {error_count} error(s):")
+        for error in errors:  # Show first 10 errors
             print(f"  - {error}")
-        if len(errors) > 10:
-            print(f"  ... and {len(errors) - 10} more error(s)")
+        if error_count > MAX_REPORTED_ERRORS:
+            print(f"  ... and {error_count - MAX_REPORTED_ERRORS} more error(s)")
         return False
     
     print("✅ All relationships validated successfully")
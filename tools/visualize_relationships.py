@@ -9,12 +9,15 @@ Usage:
     python tools/visualize_relationships.py --output graph.html --layout spring
 """
 
-import json
 import argparse
 import sys
 from pathlib import Path
 from typing import Dict, List, Set
 
+sys.path.insert(0, str(Path(__file__).parent))
+from relationship_graph import RelationshipGraph
+from relationships_columnar import load_relationship_table as load_relationships
+
 try:
     import networkx as nx
     from pyvis.network import Network
@@ -24,51 +27,9 @@ except ImportError:
     sys.exit(1)
 
 
-def load_relationships(json_path: str) -> List[Dict]:
-    """Load relationships from JSON."""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def normalize_code(code: str) -> str:
-    """Normalize model code (IN8 -> IN08)."""
-    import re
-    match = re.match(r'([A-Z]{1,2})(\d{1,2})', code)
-    if match:
-        transform, number = match.groups()
-        return f"{transform}{number.zfill(2)}"
-    return code
-
-
 def build_graph(relationships: List[Dict]) -> nx.DiGraph:
-    """Build NetworkX graph from relationships."""
-    G = nx.DiGraph()
-    
-    for rel in relationships:
-        from_model = normalize_code(rel['from'])
-        to_model = normalize_code(rel['to'])
-        
-        G.add_edge(
-            from_model,
-            to_model,
-            type=rel['type'],
-            strength=rel['strength'],
-            direction=rel['direction'],
-            description=rel.get('description', '')
-        )
-        
-        # Add reverse edge for bidirectional
-        if rel['direction'] == 'bidirectional':
-            G.add_edge(
-                to_model,
-                from_model,
-                type=rel['type'],
-                strength=rel['strength'],
-                direction=rel['direction'],
-                description=rel.get('description', '')
-            )
-    
-    return G
+    """Build NetworkX graph from relationships (normalized codes, bidirectional edges expanded)."""
+    return RelationshipGraph.from_relationships(relationships, normalize=True).to_networkx()
 
 
 def get_transformation(model_code: str) -> str: